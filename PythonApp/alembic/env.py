@@ -25,6 +25,9 @@ from app.database import Base, engine
 # Esses imports registram todas as tabelas no Base.metadata.
 from app import models as app_models
 from app.interview_simulation import models as interview_simulation_models
+from app.resumes import models as resume_models
+from app.metrics import models as metrics_models
+from app.ai_jobs import models as ai_job_models
 
 
 config = context.config
@@ -0,0 +1,39 @@
+"""unique question bank deliveries
+
+Revision ID: b41e7a9c2d05
+Revises: d95eaaf6eb72
+Create Date: 2026-10-18 10:04:12.318547
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e7a9c2d05'
+down_revision: Union[str, Sequence[str], None] = 'd95eaaf6eb72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Entregas duplicadas por requisições concorrentes:
+    # mantém só a mais antiga de cada par.
+    op.execute(
+        """
+        DELETE FROM question_bank_deliveries AS duplicate
+        USING question_bank_deliveries AS kept
+        WHERE duplicate.user_id = kept.user_id
+          AND duplicate.question_id = kept.question_id
+          AND (duplicate.delivered_at, duplicate.id) > (kept.delivered_at, kept.id)
+        """
+    )
+    op.create_unique_constraint('uq_question_bank_deliveries_user_question', 'question_bank_deliveries', ['user_id', 'question_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_question_bank_deliveries_user_question', 'question_bank_deliveries', type_='unique')
@@ -0,0 +1,87 @@
+import uuid
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import (
+    JSONB,
+    UUID,
+)
+
+from app.database import Base
+
+
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    # Uma das chaves de JOB_OPERATIONS.
+    operation = Column(
+        String(50),
+        nullable=False,
+    )
+
+    # queued, running, succeeded, failed ou cancelled.
+    status = Column(
+        String(20),
+        nullable=False,
+        default="queued",
+    )
+
+    payload = Column(
+        JSONB,
+        nullable=False,
+        default=dict,
+    )
+
+    result = Column(
+        JSONB,
+        nullable=True,
+    )
+
+    error = Column(
+        Text,
+        nullable=True,
+    )
+
+    celery_task_id = Column(
+        String(155),
+        nullable=True,
+    )
+
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+    started_at = Column(
+        DateTime,
+        nullable=True,
+    )
+
+    finished_at = Column(
+        DateTime,
+        nullable=True,
+    )
\ No newline at end of file
@@ -0,0 +1,292 @@
+import asyncio
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.ai_jobs.models import AIJob
+from app.config import (
+    OPENAI_INTERVIEW_MODEL,
+    OPENAI_MODEL,
+)
+from app.interview_simulation.history import (
+    save_simulation_session,
+)
+from app.interview_simulation.schemas import (
+    SimulationEvaluationRequest,
+)
+from app.interview_simulation.service import (
+    evaluate_simulation,
+)
+from app.interview_simulation.transcription import (
+    transcribe_audio,
+)
+from app.llm.gateway import create_chat_completion
+from app.llm_generation.services import (
+    build_prompt,
+    build_resume_feedback_messages,
+    build_resume_feedback_prompt,
+    parse_questions,
+)
+from app.resumes.ingestion import ingest_resume_sync
+from app.resumes.service import (
+    build_resume_profile_context,
+    find_resume_profile,
+)
+from app.study_plan.service import create_study_plan
+
+
+JobHandler = Callable[
+    [Session, AIJob, Optional[bytes]],
+    Awaitable[Dict[str, Any]],
+]
+
+
+# MARK: - Resume
+
+
+async def load_job_resume_text(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+    full_text: bool = False,
+) -> str:
+    resume_id = job.payload.get("resume_id")
+
+    if resume_id:
+        profile = find_resume_profile(
+            db,
+            UUID(resume_id),
+            job.user_id,
+        )
+
+        if profile is None:
+            raise ValueError(
+                "Currículo não encontrado."
+            )
+
+        # O feedback avalia o documento inteiro; os outros
+        # prompts usam o perfil estruturado.
+        if full_text:
+            return profile.resume_text
+
+        return build_resume_profile_context(
+            profile
+        )
+
+    if not attachment:
+        return ""
+
+    # A extração é síncrona e pesada: fica fora do loop.
+    document = await asyncio.to_thread(
+        ingest_resume_sync,
+        attachment,
+    )
+
+    return document.text
+
+
+def read_completion_content(
+    response: Any,
+) -> str:
+    if not response.choices:
+        raise ValueError(
+            "A inteligência artificial "
+            "não retornou uma resposta."
+        )
+
+    content = (
+        response
+        .choices[0]
+        .message
+        .content
+        or ""
+    ).strip()
+
+    if not content:
+        raise ValueError(
+            "A inteligência artificial "
+            "retornou uma resposta vazia."
+        )
+
+    return content
+
+
+# MARK: - Operations
+
+
+async def run_interview_questions(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+) -> Dict[str, Any]:
+    prompt = build_prompt(
+        resume_text=await load_job_resume_text(
+            db,
+            job,
+            attachment,
+        ),
+        job_title=job.payload["job_title"],
+        seniority=job.payload["seniority"],
+        description=job.payload.get("description") or "",
+    )
+
+    response = await create_chat_completion(
+        endpoint="generate_interview_questions",
+        model=OPENAI_INTERVIEW_MODEL,
+        messages=[
+            {
+                "role":
+                    "system",
+                "content": (
+                    "Você é um recrutador "
+                    "técnico experiente. "
+                    "Retorne somente "
+                    "perguntas técnicas."
+                ),
+            },
+            {
+                "role":
+                    "user",
+                "content":
+                    prompt,
+            },
+        ],
+        temperature=0.7,
+    )
+
+    questions = parse_questions(
+        read_completion_content(response)
+    )
+
+    if not questions:
+        raise ValueError(
+            "Nenhuma pergunta válida "
+            "foi gerada."
+        )
+
+    return {
+        "questions":
+            questions,
+    }
+
+
+async def run_simulation_evaluation(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+) -> Dict[str, Any]:
+    request = SimulationEvaluationRequest.model_validate(
+        job.payload
+    )
+
+    evaluation = await evaluate_simulation(
+        model=OPENAI_INTERVIEW_MODEL,
+        job_title=request.job_title,
+        seniority=request.seniority,
+        answers=request.answers,
+        mode=request.mode,
+    )
+
+    save_simulation_session(
+        db,
+        user_id=job.user_id,
+        job_title=request.job_title,
+        seniority=request.seniority,
+        mode=request.mode,
+        answers=request.answers,
+        evaluation=evaluation,
+    )
+
+    return evaluation
+
+
+async def run_transcription(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+) -> Dict[str, Any]:
+    if not attachment:
+        raise ValueError(
+            "O áudio recebido "
+            "está vazio."
+        )
+
+    transcript = await transcribe_audio(
+        attachment,
+        job.payload.get("file_name") or "answer.m4a",
+    )
+
+    if not transcript:
+        raise ValueError(
+            "A API processou o áudio, "
+            "mas não retornou nenhum texto."
+        )
+
+    return {
+        "transcript":
+            transcript,
+    }
+
+
+async def run_study_plan(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+) -> Dict[str, Any]:
+    return await create_study_plan(
+        model=OPENAI_MODEL,
+        job_title=job.payload["job_title"],
+        seniority=job.payload["seniority"],
+        description=job.payload.get("description") or "",
+        resume_text=await load_job_resume_text(
+            db,
+            job,
+            attachment,
+        ),
+    )
+
+
+async def run_resume_feedback(
+    db: Session,
+    job: AIJob,
+    attachment: Optional[bytes],
+) -> Dict[str, Any]:
+    resume_text = await load_job_resume_text(
+        db,
+        job,
+        attachment,
+        full_text=True,
+    )
+
+    if not resume_text.strip():
+        raise ValueError(
+            "Não foi possível extrair "
+            "texto do PDF."
+        )
+
+    response = await create_chat_completion(
+        endpoint="resume_feedback",
+        model=OPENAI_INTERVIEW_MODEL,
+        messages=build_resume_feedback_messages(
+            build_resume_feedback_prompt(
+                resume_text
+            )
+        ),
+        temperature=0.7,
+    )
+
+    return {
+        "feedback":
+            read_completion_content(response),
+    }
+
+
+JOB_OPERATIONS: Dict[str, JobHandler] = {
+    "interview_questions": run_interview_questions,
+    "simulation_evaluation": run_simulation_evaluation,
+    "transcription": run_transcription,
+    "study_plan": run_study_plan,
+    "resume_feedback": run_resume_feedback,
+}
\ No newline at end of file
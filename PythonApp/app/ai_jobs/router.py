@@ -0,0 +1,572 @@
+# app/ai_jobs/router.py
+
+import asyncio
+
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import models
+from app.ai_jobs.schemas import AIJobResponse
+from app.ai_jobs.service import (
+    FINISHED_STATUSES,
+    cancel_ai_job,
+    find_user_ai_job,
+    get_ai_job_channel,
+    is_ai_job_finished,
+    list_user_ai_jobs,
+    load_ai_job_response,
+    submit_ai_job,
+)
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.interview_simulation.schemas import (
+    SimulationEvaluationRequest,
+)
+from app.interview_simulation.transcription import (
+    TRANSCRIPTION_MAX_BYTES,
+)
+from app.resumes.ingestion import (
+    ResumeIngestionError,
+    validate_resume_size,
+)
+from app.resumes.service import find_resume_profile
+from app.utils.sse import SSE_HEADERS
+from app.worker.notifications import (
+    TASK_WAIT_MAX_SECONDS,
+    stream_task_completion,
+    wait_for_task,
+)
+
+
+router = APIRouter(
+    prefix="/ai-jobs",
+    tags=["AI Jobs"],
+)
+
+
+RESUME_CONTENT_TYPES = {
+    "application/pdf",
+}
+
+AUDIO_CONTENT_TYPES = {
+    "audio/mp4",
+    "audio/m4a",
+    "audio/x-m4a",
+    "application/octet-stream",
+}
+
+
+# MARK: - Submit
+
+
+@router.post(
+    "/interview-questions",
+    response_model=AIJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_interview_questions_job(
+    job_title: str = Form(...),
+    seniority: str = Form(...),
+    description: Optional[str] = Form(
+        None
+    ),
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return await submit_resume_job(
+        db=db,
+        current_user=current_user,
+        operation="interview_questions",
+        payload=build_job_description_payload(
+            job_title,
+            seniority,
+            description,
+        ),
+        resume=resume,
+        resume_id=resume_id,
+    )
+
+
+@router.post(
+    "/study-plan",
+    response_model=AIJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_study_plan_job(
+    job_title: str = Form(...),
+    seniority: str = Form(...),
+    description: Optional[str] = Form(
+        None
+    ),
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return await submit_resume_job(
+        db=db,
+        current_user=current_user,
+        operation="study_plan",
+        payload=build_job_description_payload(
+            job_title,
+            seniority,
+            description,
+        ),
+        resume=resume,
+        resume_id=resume_id,
+    )
+
+
+@router.post(
+    "/resume-feedback",
+    response_model=AIJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_resume_feedback_job(
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    if resume is None and resume_id is None:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "Envie um currículo "
+                "ou informe o resume_id."
+            ),
+        )
+
+    return await submit_resume_job(
+        db=db,
+        current_user=current_user,
+        operation="resume_feedback",
+        payload={},
+        resume=resume,
+        resume_id=resume_id,
+    )
+
+
+@router.post(
+    "/simulation-evaluation",
+    response_model=AIJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_simulation_evaluation_job(
+    request: SimulationEvaluationRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    if not request.answers:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "Nenhuma resposta "
+                "foi enviada."
+            ),
+        )
+
+    return enqueue_job(
+        db=db,
+        current_user=current_user,
+        operation="simulation_evaluation",
+        payload=request.model_dump(),
+    )
+
+
+@router.post(
+    "/transcription",
+    response_model=AIJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_transcription_job(
+    audio: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    content = await read_upload(
+        audio,
+        AUDIO_CONTENT_TYPES,
+        "Formato de áudio não suportado.",
+    )
+
+    if not content:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "O áudio recebido "
+                "está vazio."
+            ),
+        )
+
+    # Recusa antes do blob store, com o mesmo limite
+    # da rota síncrona.
+    if len(content) > TRANSCRIPTION_MAX_BYTES:
+        raise HTTPException(
+            status_code=
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                "O áudio deve ter "
+                f"no máximo {TRANSCRIPTION_MAX_BYTES // (1024 * 1024)} MB."
+            ),
+        )
+
+    return await asyncio.to_thread(
+        enqueue_job,
+        db=db,
+        current_user=current_user,
+        operation="transcription",
+        payload={
+            "file_name":
+                audio.filename
+                or "answer.m4a",
+        },
+        attachment=content,
+    )
+
+
+# MARK: - Status
+
+
+@router.get(
+    "/",
+    response_model=list[
+        AIJobResponse
+    ],
+)
+def list_my_ai_jobs(
+    limit: int = Query(
+        default=20,
+        ge=1,
+        le=100,
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return list_user_ai_jobs(
+        db,
+        current_user.id,
+        limit,
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=AIJobResponse,
+)
+def get_ai_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return get_owned_ai_job(
+        db,
+        job_id,
+        current_user,
+    )
+
+
+@router.get(
+    "/{job_id}/wait",
+    response_model=AIJobResponse,
+)
+async def wait_ai_job(
+    job_id: UUID,
+    timeout: float = Query(
+        default=25,
+        gt=0,
+        le=TASK_WAIT_MAX_SECONDS,
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    job = await asyncio.to_thread(
+        get_owned_ai_job,
+        db,
+        job_id,
+        current_user,
+    )
+
+    # Long-poll: responde assim que o job termina,
+    # ou com o status atual ao fim do timeout.
+    if job.status not in FINISHED_STATUSES:
+        await wait_for_task(
+            get_ai_job_channel(job),
+            timeout,
+            lambda: is_ai_job_finished(job_id),
+        )
+
+        await asyncio.to_thread(
+            db.refresh,
+            job,
+        )
+
+    return job
+
+
+@router.get(
+    "/{job_id}/events"
+)
+async def ai_job_events(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    job = await asyncio.to_thread(
+        get_owned_ai_job,
+        db,
+        job_id,
+        current_user,
+    )
+
+    def load_event():
+        response = load_ai_job_response(
+            job_id
+        )
+
+        if response and response["status"] == "succeeded":
+            return "done", response
+
+        return "error", response
+
+    return StreamingResponse(
+        stream_task_completion(
+            get_ai_job_channel(job),
+            load_event,
+            lambda: is_ai_job_finished(job_id),
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=AIJobResponse,
+)
+def cancel_my_ai_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return cancel_ai_job(
+        db,
+        get_owned_ai_job(
+            db,
+            job_id,
+            current_user,
+        ),
+    )
+
+
+# MARK: - Helpers
+
+
+def get_owned_ai_job(
+    db: Session,
+    job_id: UUID,
+    current_user: models.User,
+):
+    job = find_user_ai_job(
+        db,
+        job_id,
+        current_user.id,
+    )
+
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job não encontrado.",
+        )
+
+    return job
+
+
+def build_job_description_payload(
+    job_title: str,
+    seniority: str,
+    description: Optional[str],
+) -> Dict[str, Any]:
+    normalized_job_title = job_title.strip()
+    normalized_seniority = seniority.strip()
+
+    if not normalized_job_title:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "O título da vaga "
+                "é obrigatório."
+            ),
+        )
+
+    if not normalized_seniority:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "A senioridade "
+                "é obrigatória."
+            ),
+        )
+
+    return {
+        "job_title":
+            normalized_job_title,
+        "seniority":
+            normalized_seniority,
+        "description":
+            (description or "").strip(),
+    }
+
+
+async def read_upload(
+    upload: UploadFile,
+    allowed_content_types: Set[str],
+    unsupported_detail: str,
+) -> bytes:
+    try:
+        if (
+            upload.content_type
+            and upload.content_type
+            not in allowed_content_types
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail=unsupported_detail,
+            )
+
+        return await upload.read()
+
+    finally:
+        await upload.close()
+
+
+async def submit_resume_job(
+    db: Session,
+    current_user: models.User,
+    operation: str,
+    payload: Dict[str, Any],
+    resume: Optional[UploadFile],
+    resume_id: Optional[UUID],
+):
+    attachment = None
+
+    # Currículo salvo: o worker carrega o perfil pelo id.
+    if resume_id is not None:
+        profile = await asyncio.to_thread(
+            find_resume_profile,
+            db,
+            resume_id,
+            current_user.id,
+        )
+
+        if profile is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Currículo não encontrado.",
+            )
+
+        payload["resume_id"] = str(resume_id)
+
+    elif resume is not None:
+        attachment = await read_upload(
+            resume,
+            RESUME_CONTENT_TYPES,
+            (
+                "O currículo deve "
+                "ser enviado em "
+                "formato PDF."
+            ),
+        )
+
+        # Rejeita antes de gravar no blob store.
+        try:
+            validate_resume_size(
+                attachment
+            )
+
+        except ResumeIngestionError as error:
+            raise HTTPException(
+                status_code=error.status_code,
+                detail=error.detail,
+            ) from error
+
+    # Commits, blob store e Celery bloqueiam:
+    # rodam fora do event loop.
+    return await asyncio.to_thread(
+        enqueue_job,
+        db=db,
+        current_user=current_user,
+        operation=operation,
+        payload=payload,
+        attachment=attachment,
+    )
+
+
+def enqueue_job(
+    db: Session,
+    current_user: models.User,
+    operation: str,
+    payload: Dict[str, Any],
+    attachment: Optional[bytes] = None,
+):
+    try:
+        return submit_ai_job(
+            db,
+            current_user.id,
+            operation,
+            payload,
+            attachment,
+        )
+
+    except RuntimeError as error:
+        raise HTTPException(
+            status_code=503,
+            detail=str(error),
+        ) from error
\ No newline at end of file
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+class AIJobResponse(BaseModel):
+    id: UUID
+    operation: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
\ No newline at end of file
@@ -0,0 +1,429 @@
+import asyncio
+import time
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.ai_jobs.models import AIJob
+from app.ai_jobs.operations import JOB_OPERATIONS
+from app.ai_jobs.schemas import AIJobResponse
+from app.database import SessionLocal
+from app.llm.metrics import current_usage_user_id
+from app.metrics.service import flush_llm_usage
+from app.observability import logger
+from app.utils.blob_store import (
+    BlobNotFoundError,
+    blob_store,
+)
+from app.worker.notifications import publish_task_event
+
+
+AI_JOB_ERROR_MAX_LENGTH = 1000
+
+FINISHED_STATUSES = {
+    "succeeded",
+    "failed",
+    "cancelled",
+}
+
+
+# MARK: - Queries
+
+
+def find_user_ai_job(
+    db: Session,
+    job_id: UUID,
+    user_id: UUID,
+) -> Optional[AIJob]:
+    return (
+        db.query(AIJob)
+        .filter(
+            AIJob.id == job_id,
+            AIJob.user_id == user_id,
+        )
+        .first()
+    )
+
+
+def list_user_ai_jobs(
+    db: Session,
+    user_id: UUID,
+    limit: int,
+) -> List[AIJob]:
+    return (
+        db.query(AIJob)
+        .filter(
+            AIJob.user_id == user_id,
+        )
+        .order_by(
+            AIJob.created_at.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def is_ai_job_finished(
+    job_id: UUID,
+) -> bool:
+    # Roda fora do request: abre a própria sessão.
+    db = SessionLocal()
+
+    try:
+        status = (
+            db.query(AIJob.status)
+            .filter(
+                AIJob.id == job_id,
+            )
+            .scalar()
+        )
+
+        return status is None or status in FINISHED_STATUSES
+
+    finally:
+        db.close()
+
+
+def load_ai_job_response(
+    job_id: UUID,
+) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+
+    try:
+        job = (
+            db.query(AIJob)
+            .filter(
+                AIJob.id == job_id,
+            )
+            .first()
+        )
+
+        if job is None:
+            return None
+
+        return AIJobResponse.model_validate(
+            job
+        ).model_dump(
+            mode="json"
+        )
+
+    finally:
+        db.close()
+
+
+def get_ai_job_channel(
+    job: AIJob,
+) -> str:
+    # O aviso de conclusão sai com o id da task do Celery.
+    return job.celery_task_id or str(job.id)
+
+
+# MARK: - Submit
+
+
+def submit_ai_job(
+    db: Session,
+    user_id: UUID,
+    operation: str,
+    payload: Dict[str, Any],
+    attachment: Optional[bytes] = None,
+) -> AIJob:
+    if operation not in JOB_OPERATIONS:
+        raise ValueError(
+            f"Operação desconhecida: {operation}"
+        )
+
+    job = AIJob(
+        user_id=user_id,
+        operation=operation,
+        payload=payload,
+    )
+
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    # Import tardio: as tasks do Celery importam este módulo.
+    from app.worker.tasks import (
+        run_ai_job,
+    )
+
+    # Arquivos ficam no blob store; a fila recebe só a chave.
+    attachment_key = (
+        blob_store.put(attachment)
+        if attachment
+        else None
+    )
+
+    try:
+        task = run_ai_job.apply_async(
+            args=[
+                str(job.id),
+            ],
+            kwargs={
+                "attachment_key":
+                    attachment_key,
+            },
+        )
+
+    except Exception as error:
+        if attachment_key:
+            blob_store.release(
+                attachment_key
+            )
+
+        job.status = "failed"
+        job.error = "Não foi possível enfileirar o job."
+        job.finished_at = datetime.utcnow()
+
+        db.commit()
+
+        raise RuntimeError(
+            job.error
+        ) from error
+
+    job.celery_task_id = task.id
+
+    db.commit()
+    db.refresh(job)
+
+    logger.info(
+        "ai job submitted",
+        extra={
+            "event":
+                "ai_job_submitted",
+            "jobId":
+                str(job.id),
+            "operation":
+                operation,
+            "taskId":
+                task.id,
+            "attachmentSizeBytes":
+                len(attachment)
+                if attachment
+                else 0,
+        },
+    )
+
+    return job
+
+
+def cancel_ai_job(
+    db: Session,
+    job: AIJob,
+) -> AIJob:
+    if job.status in FINISHED_STATUSES:
+        return job
+
+    # Sem terminate: um job já em execução termina a chamada
+    # atual, mas o resultado é descartado.
+    if job.celery_task_id:
+        from app.worker.celery_app import celery_app
+
+        celery_app.control.revoke(
+            job.celery_task_id
+        )
+
+    job.status = "cancelled"
+    job.finished_at = datetime.utcnow()
+
+    db.commit()
+    db.refresh(job)
+
+    # Um job revogado antes de rodar não dispara o task_postrun.
+    publish_task_event(
+        get_ai_job_channel(job),
+        "REVOKED",
+    )
+
+    logger.info(
+        "ai job cancelled",
+        extra={
+            "event":
+                "ai_job_cancelled",
+            "jobId":
+                str(job.id),
+            "operation":
+                job.operation,
+        },
+    )
+
+    return job
+
+
+# MARK: - Execution
+
+
+@lru_cache(maxsize=1)
+def get_worker_event_loop() -> asyncio.AbstractEventLoop:
+    # Um loop por processo do worker: os clients assíncronos
+    # do gateway e o scheduler ficam presos ao loop em que
+    # foram usados pela primeira vez. Exige uma task por vez
+    # em cada processo, o que celery_app garante recusando
+    # pools de threads, gevent e eventlet.
+    return asyncio.new_event_loop()
+
+
+def execute_ai_job(
+    job_id: str,
+    attachment: Optional[bytes] = None,
+    attachment_key: Optional[str] = None,
+) -> str:
+    db = SessionLocal()
+
+    try:
+        if attachment_key:
+            attachment = load_job_attachment(
+                attachment_key
+            )
+
+        job = (
+            db.query(AIJob)
+            .filter(
+                AIJob.id == UUID(job_id),
+            )
+            .first()
+        )
+
+        if job is None:
+            return "missing"
+
+        if job.status != "queued":
+            return job.status
+
+        started_at = time.perf_counter()
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+
+        db.commit()
+
+        usage_token = current_usage_user_id.set(
+            job.user_id
+        )
+
+        try:
+            result = get_worker_event_loop().run_until_complete(
+                JOB_OPERATIONS[job.operation](
+                    db,
+                    job,
+                    attachment,
+                )
+            )
+
+            status = "succeeded"
+            error_message = None
+
+        except Exception as error:
+            logger.exception(
+                "ai job failed",
+                extra={
+                    "event":
+                        "ai_job_failed",
+                    "jobId":
+                        job_id,
+                    "operation":
+                        job.operation,
+                },
+            )
+
+            result = None
+            status = "failed"
+            error_message = str(
+                getattr(
+                    error,
+                    "detail",
+                    error,
+                )
+            )[:AI_JOB_ERROR_MAX_LENGTH]
+
+        finally:
+            current_usage_user_id.reset(
+                usage_token
+            )
+
+        # Cancelado durante a execução: mantém o cancelamento.
+        current_status = (
+            db.query(AIJob.status)
+            .filter(
+                AIJob.id == job.id,
+            )
+            .scalar()
+        )
+
+        if current_status == "cancelled":
+            db.rollback()
+
+            return current_status
+
+        job.status = status
+        job.result = result
+        job.error = error_message
+        job.finished_at = datetime.utcnow()
+
+        db.commit()
+
+        logger.info(
+            "ai job finished",
+            extra={
+                "event":
+                    "ai_job_finished",
+                "jobId":
+                    job_id,
+                "operation":
+                    job.operation,
+                "status":
+                    status,
+                "durationMs":
+                    round(
+                        (
+                            time.perf_counter()
+                            - started_at
+                        )
+                        * 1000,
+                        2,
+                    ),
+            },
+        )
+
+        return status
+
+    finally:
+        db.close()
+
+        # Depois do job o arquivo não é mais lido, inclusive
+        # quando ele já estava cancelado.
+        if attachment_key:
+            blob_store.release(
+                attachment_key
+            )
+
+        flush_llm_usage()
+
+
+def load_job_attachment(
+    attachment_key: str,
+) -> Optional[bytes]:
+    try:
+        return blob_store.get(
+            attachment_key
+        )
+
+    except BlobNotFoundError:
+        # O job segue sem o arquivo e falha com a
+        # mensagem da própria operação.
+        logger.warning(
+            "ai job attachment not found",
+            extra={
+                "event":
+                    "ai_job_attachment_missing",
+                "attachmentKey":
+                    attachment_key,
+            },
+        )
+
+        return None
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import (
     Depends,
     HTTPException,
@@ -22,6 +24,11 @@ oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/users/login/",
 )
 
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/users/login/",
+    auto_error=False,
+)
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -77,6 +84,38 @@ def get_current_user(
     return user
 
 
+# Para rotas públicas que personalizam a resposta
+# quando a pessoa está autenticada.
+
+def get_optional_current_user(
+    token: Optional[str] = Depends(
+        optional_oauth2_scheme
+    ),
+    db: Session = Depends(get_db),
+) -> Optional[models.User]:
+    if not token:
+        return None
+
+    try:
+        user_id = decode_access_token(
+            token
+        )
+    except (
+        InvalidTokenError,
+        ValueError,
+    ):
+        return None
+
+    return (
+        db.query(models.User)
+        .filter(
+            models.User.id == user_id,
+            models.User.is_active.is_(True),
+        )
+        .first()
+    )
+
+
 # Compatibilidade com imports antigos.
 
 def get_password_hash(
@@ -0,0 +1,387 @@
+import hashlib
+import json
+import os
+import time
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.observability import logger
+
+
+load_dotenv()
+
+
+CACHE_REDIS_URL = (
+    os.getenv("CACHE_REDIS_URL", "").strip()
+    or os.getenv("CELERY_BROKER_URL", "").strip()
+)
+
+# "memory" mantém tudo no processo.
+# "redis" usa o Redis como segunda camada, compartilhada
+# entre a API e o worker, e mantém a memória como primeira
+# camada. Sem valor, usa o Redis sempre que houver uma URL.
+CACHE_BACKEND = (
+    os.getenv("CACHE_BACKEND", "").strip().lower()
+    or ("redis" if CACHE_REDIS_URL else "memory")
+)
+
+if CACHE_BACKEND == "redis" and not CACHE_REDIS_URL:
+    CACHE_REDIS_URL = "redis://localhost:6379"
+
+
+# MARK: - Keys
+
+
+def normalize_cache_text(
+    value: Optional[str],
+) -> str:
+    return " ".join(
+        (value or "")
+        .lower()
+        .split()
+    )
+
+
+def build_cache_key(
+    *parts: Any,
+) -> str:
+    serialized = json.dumps(
+        parts,
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.sha256(
+        serialized.encode("utf-8")
+    ).hexdigest()
+
+
+# MARK: - Redis
+
+
+@lru_cache(maxsize=1)
+def _get_redis_client():
+    from redis import asyncio as redis_asyncio
+
+    return redis_asyncio.from_url(
+        CACHE_REDIS_URL,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_sync_redis_client():
+    import redis
+
+    return redis.from_url(
+        CACHE_REDIS_URL,
+    )
+
+
+# MARK: - TTL Cache
+
+
+_caches: List["TTLCache"] = []
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        cache.namespace: cache.stats()
+        for cache in _caches
+    }
+
+
+class TTLCache:
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        max_entries: int,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+
+        self.hits = 0
+        self.misses = 0
+
+        _caches.append(self)
+
+    async def get(
+        self,
+        key: str,
+    ) -> Optional[Any]:
+        value = self._get_from_memory(
+            key
+        )
+
+        if value is not None:
+            self.hits += 1
+
+            return value
+
+        if CACHE_BACKEND != "redis":
+            self.misses += 1
+
+            return None
+
+        try:
+            raw_value = await (
+                _get_redis_client()
+                .get(
+                    self._redis_key(key)
+                )
+            )
+
+        except Exception:
+            logger.exception(
+                "failed to read cache entry from redis",
+                extra={
+                    "event":
+                        "cache_redis_read_failed",
+                    "namespace":
+                        self.namespace,
+                },
+            )
+
+            self.misses += 1
+
+            return None
+
+        if raw_value is None:
+            self.misses += 1
+
+            return None
+
+        self.hits += 1
+
+        value = json.loads(
+            raw_value
+        )
+
+        self._set_in_memory(
+            key,
+            value,
+        )
+
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+    ) -> None:
+        self._set_in_memory(
+            key,
+            value,
+        )
+
+        if CACHE_BACKEND != "redis":
+            return
+
+        try:
+            await (
+                _get_redis_client()
+                .set(
+                    self._redis_key(key),
+                    json.dumps(
+                        value,
+                        ensure_ascii=False,
+                    ),
+                    ex=self.ttl_seconds,
+                )
+            )
+
+        except Exception:
+            logger.exception(
+                "failed to write cache entry to redis",
+                extra={
+                    "event":
+                        "cache_redis_write_failed",
+                    "namespace":
+                        self.namespace,
+                },
+            )
+
+    # Versões síncronas, para código fora do event loop
+    # (tasks do Celery).
+
+    def get_sync(
+        self,
+        key: str,
+    ) -> Optional[Any]:
+        value = self._get_from_memory(
+            key
+        )
+
+        if value is not None:
+            self.hits += 1
+
+            return value
+
+        if CACHE_BACKEND != "redis":
+            self.misses += 1
+
+            return None
+
+        try:
+            raw_value = (
+                _get_sync_redis_client()
+                .get(
+                    self._redis_key(key)
+                )
+            )
+
+        except Exception:
+            logger.exception(
+                "failed to read cache entry from redis",
+                extra={
+                    "event":
+                        "cache_redis_read_failed",
+                    "namespace":
+                        self.namespace,
+                },
+            )
+
+            self.misses += 1
+
+            return None
+
+        if raw_value is None:
+            self.misses += 1
+
+            return None
+
+        self.hits += 1
+
+        value = json.loads(
+            raw_value
+        )
+
+        self._set_in_memory(
+            key,
+            value,
+        )
+
+        return value
+
+    def set_sync(
+        self,
+        key: str,
+        value: Any,
+    ) -> None:
+        self._set_in_memory(
+            key,
+            value,
+        )
+
+        if CACHE_BACKEND != "redis":
+            return
+
+        try:
+            (
+                _get_sync_redis_client()
+                .set(
+                    self._redis_key(key),
+                    json.dumps(
+                        value,
+                        ensure_ascii=False,
+                    ),
+                    ex=self.ttl_seconds,
+                )
+            )
+
+        except Exception:
+            logger.exception(
+                "failed to write cache entry to redis",
+                extra={
+                    "event":
+                        "cache_redis_write_failed",
+                    "namespace":
+                        self.namespace,
+                },
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+
+        return {
+            "hits":
+                self.hits,
+            "misses":
+                self.misses,
+            "hitRate":
+                round(self.hits / lookups, 4)
+                if lookups
+                else None,
+            "entries":
+                len(self._entries),
+        }
+
+    def _get_from_memory(
+        self,
+        key: str,
+    ) -> Optional[Any]:
+        entry = self._entries.get(
+            key
+        )
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            self._entries.pop(
+                key,
+                None,
+            )
+
+            return None
+
+        self._entries.move_to_end(
+            key
+        )
+
+        return value
+
+    def _set_in_memory(
+        self,
+        key: str,
+        value: Any,
+    ) -> None:
+        self._entries[key] = (
+            time.monotonic()
+            + self.ttl_seconds,
+            value,
+        )
+
+        self._entries.move_to_end(
+            key
+        )
+
+        # Remove as entradas usadas há mais tempo.
+        while (
+            len(self._entries)
+            > self.max_entries
+        ):
+            self._entries.popitem(
+                last=False
+            )
+
+    def _redis_key(
+        self,
+        key: str,
+    ) -> str:
+        return (
+            f"techstep:cache:"
+            f"{self.namespace}:{key}"
+        )
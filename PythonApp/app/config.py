@@ -3,4 +3,9 @@ import os
 OPENAI_MODEL = os.getenv(
     "OPENAI_MODEL",
     "gpt-4",
+)
+
+OPENAI_INTERVIEW_MODEL = os.getenv(
+    "OPENAI_INTERVIEW_MODEL",
+    "gpt-4",
 )
\ No newline at end of file
@@ -0,0 +1,233 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.interview_simulation.models import (
+    SimulationScoreWeekly,
+    SimulationSession,
+    SimulationSessionAnswer,
+)
+from app.observability import logger
+
+
+SIMULATION_HISTORY_SESSION_LIMIT = 20
+
+# Notas somadas por semana; a média sai de total / sessões.
+WEEKLY_SCORE_FIELDS = [
+    "clarity",
+    "technical_knowledge",
+    "overall",
+]
+
+
+def get_week_start(
+    moment: datetime,
+) -> date:
+    return (
+        moment.date()
+        - timedelta(days=moment.weekday())
+    )
+
+
+# MARK: - Storage
+
+
+def save_simulation_session(
+    db: Session,
+    user_id: UUID,
+    job_title: str,
+    seniority: str,
+    mode: str,
+    answers: List[Any],
+    evaluation: Dict[str, Any],
+    answer_evaluations: Optional[Dict[int, Dict[str, Any]]] = None,
+) -> Optional[SimulationSession]:
+    # O histórico não pode derrubar a avaliação: se a
+    # gravação falhar, a resposta segue para o usuário.
+    created_at = datetime.utcnow()
+
+    answer_evaluations = answer_evaluations or {}
+
+    try:
+        session = SimulationSession(
+            user_id=user_id,
+            job_title=job_title[:150],
+            seniority=seniority[:80],
+            mode=mode,
+            clarity=evaluation["clarity"],
+            objectivity=evaluation["objectivity"],
+            examples=evaluation["examples"],
+            technical_knowledge=evaluation["technical_knowledge"],
+            response_time=evaluation["response_time"],
+            overall=evaluation["overall"],
+            summary=evaluation["summary"],
+            strengths=list(evaluation["strengths"]),
+            improvements=list(evaluation["improvements"]),
+            created_at=created_at,
+            answers=[
+                SimulationSessionAnswer(
+                    position=position,
+                    question=answer.question,
+                    answer=answer.answer,
+                    response_time_seconds=answer.response_time_seconds,
+                    evaluation=answer_evaluations.get(position),
+                )
+                for position, answer in enumerate(
+                    answers,
+                    start=1,
+                )
+            ],
+        )
+
+        db.add(session)
+
+        # A tendência semanal é atualizada na mesma transação,
+        # então o histórico nunca precisa recalcular médias.
+        statement = insert(SimulationScoreWeekly).values(
+            user_id=user_id,
+            week_start=get_week_start(created_at),
+            session_count=1,
+            **{
+                f"{field}_total": evaluation[field]
+                for field in WEEKLY_SCORE_FIELDS
+            },
+        )
+
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_simulation_score_weekly_user_week",
+                set_={
+                    column: (
+                        getattr(SimulationScoreWeekly, column)
+                        + statement.excluded[column]
+                    )
+                    for column in [
+                        "session_count",
+                        *(
+                            f"{field}_total"
+                            for field in WEEKLY_SCORE_FIELDS
+                        ),
+                    ]
+                },
+            )
+        )
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+
+        logger.exception(
+            "failed to save simulation session",
+            extra={
+                "event":
+                    "simulation_session_save_failed",
+                "userId":
+                    str(user_id),
+                "mode":
+                    mode,
+            },
+        )
+
+        return None
+
+    logger.info(
+        "simulation session saved",
+        extra={
+            "event":
+                "simulation_session_saved",
+            "userId":
+                str(user_id),
+            "sessionId":
+                str(session.id),
+            "mode":
+                mode,
+            "answerCount":
+                len(answers),
+            "overallScore":
+                evaluation["overall"],
+        },
+    )
+
+    return session
+
+
+# MARK: - Queries
+
+
+def list_score_trends(
+    db: Session,
+    user_id: UUID,
+    weeks: int,
+) -> List[Dict[str, Any]]:
+    first_week = (
+        get_week_start(datetime.utcnow())
+        - timedelta(weeks=weeks - 1)
+    )
+
+    rows = (
+        db.query(SimulationScoreWeekly)
+        .filter(
+            SimulationScoreWeekly.user_id == user_id,
+            SimulationScoreWeekly.week_start >= first_week,
+        )
+        .order_by(
+            SimulationScoreWeekly.week_start.asc()
+        )
+        .all()
+    )
+
+    return [
+        {
+            "week_start":
+                row.week_start,
+            "session_count":
+                row.session_count,
+            **{
+                f"average_{field}": round(
+                    getattr(row, f"{field}_total")
+                    / row.session_count,
+                    1,
+                )
+                for field in WEEKLY_SCORE_FIELDS
+            },
+        }
+        for row in rows
+        if row.session_count
+    ]
+
+
+def list_recent_sessions(
+    db: Session,
+    user_id: UUID,
+    limit: int = SIMULATION_HISTORY_SESSION_LIMIT,
+) -> List[SimulationSession]:
+    return (
+        db.query(SimulationSession)
+        .filter(
+            SimulationSession.user_id == user_id
+        )
+        .order_by(
+            SimulationSession.created_at.desc()
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def find_user_simulation_session(
+    db: Session,
+    user_id: UUID,
+    session_id: UUID,
+) -> Optional[SimulationSession]:
+    return (
+        db.query(SimulationSession)
+        .filter(
+            SimulationSession.id == session_id,
+            SimulationSession.user_id == user_id,
+        )
+        .first()
+    )
\ No newline at end of file
@@ -0,0 +1,716 @@
+import asyncio
+import json
+import os
+import time
+
+from typing import Any, Awaitable, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.database import SessionLocal
+from app.interview_simulation.history import (
+    save_simulation_session,
+)
+from app.interview_simulation.schemas import (
+    SimulationAnswerRequest,
+)
+from app.interview_simulation.service import (
+    aggregate_answer_evaluations,
+    check_failed_answers,
+    evaluate_answer_with_retry,
+)
+from app.interview_simulation.transcription import (
+    transcribe_audio,
+)
+from app.llm.metrics import current_usage_user_id
+from app.observability import logger
+
+
+# Sessão sem nenhuma mensagem por esse tempo é encerrada.
+LIVE_SIMULATION_IDLE_SECONDS = float(
+    os.getenv(
+        "LIVE_SIMULATION_IDLE_SECONDS",
+        "120",
+    )
+)
+
+# Limite do áudio de uma única resposta (o mesmo da API do Whisper).
+LIVE_SIMULATION_MAX_AUDIO_BYTES = int(
+    os.getenv(
+        "LIVE_SIMULATION_MAX_AUDIO_BYTES",
+        str(25 * 1024 * 1024),
+    )
+)
+
+LIVE_SIMULATION_MAX_QUESTIONS = 20
+
+
+class LiveSessionError(Exception):
+    def __init__(
+        self,
+        detail: str,
+    ):
+        super().__init__(detail)
+
+        self.detail = detail
+
+
+class _AnswerRecording:
+    def __init__(
+        self,
+        index: int,
+        segmented: bool,
+    ):
+        self.index = index
+        self.segmented = segmented
+        self.audio = bytearray()
+        self.size_bytes = 0
+
+        # Com segmented, cada frame binário é um arquivo de
+        # áudio completo, transcrito assim que chega.
+        self.segment_transcriptions: List["asyncio.Task[str]"] = []
+
+    def cancel(self) -> None:
+        for task in self.segment_transcriptions:
+            task.cancel()
+
+
+# MARK: - Session
+
+
+class LiveSimulationSession:
+    # Protocolo (JSON em frames de texto, áudio em frames binários):
+    #
+    # -> {"type": "start", "job_title", "seniority", "questions": [...]}
+    # -> {"type": "answer_start", "index", "segmented": false}
+    # -> frames binários com o áudio da resposta
+    # -> {"type": "answer_end", "index", "response_time_seconds", "file_name"}
+    # -> {"type": "answer_text", "index", "answer", "response_time_seconds"}
+    # -> {"type": "finish"}
+    #
+    # <- ready, transcript, answer_evaluation, evaluation e error
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        model: str,
+        user_id: Optional[UUID] = None,
+    ):
+        self.websocket = websocket
+        self.model = model
+        self.user_id = user_id
+
+        self.job_title = ""
+        self.seniority = ""
+        self.questions: List[str] = []
+
+        self.recording: Optional[_AnswerRecording] = None
+        self.answers: Dict[int, SimulationAnswerRequest] = {}
+        self.evaluations: Dict[int, Optional[Dict[str, Any]]] = {}
+
+        self._answer_tasks: Dict[int, "asyncio.Task[None]"] = {}
+
+        # Transcrições e avaliações terminam em paralelo
+        # e respondem pelo mesmo socket.
+        self._send_lock = asyncio.Lock()
+
+        self.started_at = time.perf_counter()
+
+    async def run(self) -> None:
+        await self.websocket.accept()
+
+        usage_token = current_usage_user_id.set(
+            self.user_id
+        )
+
+        logger.info(
+            "live simulation session started",
+            extra={
+                "event":
+                    "live_simulation_started",
+                "authenticated":
+                    self.user_id is not None,
+            },
+        )
+
+        try:
+            while True:
+                message = await asyncio.wait_for(
+                    self.websocket.receive(),
+                    LIVE_SIMULATION_IDLE_SECONDS,
+                )
+
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                try:
+                    if message.get("bytes") is not None:
+                        self.handle_audio(
+                            message["bytes"]
+                        )
+
+                        continue
+
+                    if await self.handle_message(
+                        parse_message(
+                            message.get("text") or ""
+                        )
+                    ):
+                        break
+
+                except LiveSessionError as error:
+                    await self.send(
+                        {
+                            "type":
+                                "error",
+                            "detail":
+                                error.detail,
+                        }
+                    )
+
+        except asyncio.TimeoutError:
+            await self.close(
+                "Sessão encerrada por inatividade."
+            )
+
+        except WebSocketDisconnect:
+            pass
+
+        finally:
+            for task in self._answer_tasks.values():
+                task.cancel()
+
+            self.discard_recording()
+
+            current_usage_user_id.reset(
+                usage_token
+            )
+
+            logger.info(
+                "live simulation session finished",
+                extra={
+                    "event":
+                        "live_simulation_finished",
+                    "questionCount":
+                        len(self.questions),
+                    "answerCount":
+                        len(self.answers),
+                    "durationMs":
+                        round(
+                            (
+                                time.perf_counter()
+                                - self.started_at
+                            )
+                            * 1000,
+                            2,
+                        ),
+                },
+            )
+
+    # MARK: - Messages
+
+    async def handle_message(
+        self,
+        message: Dict[str, Any],
+    ) -> bool:
+        message_type = message.get("type")
+
+        if message_type == "start":
+            await self.start(message)
+
+            return False
+
+        if not self.questions:
+            raise LiveSessionError(
+                "Envie a mensagem start antes das respostas."
+            )
+
+        if message_type == "answer_start":
+            index = self.validate_index(message)
+
+            # Um answer_start sem answer_end descarta a gravação
+            # anterior, e com ela as transcrições em andamento.
+            self.discard_recording()
+
+            self.recording = _AnswerRecording(
+                index=index,
+                segmented=bool(
+                    message.get("segmented")
+                ),
+            )
+
+            return False
+
+        if message_type == "answer_end":
+            self.finish_recording(message)
+
+            return False
+
+        if message_type == "answer_text":
+            index = self.validate_index(message)
+            response_time_seconds = parse_response_time(message)
+
+            self.submit_answer(
+                index,
+                provided_transcript(
+                    str(message.get("answer") or "")
+                ),
+                response_time_seconds,
+            )
+
+            return False
+
+        if message_type == "finish":
+            await self.finish()
+
+            return True
+
+        raise LiveSessionError(
+            f"Mensagem desconhecida: {message_type}"
+        )
+
+    async def start(
+        self,
+        message: Dict[str, Any],
+    ) -> None:
+        if self.questions:
+            raise LiveSessionError(
+                "A sessão já foi iniciada."
+            )
+
+        job_title = str(message.get("job_title") or "").strip()
+        seniority = str(message.get("seniority") or "").strip()
+
+        questions = [
+            str(question).strip()
+            for question in message.get("questions") or []
+            if str(question).strip()
+        ][:LIVE_SIMULATION_MAX_QUESTIONS]
+
+        if not job_title or not seniority or not questions:
+            raise LiveSessionError(
+                "Informe job_title, seniority e questions."
+            )
+
+        self.job_title = job_title
+        self.seniority = seniority
+        self.questions = questions
+
+        await self.send(
+            {
+                "type":
+                    "ready",
+                "question_count":
+                    len(questions),
+            }
+        )
+
+    def handle_audio(
+        self,
+        chunk: bytes,
+    ) -> None:
+        recording = self.recording
+
+        if recording is None:
+            raise LiveSessionError(
+                "Envie answer_start antes do áudio."
+            )
+
+        recording.size_bytes += len(chunk)
+
+        if recording.size_bytes > LIVE_SIMULATION_MAX_AUDIO_BYTES:
+            self.discard_recording()
+
+            raise LiveSessionError(
+                "O áudio da resposta passou do tamanho máximo."
+            )
+
+        if recording.segmented:
+            recording.segment_transcriptions.append(
+                asyncio.create_task(
+                    transcribe_audio(
+                        chunk,
+                        "segment-{}.m4a".format(
+                            len(recording.segment_transcriptions)
+                        ),
+                    )
+                )
+            )
+
+        else:
+            recording.audio.extend(chunk)
+
+    def discard_recording(self) -> None:
+        if self.recording is not None:
+            self.recording.cancel()
+
+        self.recording = None
+
+    def finish_recording(
+        self,
+        message: Dict[str, Any],
+    ) -> None:
+        recording = self.recording
+
+        if recording is None or recording.index != self.validate_index(message):
+            raise LiveSessionError(
+                "Nenhuma gravação em andamento para essa pergunta."
+            )
+
+        response_time_seconds = parse_response_time(message)
+
+        self.recording = None
+
+        if recording.segmented:
+            segment_transcriptions = recording.segment_transcriptions
+
+            async def transcribe() -> str:
+                texts = await asyncio.gather(
+                    *segment_transcriptions
+                )
+
+                return " ".join(
+                    text
+                    for text in texts
+                    if text
+                )
+
+        else:
+            audio = bytes(recording.audio)
+            file_name = str(
+                message.get("file_name")
+                or "answer.m4a"
+            )
+
+            if not audio:
+                raise LiveSessionError(
+                    "O áudio recebido está vazio."
+                )
+
+            async def transcribe() -> str:
+                return await transcribe_audio(
+                    audio,
+                    file_name,
+                )
+
+        self.submit_answer(
+            recording.index,
+            transcribe(),
+            response_time_seconds,
+        )
+
+    def submit_answer(
+        self,
+        index: int,
+        transcript: Awaitable[str],
+        response_time_seconds: int,
+    ) -> None:
+        previous_task = self._answer_tasks.get(index)
+
+        if previous_task is not None:
+            # Resposta regravada: a anterior é descartada.
+            previous_task.cancel()
+
+        self._answer_tasks[index] = asyncio.create_task(
+            self.process_answer(
+                index,
+                transcript,
+                response_time_seconds,
+            )
+        )
+
+    # MARK: - Processing
+
+    async def process_answer(
+        self,
+        index: int,
+        transcript: Awaitable[str],
+        response_time_seconds: int,
+    ) -> None:
+        try:
+            answer_text = await transcript
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception:
+            logger.exception(
+                "failed to transcribe live simulation answer",
+                extra={
+                    "event":
+                        "live_simulation_transcription_failed",
+                    "answerIndex":
+                        index,
+                },
+            )
+
+            await self.send_answer_error(
+                index,
+                "Erro ao transcrever o áudio.",
+            )
+
+            return
+
+        if not answer_text:
+            await self.send_answer_error(
+                index,
+                "A resposta está vazia.",
+            )
+
+            return
+
+        answer = SimulationAnswerRequest(
+            question=self.questions[index],
+            answer=answer_text,
+            response_time_seconds=response_time_seconds,
+        )
+
+        self.answers[index] = answer
+
+        await self.send(
+            {
+                "type":
+                    "transcript",
+                "index":
+                    index,
+                "transcript":
+                    answer_text,
+            }
+        )
+
+        # A avaliação começa enquanto a pessoa responde
+        # a próxima pergunta.
+        evaluation = await evaluate_answer_with_retry(
+            model=self.model,
+            job_title=self.job_title,
+            seniority=self.seniority,
+            index=index + 1,
+            answer=answer,
+        )
+
+        self.evaluations[index] = evaluation
+
+        if evaluation is None:
+            await self.send_answer_error(
+                index,
+                "Não foi possível avaliar a resposta.",
+            )
+
+            return
+
+        await self.send(
+            {
+                "type":
+                    "answer_evaluation",
+                "index":
+                    index,
+                "evaluation":
+                    evaluation,
+            }
+        )
+
+    async def finish(self) -> None:
+        if self.recording is not None:
+            raise LiveSessionError(
+                "Termine a gravação antes de finalizar."
+            )
+
+        await asyncio.gather(
+            *self._answer_tasks.values(),
+            return_exceptions=True,
+        )
+
+        evaluations = {
+            index + 1: evaluation
+            for index, evaluation in sorted(
+                self.evaluations.items()
+            )
+            if evaluation is not None
+        }
+
+        # Toda pergunta feita conta: sem resposta, com a
+        # transcrição falha ou cancelada, entra como falha.
+        failed_answers = [
+            index + 1
+            for index in range(len(self.questions))
+            if self.evaluations.get(index) is None
+        ]
+
+        try:
+            check_failed_answers(
+                evaluated_count=len(evaluations),
+                failed_count=len(failed_answers),
+                answer_count=len(self.questions),
+            )
+
+        except ValueError as error:
+            await self.close(
+                str(error)
+            )
+
+            return
+
+        evaluation = aggregate_answer_evaluations(
+            evaluations=evaluations,
+            answer_count=len(self.questions),
+            failed_answers=failed_answers,
+        )
+
+        await self.send(
+            {
+                "type":
+                    "evaluation",
+                "evaluation":
+                    evaluation,
+            }
+        )
+
+        await self.websocket.close()
+
+        if self.user_id is not None:
+            await asyncio.to_thread(
+                self.save_history,
+                evaluation,
+            )
+
+    def save_history(
+        self,
+        evaluation: Dict[str, Any],
+    ) -> None:
+        indexes = sorted(self.answers)
+
+        db = SessionLocal()
+
+        try:
+            save_simulation_session(
+                db,
+                user_id=self.user_id,
+                job_title=self.job_title,
+                seniority=self.seniority,
+                mode="live",
+                answers=[
+                    self.answers[index]
+                    for index in indexes
+                ],
+                evaluation=evaluation,
+                answer_evaluations={
+                    position: self.evaluations[index]
+                    for position, index in enumerate(
+                        indexes,
+                        start=1,
+                    )
+                    if self.evaluations.get(index) is not None
+                },
+            )
+
+        finally:
+            db.close()
+
+    # MARK: - Helpers
+
+    def validate_index(
+        self,
+        message: Dict[str, Any],
+    ) -> int:
+        index = message.get("index")
+
+        if (
+            not isinstance(index, int)
+            or isinstance(index, bool)
+            or not 0 <= index < len(self.questions)
+        ):
+            raise LiveSessionError(
+                "Índice de pergunta inválido."
+            )
+
+        return index
+
+    async def send(
+        self,
+        payload: Dict[str, Any],
+    ) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(
+                json.dumps(
+                    payload,
+                    ensure_ascii=False,
+                    default=str,
+                )
+            )
+
+    async def send_answer_error(
+        self,
+        index: int,
+        detail: str,
+    ) -> None:
+        await self.send(
+            {
+                "type":
+                    "error",
+                "index":
+                    index,
+                "detail":
+                    detail,
+            }
+        )
+
+    async def close(
+        self,
+        detail: str,
+    ) -> None:
+        try:
+            await self.send(
+                {
+                    "type":
+                        "error",
+                    "detail":
+                        detail,
+                }
+            )
+
+            await self.websocket.close()
+
+        except (RuntimeError, WebSocketDisconnect):
+            pass
+
+
+def parse_message(
+    text: str,
+) -> Dict[str, Any]:
+    try:
+        message = json.loads(text)
+
+    except json.JSONDecodeError as error:
+        raise LiveSessionError(
+            "Mensagem JSON inválida."
+        ) from error
+
+    if not isinstance(message, dict):
+        raise LiveSessionError(
+            "Mensagem JSON inválida."
+        )
+
+    return message
+
+
+def parse_response_time(
+    message: Dict[str, Any],
+) -> int:
+    try:
+        return max(
+            0,
+            int(message.get("response_time_seconds") or 0),
+        )
+
+    except (TypeError, ValueError) as error:
+        raise LiveSessionError(
+            "response_time_seconds deve ser um número inteiro."
+        ) from error
+
+
+async def provided_transcript(
+    answer: str,
+) -> str:
+    # Resposta já transcrita pelo cliente.
+    return answer.strip()
\ No newline at end of file
@@ -1,17 +1,19 @@
 import uuid
 
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import (
     Column,
+    Date,
     DateTime,
     ForeignKey,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -82,4 +84,297 @@ class SavedInterviewQuestion(Base):
     question_set = relationship(
         "InterviewQuestionSet",
         back_populates="questions",
+    )
+
+
+class QuestionBankQuestion(Base):
+    __tablename__ = "question_bank_questions"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # Hash do cargo e da senioridade normalizados.
+    bucket_key = Column(
+        String(64),
+        nullable=False,
+        index=True,
+    )
+
+    job_title = Column(
+        String(150),
+        nullable=False,
+    )
+
+    seniority = Column(
+        String(80),
+        nullable=False,
+    )
+
+    text = Column(
+        Text,
+        nullable=False,
+    )
+
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+
+class QuestionBankDelivery(Base):
+    __tablename__ = "question_bank_deliveries"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "question_id",
+            name="uq_question_bank_deliveries_user_question",
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    question_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "question_bank_questions.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    delivered_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+
+
+class SimulationSession(Base):
+    __tablename__ = "simulation_sessions"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    job_title = Column(
+        String(150),
+        nullable=False,
+    )
+
+    seniority = Column(
+        String(80),
+        nullable=False,
+    )
+
+    # "combined", "per_answer" ou "live".
+    mode = Column(
+        String(20),
+        nullable=False,
+    )
+
+    clarity = Column(
+        Integer,
+        nullable=False,
+    )
+
+    objectivity = Column(
+        Integer,
+        nullable=False,
+    )
+
+    examples = Column(
+        Integer,
+        nullable=False,
+    )
+
+    technical_knowledge = Column(
+        Integer,
+        nullable=False,
+    )
+
+    response_time = Column(
+        Integer,
+        nullable=False,
+    )
+
+    overall = Column(
+        Integer,
+        nullable=False,
+    )
+
+    summary = Column(
+        Text,
+        nullable=False,
+    )
+
+    strengths = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+    )
+
+    improvements = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+    )
+
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        index=True,
+    )
+
+    answers = relationship(
+        "SimulationSessionAnswer",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="SimulationSessionAnswer.position",
+    )
+
+
+class SimulationSessionAnswer(Base):
+    __tablename__ = "simulation_session_answers"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "simulation_sessions.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    position = Column(
+        Integer,
+        nullable=False,
+    )
+
+    question = Column(
+        Text,
+        nullable=False,
+    )
+
+    answer = Column(
+        Text,
+        nullable=False,
+    )
+
+    response_time_seconds = Column(
+        Integer,
+        nullable=False,
+    )
+
+    # Só preenchida quando a resposta foi avaliada
+    # individualmente, como na sessão ao vivo.
+    evaluation = Column(
+        JSONB,
+        nullable=True,
+    )
+
+    session = relationship(
+        "SimulationSession",
+        back_populates="answers",
+    )
+
+
+class SimulationScoreWeekly(Base):
+    __tablename__ = "simulation_score_weekly"
+
+    # Uma linha por usuário e semana; os totais são
+    # somados a cada sessão gravada.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "week_start",
+            name="uq_simulation_score_weekly_user_week",
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    # Segunda-feira da semana.
+    week_start = Column(
+        Date,
+        nullable=False,
+        default=date.today,
+    )
+
+    session_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    clarity_total = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    technical_knowledge_total = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    overall_total = Column(
+        Integer,
+        nullable=False,
+        default=0,
     )
\ No newline at end of file
@@ -0,0 +1,359 @@
+import os
+import re
+import unicodedata
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# MARK: - Configuration
+
+
+# Respostas com menos palavras distintas que isso, e que não
+# citam a pergunta, não vão para o modelo: recebem nota e
+# feedback locais. Baixo de propósito, para que listas curtas
+# como "Singleton, Factory, Observer" sigam para o modelo.
+SIMULATION_PRESCORING_MIN_WORDS = int(
+    os.getenv(
+        "SIMULATION_PRESCORING_MIN_WORDS",
+        "3",
+    )
+)
+
+# Sem tempo registrado e sem citar a pergunta, só respostas
+# com menos palavras distintas que isso são tidas como fora
+# do tema: uma resposta longa pode parafrasear a pergunta.
+SIMULATION_PRESCORING_OFF_TOPIC_MAX_WORDS = int(
+    os.getenv(
+        "SIMULATION_PRESCORING_OFF_TOPIC_MAX_WORDS",
+        "12",
+    )
+)
+
+# Faixa de tempo considerada adequada para uma resposta.
+IDEAL_RESPONSE_MIN_SECONDS = 20
+IDEAL_RESPONSE_MAX_SECONDS = 180
+
+# Teto das notas locais: uma resposta degenerada
+# nunca passa disso em nenhum critério.
+LOCAL_SCORE_CEILING = 30
+
+KEYWORD_MIN_LENGTH = 4
+
+# Prefixo comparado entre pergunta e resposta, para que
+# "serviço" e "serviços" contem como a mesma palavra.
+KEYWORD_STEM_LENGTH = 6
+
+STOPWORDS = {
+    "como",
+    "para",
+    "qual",
+    "quais",
+    "quando",
+    "onde",
+    "porque",
+    "sobre",
+    "entre",
+    "esse",
+    "essa",
+    "isso",
+    "este",
+    "esta",
+    "isto",
+    "aquele",
+    "aquela",
+    "voce",
+    "seus",
+    "suas",
+    "pelo",
+    "pela",
+    "pelos",
+    "pelas",
+    "mais",
+    "menos",
+    "muito",
+    "algum",
+    "alguma",
+    "cada",
+    "explique",
+    "descreva",
+    "conte",
+    "fale",
+    "exemplo",
+    "utiliza",
+    "usaria",
+    "faria",
+    "seria",
+    "sido",
+    "tinha",
+}
+
+DEGENERATE_FEEDBACK = {
+    "empty": (
+        "Resposta em branco: não houve conteúdo para avaliar.",
+        "Responda a pergunta, mesmo que de forma parcial, "
+        "explicando o seu raciocínio.",
+    ),
+    "too_short": (
+        "Resposta curta demais para uma avaliação detalhada.",
+        "Desenvolva a resposta com contexto, raciocínio "
+        "e um exemplo prático.",
+    ),
+    "off_topic": (
+        "Resposta sem tempo registrado e sem relação "
+        "com a pergunta.",
+        "Responda diretamente ao que foi perguntado, "
+        "citando os conceitos envolvidos.",
+    ),
+}
+
+
+# MARK: - Prescore
+
+
+class AnswerPrescore:
+    def __init__(
+        self,
+        word_count: int,
+        distinct_word_count: int,
+        keyword_coverage: Optional[float],
+        response_time_score: int,
+        degenerate_reason: Optional[str],
+    ):
+        self.word_count = word_count
+        self.distinct_word_count = distinct_word_count
+
+        # None quando a pergunta não tem palavras-chave.
+        self.keyword_coverage = keyword_coverage
+        self.response_time_score = response_time_score
+
+        # "empty", "too_short" ou "off_topic";
+        # None para respostas que vão ao modelo.
+        self.degenerate_reason = degenerate_reason
+
+    @property
+    def is_degenerate(self) -> bool:
+        return self.degenerate_reason is not None
+
+    def to_log(self) -> Dict[str, Any]:
+        return {
+            "wordCount":
+                self.word_count,
+            "keywordCoverage":
+                round(self.keyword_coverage, 2)
+                if self.keyword_coverage is not None
+                else None,
+            "responseTimeScore":
+                self.response_time_score,
+            "degenerateReason":
+                self.degenerate_reason,
+        }
+
+
+def prescore_answer(
+    answer: Any,
+) -> AnswerPrescore:
+    words = tokenize(
+        answer.answer or ""
+    )
+
+    distinct_word_count = len(
+        set(words)
+    )
+
+    keyword_coverage = compute_keyword_coverage(
+        question=answer.question or "",
+        answer_words=words,
+    )
+
+    response_time_seconds = (
+        answer.response_time_seconds
+        or 0
+    )
+
+    degenerate_reason = None
+
+    if not words:
+        degenerate_reason = "empty"
+
+    elif (
+        distinct_word_count < SIMULATION_PRESCORING_MIN_WORDS
+        and not keyword_coverage
+    ):
+        # Também pega respostas repetitivas como "não sei não sei".
+        # Uma resposta curta que cita a pergunta vai ao modelo.
+        degenerate_reason = "too_short"
+
+    elif (
+        response_time_seconds <= 0
+        and keyword_coverage == 0
+        and distinct_word_count < SIMULATION_PRESCORING_OFF_TOPIC_MAX_WORDS
+    ):
+        # Sem tempo registrado o texto costuma ser colado;
+        # só passa adiante se ao menos tocar na pergunta.
+        degenerate_reason = "off_topic"
+
+    return AnswerPrescore(
+        word_count=len(words),
+        distinct_word_count=distinct_word_count,
+        keyword_coverage=keyword_coverage,
+        response_time_score=score_response_time(
+            response_time_seconds
+        ),
+        degenerate_reason=degenerate_reason,
+    )
+
+
+def split_degenerate_answers(
+    answers: List[Any],
+) -> Tuple[List[Any], Dict[int, Dict[str, Any]]]:
+    substantive_answers: List[Any] = []
+
+    local_evaluations: Dict[int, Dict[str, Any]] = {}
+
+    for index, answer in enumerate(
+        answers,
+        start=1,
+    ):
+        prescore = prescore_answer(answer)
+
+        if prescore.is_degenerate:
+            local_evaluations[index] = build_local_evaluation(
+                prescore
+            )
+
+        else:
+            substantive_answers.append(answer)
+
+    return (
+        substantive_answers,
+        local_evaluations,
+    )
+
+
+# MARK: - Heuristics
+
+
+def tokenize(
+    text: str,
+) -> List[str]:
+    normalized = unicodedata.normalize(
+        "NFKD",
+        text.lower(),
+    )
+
+    return re.findall(
+        r"[a-z0-9]+",
+        normalized.encode(
+            "ascii",
+            "ignore",
+        ).decode(
+            "ascii"
+        ),
+    )
+
+
+def compute_keyword_coverage(
+    question: str,
+    answer_words: List[str],
+) -> Optional[float]:
+    keywords = {
+        word[:KEYWORD_STEM_LENGTH]
+        for word in tokenize(question)
+        if len(word) >= KEYWORD_MIN_LENGTH
+        and word not in STOPWORDS
+    }
+
+    if not keywords:
+        return None
+
+    answer_stems = {
+        word[:KEYWORD_STEM_LENGTH]
+        for word in answer_words
+    }
+
+    return len(
+        keywords & answer_stems
+    ) / len(keywords)
+
+
+def score_response_time(
+    response_time_seconds: int,
+) -> int:
+    if response_time_seconds <= 0:
+        return 0
+
+    if response_time_seconds < IDEAL_RESPONSE_MIN_SECONDS:
+        return round(
+            100
+            * response_time_seconds
+            / IDEAL_RESPONSE_MIN_SECONDS
+        )
+
+    if response_time_seconds <= IDEAL_RESPONSE_MAX_SECONDS:
+        return 100
+
+    # Passou da faixa: perde um ponto a cada 3 segundos.
+    return max(
+        40,
+        round(
+            100
+            - (
+                response_time_seconds
+                - IDEAL_RESPONSE_MAX_SECONDS
+            )
+            / 3
+        ),
+    )
+
+
+# MARK: - Local Evaluation
+
+
+def build_local_evaluation(
+    prescore: AnswerPrescore,
+) -> Dict[str, Any]:
+    content_score = min(
+        LOCAL_SCORE_CEILING,
+        prescore.word_count * 5,
+    )
+
+    scores = {
+        "clarity":
+            content_score,
+        "objectivity":
+            content_score,
+        "examples":
+            0,
+        "technical_knowledge":
+            round(
+                LOCAL_SCORE_CEILING
+                * (prescore.keyword_coverage or 0)
+            ),
+        "response_time":
+            min(
+                LOCAL_SCORE_CEILING,
+                prescore.response_time_score,
+            )
+            if prescore.word_count
+            else 0,
+    }
+
+    summary, improvement = DEGENERATE_FEEDBACK[
+        prescore.degenerate_reason
+    ]
+
+    return {
+        **scores,
+        "overall":
+            round(
+                sum(scores.values())
+                / len(scores)
+            ),
+        "summary":
+            summary,
+        "strengths":
+            [],
+        "improvements": [
+            improvement,
+        ],
+    }
\ No newline at end of file
@@ -0,0 +1,427 @@
+import os
+import time
+
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query, Session
+
+from app.cache import (
+    build_cache_key,
+    normalize_cache_text,
+)
+from app.config import OPENAI_INTERVIEW_MODEL
+from app.interview_simulation.models import (
+    QuestionBankDelivery,
+    QuestionBankQuestion,
+)
+from app.interview_simulation.service import (
+    build_simulation_questions_messages,
+    build_simulation_questions_prompt,
+    parse_questions,
+)
+from app.llm.gateway import (
+    create_chat_completion_sync,
+)
+from app.observability import logger
+
+
+# Abaixo deste número de perguntas inéditas,
+# o banco do cargo/senioridade é reabastecido.
+QUESTION_BANK_LOW_WATERMARK = int(
+    os.getenv(
+        "QUESTION_BANK_LOW_WATERMARK",
+        "15",
+    )
+)
+
+# Perguntas inéditas que um refill tenta garantir: para o
+# banco como um todo e, se veio de um usuário, para ele.
+QUESTION_BANK_TARGET_SIZE = int(
+    os.getenv(
+        "QUESTION_BANK_TARGET_SIZE",
+        "60",
+    )
+)
+
+QUESTION_BANK_REFILL_BATCH_SIZE = int(
+    os.getenv(
+        "QUESTION_BANK_REFILL_BATCH_SIZE",
+        "20",
+    )
+)
+
+QUESTION_BANK_REFILL_COOLDOWN_SECONDS = int(
+    os.getenv(
+        "QUESTION_BANK_REFILL_COOLDOWN_SECONDS",
+        "300",
+    )
+)
+
+# Formato: "iOS Developer|Pleno,Backend Developer|Júnior"
+QUESTION_BANK_SEED_BUCKETS = os.getenv(
+    "QUESTION_BANK_SEED_BUCKETS",
+    "",
+)
+
+
+_last_refill_requests: Dict[str, float] = {}
+
+
+# MARK: - Buckets
+
+
+def build_bucket_key(
+    job_title: str,
+    seniority: str,
+) -> str:
+    return build_cache_key(
+        normalize_cache_text(
+            job_title
+        ),
+        normalize_cache_text(
+            seniority
+        ),
+    )
+
+
+def parse_seed_buckets() -> List[Tuple[str, str]]:
+    buckets: List[Tuple[str, str]] = []
+
+    for raw_bucket in QUESTION_BANK_SEED_BUCKETS.split(","):
+        job_title, _, seniority = (
+            raw_bucket.partition("|")
+        )
+
+        if job_title.strip() and seniority.strip():
+            buckets.append(
+                (
+                    job_title.strip(),
+                    seniority.strip(),
+                )
+            )
+
+    return buckets
+
+
+# MARK: - Sampling
+
+
+def query_unseen_questions(
+    db: Session,
+    job_title: str,
+    seniority: str,
+    user_id: Optional[UUID],
+) -> Query:
+    query = (
+        db.query(QuestionBankQuestion)
+        .filter(
+            QuestionBankQuestion.bucket_key
+            == build_bucket_key(
+                job_title,
+                seniority,
+            )
+        )
+    )
+
+    # Usuários autenticados não recebem
+    # perguntas que já viram.
+    if user_id is not None:
+        query = query.filter(
+            QuestionBankQuestion.id.notin_(
+                select(
+                    QuestionBankDelivery.question_id
+                ).where(
+                    QuestionBankDelivery.user_id
+                    == user_id
+                )
+            )
+        )
+
+    return query
+
+
+def sample_bank_questions(
+    db: Session,
+    job_title: str,
+    seniority: str,
+    user_id: Optional[UUID],
+    count: int,
+) -> Tuple[List[str], int]:
+    query = query_unseen_questions(
+        db,
+        job_title,
+        seniority,
+        user_id,
+    )
+
+    available_count = query.count()
+
+    if available_count < count:
+        return [], available_count
+
+    selected_questions = (
+        query
+        .order_by(func.random())
+        .limit(count)
+        .all()
+    )
+
+    if user_id is not None:
+        # Duas requisições simultâneas podem sortear a mesma
+        # pergunta; a entrega é gravada uma vez só.
+        db.execute(
+            insert(QuestionBankDelivery)
+            .values(
+                [
+                    {
+                        "user_id":
+                            user_id,
+                        "question_id":
+                            question.id,
+                    }
+                    for question in selected_questions
+                ]
+            )
+            .on_conflict_do_nothing(
+                constraint="uq_question_bank_deliveries_user_question",
+            )
+        )
+
+        db.commit()
+
+    return (
+        [
+            question.text
+            for question in selected_questions
+        ],
+        available_count
+        - len(selected_questions),
+    )
+
+
+# MARK: - Storage
+
+
+def store_bank_questions(
+    db: Session,
+    job_title: str,
+    seniority: str,
+    questions: List[str],
+) -> int:
+    bucket_key = build_bucket_key(
+        job_title,
+        seniority,
+    )
+
+    existing_texts = {
+        normalize_cache_text(text)
+        for (text,) in (
+            db.query(QuestionBankQuestion.text)
+            .filter(
+                QuestionBankQuestion.bucket_key
+                == bucket_key
+            )
+            .all()
+        )
+    }
+
+    inserted_count = 0
+
+    for question in questions:
+        normalized_question = (
+            normalize_cache_text(
+                question
+            )
+        )
+
+        if (
+            not normalized_question
+            or normalized_question
+            in existing_texts
+        ):
+            continue
+
+        existing_texts.add(
+            normalized_question
+        )
+
+        db.add(
+            QuestionBankQuestion(
+                bucket_key=bucket_key,
+                job_title=job_title[:150],
+                seniority=seniority[:80],
+                text=question.strip(),
+            )
+        )
+
+        inserted_count += 1
+
+    db.commit()
+
+    return inserted_count
+
+
+# MARK: - Refill
+
+
+def request_bank_refill(
+    job_title: str,
+    seniority: str,
+    user_id: Optional[UUID] = None,
+) -> None:
+    # O cooldown é por usuário: o refill de um não
+    # garante perguntas inéditas para outro.
+    bucket_key = build_cache_key(
+        build_bucket_key(
+            job_title,
+            seniority,
+        ),
+        str(user_id or ""),
+    )
+
+    now = time.monotonic()
+
+    last_request = _last_refill_requests.get(
+        bucket_key
+    )
+
+    if (
+        last_request is not None
+        and now - last_request
+        < QUESTION_BANK_REFILL_COOLDOWN_SECONDS
+    ):
+        return
+
+    _last_refill_requests[bucket_key] = now
+
+    # Import tardio: as tasks do Celery importam este módulo.
+    from app.worker.tasks import (
+        refill_question_bank,
+    )
+
+    try:
+        refill_question_bank.delay(
+            job_title,
+            seniority,
+            str(user_id) if user_id else None,
+        )
+
+        logger.info(
+            "question bank refill requested",
+            extra={
+                "event":
+                    "question_bank_refill_requested",
+                "jobTitle":
+                    job_title,
+                "seniority":
+                    seniority,
+            },
+        )
+
+    except Exception:
+        logger.exception(
+            "failed to request question bank refill",
+            extra={
+                "event":
+                    "question_bank_refill_request_failed",
+                "jobTitle":
+                    job_title,
+                "seniority":
+                    seniority,
+            },
+        )
+
+
+def refill_bank(
+    db: Session,
+    job_title: str,
+    seniority: str,
+    user_id: Optional[UUID] = None,
+    max_batches: int = 3,
+) -> int:
+    inserted_total = 0
+
+    for _ in range(max_batches):
+        bank_size = query_unseen_questions(
+            db,
+            job_title,
+            seniority,
+            None,
+        ).count()
+
+        # Um usuário que já viu quase todo o banco faz o
+        # banco crescer até ter perguntas inéditas para ele.
+        unseen_count = (
+            query_unseen_questions(
+                db,
+                job_title,
+                seniority,
+                user_id,
+            ).count()
+            if user_id is not None
+            else bank_size
+        )
+
+        if (
+            bank_size >= QUESTION_BANK_TARGET_SIZE
+            and unseen_count >= QUESTION_BANK_TARGET_SIZE
+        ):
+            break
+
+        prompt = build_simulation_questions_prompt(
+            job_title=job_title,
+            seniority=seniority,
+            question_count=
+                QUESTION_BANK_REFILL_BATCH_SIZE,
+        )
+
+        response = create_chat_completion_sync(
+            endpoint="question_bank_refill",
+            model=OPENAI_INTERVIEW_MODEL,
+            messages=build_simulation_questions_messages(
+                prompt
+            ),
+            # Mais variação para o banco não repetir perguntas.
+            temperature=0.9,
+        )
+
+        if not response.choices:
+            break
+
+        questions = parse_questions(
+            response.choices[0].message.content
+            or ""
+        )
+
+        inserted_count = store_bank_questions(
+            db,
+            job_title,
+            seniority,
+            questions,
+        )
+
+        inserted_total += inserted_count
+
+        if not inserted_count:
+            break
+
+    logger.info(
+        "question bank refilled",
+        extra={
+            "event":
+                "question_bank_refilled",
+            "jobTitle":
+                job_title,
+            "seniority":
+                seniority,
+            "userId":
+                str(user_id) if user_id else None,
+            "insertedCount":
+                inserted_total,
+        },
+    )
+
+    return inserted_total
@@ -1,29 +1,46 @@
 # app/interview_simulation/router.py
 
 import asyncio
-import json
 import os
-import re
-import tempfile
 import time
 
+from typing import Optional
+from uuid import UUID
+
 from dotenv import load_dotenv
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     HTTPException,
+    Query,
     UploadFile,
+    WebSocket,
     status,
 )
 
-from openai import OpenAI
-
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.auth.dependencies import (
+    get_current_user,
+    get_optional_current_user,
+)
+from app.cache import (
+    TTLCache,
+    build_cache_key,
+    normalize_cache_text,
+)
+from app.database import SessionLocal, get_db
+from app.llm.gateway import (
+    create_chat_completion,
+)
+from app.llm.resilience import (
+    LLMDeadlineExceeded,
+)
+from app.models import User
 from app.observability import logger
 
 from app.interview_simulation.models import (
@@ -31,12 +48,45 @@ from app.interview_simulation.models import (
     SavedInterviewQuestion,
 )
 
+from app.interview_simulation.question_bank import (
+    QUESTION_BANK_LOW_WATERMARK,
+    request_bank_refill,
+    sample_bank_questions,
+    store_bank_questions,
+)
+
+from app.interview_simulation.service import (
+    build_simulation_questions_messages,
+    build_simulation_questions_prompt,
+    evaluate_simulation,
+    parse_questions,
+)
+
+from app.interview_simulation.history import (
+    find_user_simulation_session,
+    list_recent_sessions,
+    list_score_trends,
+    save_simulation_session,
+)
+
+from app.interview_simulation.live import (
+    LiveSimulationSession,
+)
+
+from app.interview_simulation.transcription import (
+    TRANSCRIPTION_MAX_BYTES,
+    TRANSCRIPTION_MODEL,
+    transcribe_audio,
+)
+
 from app.interview_simulation.schemas import (
     SaveGeneratedQuestionsRequest,
     SaveGeneratedQuestionsResponse,
     SimulationEvaluationRequest,
-    SimulationEvaluationResponse,
+    SimulationEvaluationResult,
+    SimulationHistoryResponse,
     SimulationQuestionsRequest,
+    SimulationSessionResponse,
 )
 
 
@@ -48,19 +98,29 @@ router = APIRouter(
 )
 
 
-client = OpenAI(
-    api_key=os.getenv(
-        "OPENAI_API_KEY"
-    )
-)
-
-
 OPENAI_MODEL = os.getenv(
     "OPENAI_INTERVIEW_MODEL",
     "gpt-4",
 )
 
 
+simulation_questions_cache = TTLCache(
+    namespace="simulation_questions",
+    ttl_seconds=int(
+        os.getenv(
+            "SIMULATION_QUESTIONS_CACHE_TTL_SECONDS",
+            "86400",
+        )
+    ),
+    max_entries=int(
+        os.getenv(
+            "SIMULATION_QUESTIONS_CACHE_MAX_ENTRIES",
+            "500",
+        )
+    ),
+)
+
+
 # MARK: - Generate Simulation Questions
 
 
@@ -69,6 +129,13 @@ OPENAI_MODEL = os.getenv(
 )
 async def generate_simulation_questions(
     request: SimulationQuestionsRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(
+        get_db
+    ),
+    current_user: Optional[User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -95,6 +162,8 @@ async def generate_simulation_questions(
                 seniority,
             "hasDescription":
                 bool(description),
+            "fresh":
+                request.fresh,
         },
     )
 
@@ -115,26 +184,131 @@ async def generate_simulation_questions(
                 ),
             )
 
-        prompt = """
-Crie exatamente 5 perguntas para uma entrevista técnica.
+        # Sem descrição, as perguntas dependem só do cargo e da
+        # senioridade e podem vir do banco pré-gerado.
+        use_question_bank = (
+            not description
+            and not request.fresh
+        )
+
+        if use_question_bank:
+            bank_questions, remaining_count = (
+                await asyncio.to_thread(
+                    sample_bank_questions,
+                    db=db,
+                    job_title=job_title,
+                    seniority=seniority,
+                    user_id=(
+                        current_user.id
+                        if current_user
+                        else None
+                    ),
+                    count=5,
+                )
+            )
+
+            if (
+                remaining_count
+                < QUESTION_BANK_LOW_WATERMARK
+            ):
+                # O .delay fala com o Redis: roda depois da
+                # resposta, fora do event loop.
+                background_tasks.add_task(
+                    request_bank_refill,
+                    job_title,
+                    seniority,
+                    (
+                        current_user.id
+                        if current_user
+                        else None
+                    ),
+                )
+
+            if bank_questions:
+                logger.info(
+                    "simulation questions served from question bank",
+                    extra={
+                        "event":
+                            "simulation_questions_bank_hit",
+                        "jobTitle":
+                            job_title,
+                        "seniority":
+                            seniority,
+                        "remainingCount":
+                            remaining_count,
+                        "durationMs":
+                            round(
+                                (
+                                    time.perf_counter()
+                                    - started_at
+                                )
+                                * 1000,
+                                2,
+                            ),
+                    },
+                )
 
-Cargo: {job_title}
-Senioridade: {seniority}
-Descrição da vaga: {description}
+                return {
+                    "questions":
+                        bank_questions
+                }
 
-Regras:
-- Faça uma pergunta por linha.
-- Não inclua introdução.
-- Não inclua respostas.
-- Adapte a dificuldade à senioridade.
-- Misture conceitos técnicos, experiência prática e arquitetura.
-""".format(
-            job_title=job_title,
-            seniority=seniority,
-            description=(
+        cache_key = build_cache_key(
+            normalize_cache_text(
+                job_title
+            ),
+            normalize_cache_text(
+                seniority
+            ),
+            normalize_cache_text(
                 description
-                or "Não informada"
             ),
+            OPENAI_MODEL,
+        )
+
+        if not request.fresh:
+            cached_questions = (
+                await simulation_questions_cache
+                .get(
+                    cache_key
+                )
+            )
+
+            if cached_questions:
+                logger.info(
+                    "simulation questions served from cache",
+                    extra={
+                        "event":
+                            "simulation_questions_cache_hit",
+                        "jobTitle":
+                            job_title,
+                        "seniority":
+                            seniority,
+                        "questionCount":
+                            len(
+                                cached_questions
+                            ),
+                        "durationMs":
+                            round(
+                                (
+                                    time.perf_counter()
+                                    - started_at
+                                )
+                                * 1000,
+                                2,
+                            ),
+                    },
+                )
+
+                return {
+                    "questions":
+                        cached_questions
+                }
+
+        prompt = build_simulation_questions_prompt(
+            job_title=job_title,
+            seniority=seniority,
+            description=description,
         )
 
         logger.info(
@@ -157,25 +331,13 @@ Regras:
             time.perf_counter()
         )
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        response = await create_chat_completion(
+            endpoint="simulation_questions",
             model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role":
-                        "system",
-                    "content": (
-                        "Você é um entrevistador "
-                        "técnico experiente."
-                    ),
-                },
-                {
-                    "role":
-                        "user",
-                    "content":
-                        prompt,
-                },
-            ],
+            coalesce=True,
+            messages=build_simulation_questions_messages(
+                prompt
+            ),
             temperature=0.7,
         )
 
@@ -244,6 +406,37 @@ Regras:
             questions[:5]
         )
 
+        await simulation_questions_cache.set(
+            cache_key,
+            selected_questions,
+        )
+
+        # As perguntas geradas também abastecem o banco.
+        if not description:
+            try:
+                await asyncio.to_thread(
+                    store_bank_questions,
+                    db=db,
+                    job_title=job_title,
+                    seniority=seniority,
+                    questions=questions,
+                )
+
+            except SQLAlchemyError:
+                db.rollback()
+
+                logger.exception(
+                    "failed to store generated questions in question bank",
+                    extra={
+                        "event":
+                            "question_bank_store_failed",
+                        "jobTitle":
+                            job_title,
+                        "seniority":
+                            seniority,
+                    },
+                )
+
         duration_ms = round(
             (
                 time.perf_counter()
@@ -293,6 +486,25 @@ Regras:
 
         raise
 
+    except LLMDeadlineExceeded as error:
+        logger.warning(
+            "simulation questions generation timed out",
+            extra={
+                "event":
+                    "simulation_questions_timed_out",
+                "deadlineSeconds":
+                    error.deadline_seconds,
+            },
+        )
+
+        raise HTTPException(
+            status_code=504,
+            detail=(
+                "Tempo esgotado ao gerar "
+                "perguntas para a simulação."
+            ),
+        ) from error
+
     except Exception as error:
         duration_ms = round(
             (
@@ -326,46 +538,6 @@ Regras:
         ) from error
 
 
-# MARK: - Parse Questions
-
-
-def parse_questions(
-    content: str
-) -> list[str]:
-    questions: list[str] = []
-
-    for line in content.splitlines():
-        normalized = (
-            line.strip()
-        )
-
-        if not normalized:
-            continue
-
-        normalized = re.sub(
-            r"^(?:\d+[\.\)]|[-*•])\s*",
-            "",
-            normalized,
-        ).strip()
-
-        if normalized:
-            questions.append(
-                normalized
-            )
-
-    logger.info(
-        "simulation questions parsed",
-        extra={
-            "event":
-                "simulation_questions_parsed",
-            "questionCount":
-                len(questions),
-        },
-    )
-
-    return questions
-
-
 # MARK: - Transcribe Interview Audio
 
 
@@ -377,8 +549,6 @@ async def transcribe_interview_audio(
 ):
     started_at = time.perf_counter()
 
-    temporary_path = None
-
     logger.info(
         "interview audio transcription started",
         extra={
@@ -417,6 +587,16 @@ async def transcribe_interview_audio(
                 ),
             )
 
+        if len(content) > TRANSCRIPTION_MAX_BYTES:
+            raise HTTPException(
+                status_code=
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=(
+                    "O áudio deve ter "
+                    f"no máximo {TRANSCRIPTION_MAX_BYTES // (1024 * 1024)} MB."
+                ),
+            )
+
         allowed_content_types = {
             "audio/mp4",
             "audio/m4a",
@@ -438,64 +618,13 @@ async def transcribe_interview_audio(
                 ),
             )
 
-        suffix = os.path.splitext(
-            audio.filename
-            or "answer.m4a"
-        )[1]
-
-        if not suffix:
-            suffix = ".m4a"
-
-        with tempfile.NamedTemporaryFile(
-            mode="wb",
-            delete=False,
-            suffix=suffix,
-        ) as temporary_file:
-            temporary_file.write(
-                content
-            )
-
-            temporary_file.flush()
-
-            temporary_path = (
-                temporary_file.name
-            )
-
-        logger.info(
-            "temporary audio file created",
-            extra={
-                "event":
-                    "interview_audio_temporary_file_created",
-                "fileSizeBytes":
-                    len(content),
-                "fileExtension":
-                    suffix,
-            },
-        )
-
-        def transcribe():
-            with open(
-                temporary_path,
-                "rb"
-            ) as file:
-                return (
-                    client
-                    .audio
-                    .transcriptions
-                    .create(
-                        model="whisper-1",
-                        file=file,
-                        language="pt",
-                    )
-                )
-
         logger.info(
             "audio sent to openai transcription",
             extra={
                 "event":
                     "interview_audio_openai_started",
                 "model":
-                    "whisper-1",
+                    TRANSCRIPTION_MODEL,
                 "fileSizeBytes":
                     len(content),
             },
@@ -505,10 +634,12 @@ async def transcribe_interview_audio(
             time.perf_counter()
         )
 
-        transcription = (
-            await asyncio.to_thread(
-                transcribe
-            )
+        # Sem arquivo temporário: os bytes vão direto para a
+        # OpenAI, divididos em trechos paralelos se for longo.
+        transcript = await transcribe_audio(
+            content,
+            audio.filename
+            or "answer.m4a",
         )
 
         openai_duration_ms = round(
@@ -520,18 +651,13 @@ async def transcribe_interview_audio(
             2,
         )
 
-        transcript = (
-            transcription.text
-            or ""
-        ).strip()
-
         logger.info(
             "openai audio transcription completed",
             extra={
                 "event":
                     "interview_audio_openai_completed",
                 "model":
-                    "whisper-1",
+                    TRANSCRIPTION_MODEL,
                 "durationMs":
                     openai_duration_ms,
                 "transcriptLength":
@@ -626,34 +752,6 @@ async def transcribe_interview_audio(
     finally:
         await audio.close()
 
-        if (
-            temporary_path
-            and os.path.exists(
-                temporary_path
-            )
-        ):
-            try:
-                os.remove(
-                    temporary_path
-                )
-
-                logger.info(
-                    "temporary audio file removed",
-                    extra={
-                        "event":
-                            "interview_audio_temporary_file_removed",
-                    },
-                )
-
-            except OSError:
-                logger.exception(
-                    "failed to remove temporary audio file",
-                    extra={
-                        "event":
-                            "interview_audio_temporary_file_removal_failed",
-                    },
-                )
-
 
 # MARK: - Evaluate Interview Simulation
 
@@ -661,10 +759,16 @@ async def transcribe_interview_audio(
 @router.post(
     "/interview-simulation/evaluate",
     response_model=
-        SimulationEvaluationResponse,
+        SimulationEvaluationResult,
 )
 async def evaluate_interview_simulation(
     request: SimulationEvaluationRequest,
+    db: Session = Depends(
+        get_db
+    ),
+    current_user: Optional[User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -681,6 +785,8 @@ async def evaluate_interview_simulation(
                 len(
                     request.answers
                 ),
+            "mode":
+                request.mode,
         },
     )
 
@@ -694,189 +800,18 @@ async def evaluate_interview_simulation(
                 ),
             )
 
-        formatted_answers = []
-
-        for index, answer in enumerate(
-            request.answers,
-            start=1,
-        ):
-            formatted_answers.append(
-                """
-Pergunta {index}: {question}
-Resposta: {answer}
-Tempo: {time} segundos
-""".format(
-                    index=index,
-                    question=
-                        answer.question,
-                    answer=
-                        answer.answer,
-                    time=
-                        answer
-                        .response_time_seconds,
-                )
-            )
-
-        answers_text = "\n".join(
-            formatted_answers
-        )
-
-        prompt = """
-Avalie esta entrevista simulada.
-
-Cargo: {job_title}
-Senioridade: {seniority}
-
-Respostas:
-{answers}
-
-Avalie de 0 a 100:
-
-- clarity: clareza das respostas
-- objectivity: objetividade
-- examples: uso de exemplos reais
-- technical_knowledge: conhecimento técnico
-- response_time: adequação do tempo de resposta
-- overall: média geral
-
-Retorne somente JSON neste formato:
-
-{{
-    "clarity": 0,
-    "objectivity": 0,
-    "examples": 0,
-    "technical_knowledge": 0,
-    "response_time": 0,
-    "overall": 0,
-    "summary": "Resumo da avaliação",
-    "strengths": [
-        "Ponto forte"
-    ],
-    "improvements": [
-        "Ponto a melhorar"
-    ]
-}}
-""".format(
+        # Mesmo fluxo do job assíncrono: pré-avaliação local,
+        # modo combinado ou uma chamada por resposta.
+        normalized_evaluation = await evaluate_simulation(
+            model=OPENAI_MODEL,
             job_title=
                 request.job_title,
             seniority=
                 request.seniority,
             answers=
-                answers_text,
-        )
-
-        logger.info(
-            "simulation evaluation prompt built",
-            extra={
-                "event":
-                    "simulation_evaluation_prompt_built",
-                "jobTitle":
-                    request.job_title,
-                "seniority":
-                    request.seniority,
-                "answerCount":
-                    len(
-                        request.answers
-                    ),
-                "promptLength":
-                    len(prompt),
-                "model":
-                    OPENAI_MODEL,
-            },
-        )
-
-        openai_started_at = (
-            time.perf_counter()
-        )
-
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
-            model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role":
-                        "system",
-                    "content": (
-                        "Você é um avaliador "
-                        "de entrevistas técnicas. "
-                        "Responda somente com JSON."
-                    ),
-                },
-                {
-                    "role":
-                        "user",
-                    "content":
-                        prompt,
-                },
-            ],
-            temperature=0.3,
-        )
-
-        openai_duration_ms = round(
-            (
-                time.perf_counter()
-                - openai_started_at
-            )
-            * 1000,
-            2,
-        )
-
-        logger.info(
-            "openai simulation evaluation completed",
-            extra={
-                "event":
-                    "simulation_evaluation_openai_completed",
-                "jobTitle":
-                    request.job_title,
-                "seniority":
-                    request.seniority,
-                "model":
-                    OPENAI_MODEL,
-                "durationMs":
-                    openai_duration_ms,
-                "choicesCount":
-                    len(
-                        response.choices
-                    ),
-            },
-        )
-
-        if not response.choices:
-            raise HTTPException(
-                status_code=502,
-                detail=(
-                    "A inteligência artificial "
-                    "não retornou uma avaliação."
-                ),
-            )
-
-        content = (
-            response
-            .choices[0]
-            .message
-            .content
-            or ""
-        )
-
-        if not content.strip():
-            raise HTTPException(
-                status_code=502,
-                detail=(
-                    "A inteligência artificial "
-                    "retornou uma avaliação vazia."
-                ),
-            )
-
-        evaluation = (
-            extract_json(
-                content
-            )
-        )
-
-        normalized_evaluation = (
-            normalize_evaluation(
-                evaluation
-            )
+                request.answers,
+            mode=
+                request.mode,
         )
 
         duration_ms = round(
@@ -893,6 +828,8 @@ Retorne somente JSON neste formato:
             extra={
                 "event":
                     "simulation_evaluation_completed",
+                "mode":
+                    request.mode,
                 "jobTitle":
                     request.job_title,
                 "seniority":
@@ -927,6 +864,13 @@ Retorne somente JSON neste formato:
             },
         )
 
+        await save_evaluation_history(
+            db=db,
+            current_user=current_user,
+            request=request,
+            evaluation=normalized_evaluation,
+        )
+
         return (
             normalized_evaluation
         )
@@ -948,6 +892,46 @@ Retorne somente JSON neste formato:
 
         raise
 
+    except LLMDeadlineExceeded as error:
+        logger.warning(
+            "simulation evaluation timed out",
+            extra={
+                "event":
+                    "simulation_evaluation_timed_out",
+                "deadlineSeconds":
+                    error.deadline_seconds,
+            },
+        )
+
+        raise HTTPException(
+            status_code=504,
+            detail=(
+                "Tempo esgotado ao avaliar "
+                "a entrevista simulada."
+            ),
+        ) from error
+
+    except ValueError as error:
+        logger.exception(
+            "invalid simulation evaluation response",
+            extra={
+                "event":
+                    "simulation_evaluation_invalid_response",
+                "jobTitle":
+                    request.job_title,
+                "seniority":
+                    request.seniority,
+            },
+        )
+
+        raise HTTPException(
+            status_code=502,
+            detail=(
+                "A inteligência artificial "
+                "retornou uma avaliação inválida."
+            ),
+        ) from error
+
     except Exception as error:
         duration_ms = round(
             (
@@ -985,179 +969,27 @@ Retorne somente JSON neste formato:
         ) from error
 
 
-# MARK: - Extract JSON
-
-
-def extract_json(
-    content: str
-) -> dict:
-    normalized = (
-        content.strip()
-    )
-
-    normalized = (
-        normalized.replace(
-            "```json",
-            "",
-        )
-    )
-
-    normalized = (
-        normalized.replace(
-            "```",
-            "",
-        )
-    )
-
-    start_index = (
-        normalized.find("{")
-    )
-
-    end_index = (
-        normalized.rfind("}")
-    )
-
-    if (
-        start_index == -1
-        or end_index == -1
-    ):
-        logger.info(
-            "openai evaluation response does not contain json",
-            extra={
-                "event":
-                    "simulation_evaluation_json_missing",
-                "responseLength":
-                    len(content),
-            },
-        )
-
-        raise ValueError(
-            "A OpenAI não retornou "
-            "um JSON válido."
-        )
-
-    json_content = normalized[
-        start_index:
-        end_index + 1
-    ]
-
-    try:
-        parsed_json = json.loads(
-            json_content
-        )
-
-        logger.info(
-            "simulation evaluation json parsed",
-            extra={
-                "event":
-                    "simulation_evaluation_json_parsed",
-                "responseLength":
-                    len(content),
-            },
-        )
-
-        return parsed_json
-
-    except json.JSONDecodeError:
-        logger.exception(
-            "failed to parse simulation evaluation json",
-            extra={
-                "event":
-                    "simulation_evaluation_json_parse_failed",
-                "responseLength":
-                    len(content),
-            },
-        )
-
-        raise
-
-
-# MARK: - Normalize Evaluation
-
-
-def normalize_evaluation(
+async def save_evaluation_history(
+    db: Session,
+    current_user: Optional[User],
+    request: SimulationEvaluationRequest,
     evaluation: dict,
-) -> dict:
-    score_fields = [
-        "clarity",
-        "objectivity",
-        "examples",
-        "technical_knowledge",
-        "response_time",
-        "overall",
-    ]
-
-    for field in score_fields:
-        score = int(
-            evaluation.get(
-                field,
-                0,
-            )
-        )
-
-        evaluation[field] = max(
-            0,
-            min(
-                score,
-                100,
-            ),
-        )
-
-    evaluation[
-        "summary"
-    ] = evaluation.get(
-        "summary",
-        "Avaliação concluída.",
+) -> None:
+    # Só usuários autenticados têm histórico.
+    if current_user is None:
+        return
+
+    await asyncio.to_thread(
+        save_simulation_session,
+        db=db,
+        user_id=current_user.id,
+        job_title=request.job_title,
+        seniority=request.seniority,
+        mode=request.mode,
+        answers=request.answers,
+        evaluation=evaluation,
     )
 
-    evaluation[
-        "strengths"
-    ] = evaluation.get(
-        "strengths",
-        [],
-    )
-
-    evaluation[
-        "improvements"
-    ] = evaluation.get(
-        "improvements",
-        [],
-    )
-
-    logger.info(
-        "simulation evaluation normalized",
-        extra={
-            "event":
-                "simulation_evaluation_normalized",
-            "clarityScore":
-                evaluation[
-                    "clarity"
-                ],
-            "objectivityScore":
-                evaluation[
-                    "objectivity"
-                ],
-            "examplesScore":
-                evaluation[
-                    "examples"
-                ],
-            "technicalKnowledgeScore":
-                evaluation[
-                    "technical_knowledge"
-                ],
-            "responseTimeScore":
-                evaluation[
-                    "response_time"
-                ],
-            "overallScore":
-                evaluation[
-                    "overall"
-                ],
-        },
-    )
-
-    return evaluation
-
 
 # MARK: - Save Generated Questions
 
@@ -1454,4 +1286,129 @@ def save_generated_questions(
             detail=(
                 "Erro ao salvar perguntas."
             ),
-        ) from error
\ No newline at end of file
+        ) from error
+
+
+# MARK: - Simulation History
+
+
+@router.get(
+    "/interview-simulation/history",
+    response_model=
+        SimulationHistoryResponse,
+)
+def get_simulation_history(
+    weeks: int = Query(
+        default=12,
+        ge=1,
+        le=52,
+    ),
+    db: Session = Depends(
+        get_db
+    ),
+    current_user: User = Depends(
+        get_current_user
+    ),
+):
+    # Tudo sai de tabelas já agregadas:
+    # nenhuma média é recalculada e o modelo não é chamado.
+    return {
+        "trends":
+            list_score_trends(
+                db,
+                current_user.id,
+                weeks,
+            ),
+        "sessions":
+            list_recent_sessions(
+                db,
+                current_user.id,
+            ),
+    }
+
+
+@router.get(
+    "/interview-simulation/history/{session_id}",
+    response_model=
+        SimulationSessionResponse,
+)
+def get_simulation_session(
+    session_id: UUID,
+    db: Session = Depends(
+        get_db
+    ),
+    current_user: User = Depends(
+        get_current_user
+    ),
+):
+    session = find_user_simulation_session(
+        db,
+        current_user.id,
+        session_id,
+    )
+
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                "Simulação não encontrada."
+            ),
+        )
+
+    return session
+
+
+# MARK: - Live Simulation
+
+
+@router.websocket(
+    "/interview-simulation/live"
+)
+async def live_interview_simulation(
+    websocket: WebSocket,
+    token: Optional[str] = Query(
+        None
+    ),
+):
+    # Navegadores não enviam Authorization no handshake:
+    # o token opcional vem na query string.
+    user_id = None
+
+    if token:
+        try:
+            user_id = await asyncio.to_thread(
+                authenticate_live_user,
+                token,
+            )
+
+        except HTTPException as error:
+            # Token inválido, usuário desativado ou sem
+            # e-mail confirmado: recusa o handshake.
+            await websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason=str(error.detail),
+            )
+
+            return
+
+    await LiveSimulationSession(
+        websocket,
+        model=OPENAI_MODEL,
+        user_id=user_id,
+    ).run()
+
+
+def authenticate_live_user(
+    token: str,
+) -> UUID:
+    # Mesmas regras das rotas HTTP autenticadas.
+    db = SessionLocal()
+
+    try:
+        return get_current_user(
+            token=token,
+            db=db,
+        ).id
+
+    finally:
+        db.close()
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class SaveGeneratedQuestionsRequest(BaseModel):
@@ -19,6 +20,8 @@ class SimulationQuestionsRequest(BaseModel):
     job_title: str
     seniority: str
     description: Optional[str] = None
+    # Ignora o cache e gera perguntas novas.
+    fresh: bool = False
 
 
 class SimulationAnswerRequest(BaseModel):
@@ -31,6 +34,12 @@ class SimulationEvaluationRequest(BaseModel):
     job_title: str
     seniority: str
     answers: List[SimulationAnswerRequest]
+    # "per_answer" avalia cada resposta em paralelo
+    # e agrega as notas localmente.
+    mode: Literal[
+        "combined",
+        "per_answer",
+    ] = "combined"
 
 
 class SimulationEvaluationResponse(BaseModel):
@@ -42,4 +51,63 @@ class SimulationEvaluationResponse(BaseModel):
     overall: int
     summary: str
     strengths: List[str]
-    improvements: List[str]
\ No newline at end of file
+    improvements: List[str]
+
+
+class SimulationEvaluationResult(SimulationEvaluationResponse):
+    # Respostas, a partir de 1, que ficaram fora da média
+    # porque o modelo falhou ao avaliá-las.
+    failed_answers: List[int] = []
+
+
+class SimulationSessionAnswerResponse(BaseModel):
+    position: int
+    question: str
+    answer: str
+    response_time_seconds: int
+    evaluation: Optional[Dict[str, Any]] = None
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class SimulationSessionSummaryResponse(BaseModel):
+    id: UUID
+    job_title: str
+    seniority: str
+    mode: str
+    clarity: int
+    technical_knowledge: int
+    overall: int
+    created_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class SimulationSessionResponse(SimulationEvaluationResponse):
+    id: UUID
+    job_title: str
+    seniority: str
+    mode: str
+    created_at: datetime
+    answers: List[SimulationSessionAnswerResponse]
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class SimulationScoreTrendResponse(BaseModel):
+    week_start: date
+    session_count: int
+    average_clarity: float
+    average_technical_knowledge: float
+    average_overall: float
+
+
+class SimulationHistoryResponse(BaseModel):
+    trends: List[SimulationScoreTrendResponse]
+    sessions: List[SimulationSessionSummaryResponse]
\ No newline at end of file
@@ -0,0 +1,789 @@
+import asyncio
+import os
+import re
+
+from typing import Any, Dict, List, Optional
+
+from app.interview_simulation.prescoring import (
+    build_local_evaluation,
+    prescore_answer,
+    split_degenerate_answers,
+)
+from app.interview_simulation.schemas import (
+    SimulationEvaluationResponse,
+)
+from app.llm.structured_output import (
+    create_structured_completion,
+)
+from app.observability import logger
+
+
+# Quantas respostas são avaliadas ao mesmo tempo
+# no modo de avaliação por resposta.
+SIMULATION_EVALUATION_CONCURRENCY = int(
+    os.getenv(
+        "SIMULATION_EVALUATION_CONCURRENCY",
+        "4",
+    )
+)
+
+SIMULATION_EVALUATION_MAX_ATTEMPTS = 2
+
+# Fração de respostas que pode ficar sem avaliação no modo
+# por resposta; acima disso a avaliação inteira falha.
+SIMULATION_EVALUATION_MAX_FAILED_RATIO = float(
+    os.getenv(
+        "SIMULATION_EVALUATION_MAX_FAILED_RATIO",
+        "0.2",
+    )
+)
+
+SIMULATION_EVALUATION_MAX_ITEMS = 5
+
+EVALUATION_SCORE_FIELDS = [
+    "clarity",
+    "objectivity",
+    "examples",
+    "technical_knowledge",
+    "response_time",
+    "overall",
+]
+
+
+# MARK: - Simulation Questions Prompt
+
+
+def build_simulation_questions_prompt(
+    job_title: str,
+    seniority: str,
+    description: str = "",
+    question_count: int = 5,
+) -> str:
+    return """
+Crie exatamente {question_count} perguntas para uma entrevista técnica.
+
+Cargo: {job_title}
+Senioridade: {seniority}
+Descrição da vaga: {description}
+
+Regras:
+- Faça uma pergunta por linha.
+- Não inclua introdução.
+- Não inclua respostas.
+- Adapte a dificuldade à senioridade.
+- Misture conceitos técnicos, experiência prática e arquitetura.
+""".format(
+        question_count=question_count,
+        job_title=job_title,
+        seniority=seniority,
+        description=(
+            description
+            or "Não informada"
+        ),
+    )
+
+
+def build_simulation_questions_messages(
+    prompt: str,
+) -> List[Dict[str, str]]:
+    return [
+        {
+            "role":
+                "system",
+            "content": (
+                "Você é um entrevistador "
+                "técnico experiente."
+            ),
+        },
+        {
+            "role":
+                "user",
+            "content":
+                prompt,
+        },
+    ]
+
+
+# MARK: - Parse Questions
+
+
+def parse_questions(
+    content: str
+) -> list[str]:
+    questions: list[str] = []
+
+    for line in content.splitlines():
+        normalized = (
+            line.strip()
+        )
+
+        if not normalized:
+            continue
+
+        normalized = re.sub(
+            r"^(?:\d+[\.\)]|[-*•])\s*",
+            "",
+            normalized,
+        ).strip()
+
+        if normalized:
+            questions.append(
+                normalized
+            )
+
+    logger.info(
+        "simulation questions parsed",
+        extra={
+            "event":
+                "simulation_questions_parsed",
+            "questionCount":
+                len(questions),
+        },
+    )
+
+    return questions
+
+
+# MARK: - Simulation Evaluation
+
+
+def build_simulation_evaluation_prompt(
+    job_title: str,
+    seniority: str,
+    answers: List[Any],
+) -> str:
+    formatted_answers = []
+
+    for index, answer in enumerate(
+        answers,
+        start=1,
+    ):
+        formatted_answers.append(
+            """
+Pergunta {index}: {question}
+Resposta: {answer}
+Tempo: {time} segundos
+""".format(
+                index=index,
+                question=
+                    answer.question,
+                answer=
+                    answer.answer,
+                time=
+                    answer
+                    .response_time_seconds,
+            )
+        )
+
+    answers_text = "\n".join(
+        formatted_answers
+    )
+
+    return """
+Avalie esta entrevista simulada.
+
+Cargo: {job_title}
+Senioridade: {seniority}
+
+Respostas:
+{answers}
+
+Avalie de 0 a 100:
+
+- clarity: clareza das respostas
+- objectivity: objetividade
+- examples: uso de exemplos reais
+- technical_knowledge: conhecimento técnico
+- response_time: adequação do tempo de resposta
+- overall: média geral
+
+Retorne somente JSON neste formato:
+
+{{
+    "clarity": 0,
+    "objectivity": 0,
+    "examples": 0,
+    "technical_knowledge": 0,
+    "response_time": 0,
+    "overall": 0,
+    "summary": "Resumo da avaliação",
+    "strengths": [
+        "Ponto forte"
+    ],
+    "improvements": [
+        "Ponto a melhorar"
+    ]
+}}
+""".format(
+        job_title=job_title,
+        seniority=seniority,
+        answers=answers_text,
+    )
+
+
+def build_evaluation_messages(
+    prompt: str,
+) -> List[Dict[str, str]]:
+    return [
+        {
+            "role":
+                "system",
+            "content": (
+                "Você é um avaliador "
+                "de entrevistas técnicas. "
+                "Responda somente com JSON."
+            ),
+        },
+        {
+            "role":
+                "user",
+            "content":
+                prompt,
+        },
+    ]
+
+
+async def evaluate_simulation_prompt(
+    model: str,
+    prompt: str,
+) -> Dict[str, Any]:
+    # A resposta já chega validada pelo schema; campos
+    # faltando são completados com uma chamada curta.
+    return await create_structured_completion(
+        endpoint="simulation_evaluation",
+        model=model,
+        messages=build_evaluation_messages(
+            prompt
+        ),
+        name="simulation_evaluation",
+        response_model=SimulationEvaluationResponse,
+        temperature=0.3,
+    )
+
+
+async def evaluate_simulation(
+    model: str,
+    job_title: str,
+    seniority: str,
+    answers: List[Any],
+    mode: str = "combined",
+) -> Dict[str, Any]:
+    if not answers:
+        raise ValueError(
+            "Nenhuma resposta foi enviada."
+        )
+
+    if mode == "per_answer":
+        return await evaluate_answers_individually(
+            model=model,
+            job_title=job_title,
+            seniority=seniority,
+            answers=answers,
+        )
+
+    substantive_answers, local_evaluations = (
+        split_degenerate_answers(answers)
+    )
+
+    if local_evaluations:
+        logger.info(
+            "simulation answers scored locally",
+            extra={
+                "event":
+                    "simulation_evaluation_prescored",
+                "answerCount":
+                    len(answers),
+                "localAnswerCount":
+                    len(local_evaluations),
+            },
+        )
+
+    if not substantive_answers:
+        return aggregate_answer_evaluations(
+            evaluations=local_evaluations,
+            answer_count=len(answers),
+        )
+
+    evaluation = normalize_evaluation(
+        await evaluate_simulation_prompt(
+            model=model,
+            prompt=build_simulation_evaluation_prompt(
+                job_title=job_title,
+                seniority=seniority,
+                answers=substantive_answers,
+            ),
+        )
+    )
+
+    return merge_local_evaluations(
+        evaluation=evaluation,
+        local_evaluations=local_evaluations,
+        answer_count=len(answers),
+    )
+
+
+def merge_local_evaluations(
+    evaluation: Dict[str, Any],
+    local_evaluations: Dict[int, Dict[str, Any]],
+    answer_count: int,
+) -> Dict[str, Any]:
+    if not local_evaluations:
+        return evaluation
+
+    # A nota do modelo vale por todas as respostas que ele
+    # avaliou; as locais entram com peso de uma resposta cada.
+    model_weight = answer_count - len(local_evaluations)
+
+    for field in EVALUATION_SCORE_FIELDS:
+        evaluation[field] = round(
+            (
+                evaluation[field] * model_weight
+                + sum(
+                    local_evaluation[field]
+                    for local_evaluation in local_evaluations.values()
+                )
+            )
+            / answer_count
+        )
+
+    evaluation["improvements"] = unique_items(
+        [
+            *evaluation["improvements"],
+            *(
+                item
+                for local_evaluation in local_evaluations.values()
+                for item in local_evaluation["improvements"]
+            ),
+        ]
+    )
+
+    indexes = ", ".join(
+        str(index)
+        for index in sorted(local_evaluations)
+    )
+
+    if len(local_evaluations) == 1:
+        local_summary = (
+            "A resposta {indexes} não tinha conteúdo "
+            "suficiente e recebeu nota local."
+        )
+
+    else:
+        local_summary = (
+            "As respostas {indexes} não tinham conteúdo "
+            "suficiente e receberam nota local."
+        )
+
+    evaluation["summary"] = "{summary} {local_summary}".format(
+        summary=evaluation["summary"].rstrip(),
+        local_summary=local_summary.format(
+            indexes=indexes
+        ),
+    )
+
+    return evaluation
+
+
+# MARK: - Normalize Evaluation
+
+
+def normalize_evaluation(
+    evaluation: dict,
+) -> dict:
+    for field in EVALUATION_SCORE_FIELDS:
+        score = int(
+            evaluation.get(
+                field,
+                0,
+            )
+        )
+
+        evaluation[field] = max(
+            0,
+            min(
+                score,
+                100,
+            ),
+        )
+
+    evaluation[
+        "summary"
+    ] = evaluation.get(
+        "summary",
+        "Avaliação concluída.",
+    )
+
+    evaluation[
+        "strengths"
+    ] = evaluation.get(
+        "strengths",
+        [],
+    )
+
+    evaluation[
+        "improvements"
+    ] = evaluation.get(
+        "improvements",
+        [],
+    )
+
+    logger.info(
+        "simulation evaluation normalized",
+        extra={
+            "event":
+                "simulation_evaluation_normalized",
+            "clarityScore":
+                evaluation[
+                    "clarity"
+                ],
+            "objectivityScore":
+                evaluation[
+                    "objectivity"
+                ],
+            "examplesScore":
+                evaluation[
+                    "examples"
+                ],
+            "technicalKnowledgeScore":
+                evaluation[
+                    "technical_knowledge"
+                ],
+            "responseTimeScore":
+                evaluation[
+                    "response_time"
+                ],
+            "overallScore":
+                evaluation[
+                    "overall"
+                ],
+        },
+    )
+
+    return evaluation
+
+
+# MARK: - Per Answer Evaluation
+
+
+def build_answer_evaluation_prompt(
+    job_title: str,
+    seniority: str,
+    question: str,
+    answer: str,
+    response_time_seconds: int,
+) -> str:
+    return """
+Avalie esta resposta de uma entrevista simulada.
+
+Cargo: {job_title}
+Senioridade: {seniority}
+
+Pergunta: {question}
+Resposta: {answer}
+Tempo: {time} segundos
+
+Avalie de 0 a 100:
+
+- clarity: clareza da resposta
+- objectivity: objetividade
+- examples: uso de exemplos reais
+- technical_knowledge: conhecimento técnico
+- response_time: adequação do tempo de resposta
+- overall: média geral
+
+Retorne somente JSON neste formato:
+
+{{
+    "clarity": 0,
+    "objectivity": 0,
+    "examples": 0,
+    "technical_knowledge": 0,
+    "response_time": 0,
+    "overall": 0,
+    "summary": "Resumo curto da avaliação",
+    "strengths": [
+        "Ponto forte"
+    ],
+    "improvements": [
+        "Ponto a melhorar"
+    ]
+}}
+""".format(
+        job_title=job_title,
+        seniority=seniority,
+        question=question,
+        answer=answer,
+        time=response_time_seconds,
+    )
+
+
+async def evaluate_answer(
+    model: str,
+    job_title: str,
+    seniority: str,
+    answer: Any,
+) -> Dict[str, Any]:
+    prompt = build_answer_evaluation_prompt(
+        job_title=job_title,
+        seniority=seniority,
+        question=answer.question,
+        answer=answer.answer,
+        response_time_seconds=
+            answer.response_time_seconds,
+    )
+
+    return normalize_evaluation(
+        await create_structured_completion(
+            endpoint="simulation_answer_evaluation",
+            model=model,
+            messages=build_evaluation_messages(
+                prompt
+            ),
+            name="simulation_answer_evaluation",
+            response_model=SimulationEvaluationResponse,
+            temperature=0.3,
+        )
+    )
+
+
+async def evaluate_answers_individually(
+    model: str,
+    job_title: str,
+    seniority: str,
+    answers: List[Any],
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(
+        SIMULATION_EVALUATION_CONCURRENCY
+    )
+
+    async def evaluate_with_retry(
+        index: int,
+        answer: Any,
+    ) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await evaluate_answer_with_retry(
+                model=model,
+                job_title=job_title,
+                seniority=seniority,
+                index=index,
+                answer=answer,
+            )
+
+    results = await asyncio.gather(
+        *[
+            evaluate_with_retry(
+                index,
+                answer,
+            )
+            for index, answer in enumerate(
+                answers,
+                start=1,
+            )
+        ]
+    )
+
+    evaluations = {
+        index: evaluation
+        for index, evaluation in enumerate(
+            results,
+            start=1,
+        )
+        if evaluation is not None
+    }
+
+    failed_answers = [
+        index
+        for index, evaluation in enumerate(
+            results,
+            start=1,
+        )
+        if evaluation is None
+    ]
+
+    check_failed_answers(
+        evaluated_count=len(evaluations),
+        failed_count=len(failed_answers),
+        answer_count=len(answers),
+    )
+
+    return aggregate_answer_evaluations(
+        evaluations=evaluations,
+        answer_count=len(answers),
+        failed_answers=failed_answers,
+    )
+
+
+def check_failed_answers(
+    evaluated_count: int,
+    failed_count: int,
+    answer_count: int,
+) -> None:
+    if not evaluated_count:
+        raise ValueError(
+            "Nenhuma resposta pôde ser avaliada."
+        )
+
+    if (
+        failed_count
+        > answer_count * SIMULATION_EVALUATION_MAX_FAILED_RATIO
+    ):
+        # Uma média sobre poucas respostas não representa
+        # a entrevista: melhor falhar que devolver nota parcial.
+        raise ValueError(
+            "{failed} de {total} respostas não puderam "
+            "ser avaliadas.".format(
+                failed=failed_count,
+                total=answer_count,
+            )
+        )
+
+
+async def evaluate_answer_with_retry(
+    model: str,
+    job_title: str,
+    seniority: str,
+    index: int,
+    answer: Any,
+) -> Optional[Dict[str, Any]]:
+    prescore = prescore_answer(answer)
+
+    if prescore.is_degenerate:
+        # Resposta vazia ou curta demais: a nota local
+        # é determinística e não gasta tokens.
+        logger.info(
+            "simulation answer scored locally",
+            extra={
+                "event":
+                    "simulation_answer_prescored",
+                "answerIndex":
+                    index,
+                **prescore.to_log(),
+            },
+        )
+
+        return build_local_evaluation(
+            prescore
+        )
+
+    for attempt in range(
+        1,
+        SIMULATION_EVALUATION_MAX_ATTEMPTS + 1,
+    ):
+        try:
+            return await evaluate_answer(
+                model=model,
+                job_title=job_title,
+                seniority=seniority,
+                answer=answer,
+            )
+
+        except Exception:
+            # Só esta resposta é refeita,
+            # não a avaliação inteira.
+            logger.exception(
+                "failed to evaluate simulation answer",
+                extra={
+                    "event":
+                        "simulation_answer_evaluation_failed",
+                    "answerIndex":
+                        index,
+                    "attempt":
+                        attempt,
+                },
+            )
+
+    return None
+
+
+def aggregate_answer_evaluations(
+    evaluations: Dict[int, Dict[str, Any]],
+    answer_count: int,
+    failed_answers: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    aggregated: Dict[str, Any] = {
+        field: round(
+            sum(
+                evaluation[field]
+                for evaluation in evaluations.values()
+            )
+            / len(evaluations)
+        )
+        for field in EVALUATION_SCORE_FIELDS
+    }
+
+    aggregated["strengths"] = unique_items(
+        item
+        for evaluation in evaluations.values()
+        for item in evaluation["strengths"]
+    )[:SIMULATION_EVALUATION_MAX_ITEMS]
+
+    aggregated["improvements"] = unique_items(
+        item
+        for evaluation in evaluations.values()
+        for item in evaluation["improvements"]
+    )[:SIMULATION_EVALUATION_MAX_ITEMS]
+
+    best_index = max(
+        evaluations,
+        key=lambda index: evaluations[index]["overall"],
+    )
+
+    weakest_index = min(
+        evaluations,
+        key=lambda index: evaluations[index]["overall"],
+    )
+
+    summary = (
+        "Média geral de {overall} em {count} "
+        "de {total} respostas avaliadas."
+    ).format(
+        overall=aggregated["overall"],
+        count=len(evaluations),
+        total=answer_count,
+    )
+
+    if best_index != weakest_index:
+        summary += (
+            " Melhor desempenho na pergunta {best}"
+            " e maior oportunidade de melhoria"
+            " na pergunta {weakest}."
+        ).format(
+            best=best_index,
+            weakest=weakest_index,
+        )
+
+    aggregated["summary"] = summary
+
+    # Respostas fora da média, para o cliente
+    # não tomar a nota como completa.
+    aggregated["failed_answers"] = list(
+        failed_answers or []
+    )
+
+    return aggregated
+
+
+def unique_items(
+    items: Any,
+) -> List[str]:
+    unique: List[str] = []
+
+    seen = set()
+
+    for item in items:
+        normalized = str(item).strip()
+
+        if (
+            normalized
+            and normalized.lower()
+            not in seen
+        ):
+            seen.add(
+                normalized.lower()
+            )
+
+            unique.append(
+                normalized
+            )
+
+    return unique
@@ -0,0 +1,646 @@
+import asyncio
+import hashlib
+import io
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import wave
+
+from typing import List, Optional, Tuple
+
+from app.cache import TTLCache, build_cache_key
+from app.llm.gateway import create_transcription
+from app.llm.single_flight import SingleFlight
+from app.observability import logger
+
+
+# MARK: - Configuration
+
+
+TRANSCRIPTION_MODEL = "whisper-1"
+
+# Vale para a rota síncrona e para o job: o áudio é
+# recusado antes de ir para a OpenAI ou para o blob store.
+TRANSCRIPTION_MAX_BYTES = (
+    int(
+        os.getenv(
+            "TRANSCRIPTION_MAX_SIZE_MB",
+            "25",
+        )
+    )
+    * 1024
+    * 1024
+)
+
+# Áudios até essa duração vão inteiros. A duração vem do
+# cabeçalho (m4a e wav), sem decodificar o áudio.
+TRANSCRIPTION_CHUNK_MIN_SECONDS = float(
+    os.getenv(
+        "TRANSCRIPTION_CHUNK_MIN_SECONDS",
+        "45",
+    )
+)
+
+TRANSCRIPTION_SEGMENT_SECONDS = float(
+    os.getenv(
+        "TRANSCRIPTION_SEGMENT_SECONDS",
+        "25",
+    )
+)
+
+TRANSCRIPTION_MAX_SEGMENT_SECONDS = float(
+    os.getenv(
+        "TRANSCRIPTION_MAX_SEGMENT_SECONDS",
+        "40",
+    )
+)
+
+TRANSCRIPTION_SILENCE_DB = float(
+    os.getenv(
+        "TRANSCRIPTION_SILENCE_DB",
+        "-35",
+    )
+)
+
+TRANSCRIPTION_MIN_SILENCE_SECONDS = float(
+    os.getenv(
+        "TRANSCRIPTION_MIN_SILENCE_SECONDS",
+        "0.4",
+    )
+)
+
+# Vazio procura o ffmpeg no PATH; sem ele o áudio
+# vai sempre em uma única chamada.
+FFMPEG_PATH = os.getenv(
+    "FFMPEG_PATH",
+    "",
+).strip() or shutil.which("ffmpeg")
+
+TRANSCRIPTION_CACHE_TTL_SECONDS = int(
+    os.getenv(
+        "TRANSCRIPTION_CACHE_TTL_SECONDS",
+        "86400",
+    )
+)
+
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(
+    os.getenv(
+        "TRANSCRIPTION_CACHE_MAX_ENTRIES",
+        "500",
+    )
+)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+SILENCE_END_PATTERN = re.compile(
+    r"silence_end: (?P<end>[\d.]+) \| silence_duration: (?P<duration>[\d.]+)"
+)
+
+
+class AudioDecodeError(Exception):
+    pass
+
+
+# Clientes móveis reenviam a mesma gravação quando a conexão
+# cai: a chave é o hash do áudio, não o nome do arquivo.
+transcription_cache = TTLCache(
+    namespace="audio_transcriptions",
+    ttl_seconds=TRANSCRIPTION_CACHE_TTL_SECONDS,
+    max_entries=TRANSCRIPTION_CACHE_MAX_ENTRIES,
+)
+
+# Um reenvio que chega com o original ainda em andamento
+# espera a mesma chamada.
+transcription_single_flight = SingleFlight(
+    "audio_transcriptions"
+)
+
+
+def build_transcription_cache_key(
+    content: bytes,
+    language: str,
+) -> str:
+    return build_cache_key(
+        TRANSCRIPTION_MODEL,
+        hashlib.sha256(
+            content
+        ).hexdigest(),
+        language,
+    )
+
+
+# MARK: - Transcription
+
+
+async def transcribe_audio(
+    content: bytes,
+    file_name: str,
+    language: str = "pt",
+) -> str:
+    cache_key = build_transcription_cache_key(
+        content,
+        language,
+    )
+
+    cached_transcript = await transcription_cache.get(
+        cache_key
+    )
+
+    if cached_transcript is not None:
+        logger.info(
+            "audio transcription served from cache",
+            extra={
+                "event":
+                    "interview_audio_transcription_cache_hit",
+                "fileSizeBytes":
+                    len(content),
+            },
+        )
+
+        return cached_transcript
+
+    transcript = await transcription_single_flight.run(
+        cache_key,
+        lambda: transcribe_uncached_audio(
+            content,
+            file_name,
+            language,
+        ),
+    )
+
+    # Transcrição vazia não é guardada: pode ter sido
+    # uma falha do modelo.
+    if transcript:
+        await transcription_cache.set(
+            cache_key,
+            transcript,
+        )
+
+    return transcript
+
+
+async def transcribe_uncached_audio(
+    content: bytes,
+    file_name: str,
+    language: str,
+) -> str:
+    started_at = time.perf_counter()
+
+    segments = await split_audio(
+        content
+    )
+
+    if segments is None:
+        return await transcribe_segment(
+            file_name,
+            content,
+            language,
+        )
+
+    # Os trechos são independentes: o tempo total fica
+    # perto do tempo do trecho mais lento.
+    texts = await asyncio.gather(
+        *[
+            transcribe_segment(
+                f"segment-{index}.wav",
+                segment,
+                language,
+            )
+            for index, segment in enumerate(segments)
+        ]
+    )
+
+    transcript = " ".join(
+        text
+        for text in texts
+        if text
+    )
+
+    logger.info(
+        "chunked audio transcription completed",
+        extra={
+            "event":
+                "interview_audio_chunked_transcription_completed",
+            "segmentCount":
+                len(segments),
+            "transcriptLength":
+                len(transcript),
+            "durationMs":
+                round(
+                    (
+                        time.perf_counter()
+                        - started_at
+                    )
+                    * 1000,
+                    2,
+                ),
+        },
+    )
+
+    return transcript
+
+
+async def transcribe_segment(
+    file_name: str,
+    content: bytes,
+    language: str,
+) -> str:
+    # O SDK aceita (nome, bytes): o áudio não passa pelo disco.
+    transcription = await create_transcription(
+        endpoint="simulation_transcription",
+        model=TRANSCRIPTION_MODEL,
+        file=(
+            file_name,
+            content,
+        ),
+        language=language,
+    )
+
+    return (
+        transcription.text
+        or ""
+    ).strip()
+
+
+# MARK: - Segmentation
+
+
+async def split_audio(
+    content: bytes,
+) -> Optional[List[bytes]]:
+    if not FFMPEG_PATH:
+        return None
+
+    header_duration = probe_duration_seconds(
+        content
+    )
+
+    # A resposta curta, caso mais comum, não paga
+    # o processo do ffmpeg.
+    if (
+        header_duration is not None
+        and header_duration <= TRANSCRIPTION_CHUNK_MIN_SECONDS
+    ):
+        return None
+
+    try:
+        pcm, silences = await decode_audio(
+            content
+        )
+
+    except AudioDecodeError as error:
+        # Arquivo corrompido ou formato desconhecido.
+        # Segue com uma chamada só.
+        logger.info(
+            "audio could not be decoded for chunking",
+            extra={
+                "event":
+                    "interview_audio_decode_skipped",
+                "reason":
+                    str(error)[:200],
+            },
+        )
+
+        return None
+
+    duration = len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH)
+
+    if duration <= TRANSCRIPTION_CHUNK_MIN_SECONDS:
+        return None
+
+    boundaries = plan_segments(
+        duration,
+        silences,
+        TRANSCRIPTION_SEGMENT_SECONDS,
+        TRANSCRIPTION_MAX_SEGMENT_SECONDS,
+    )
+
+    return [
+        encode_wav(
+            pcm[
+                seconds_to_offset(start):
+                seconds_to_offset(end)
+            ]
+        )
+        for start, end in boundaries
+    ]
+
+
+async def decode_audio(
+    content: bytes,
+) -> Tuple[bytes, List[float]]:
+    # PCM mono de 16 kHz no stdout e os silêncios
+    # detectados no stderr.
+    arguments = [
+        "-af",
+        "silencedetect=noise={}dB:d={}".format(
+            TRANSCRIPTION_SILENCE_DB,
+            TRANSCRIPTION_MIN_SILENCE_SECONDS,
+        ),
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "pipe:1",
+    ]
+
+    # m4a com o índice (moov) no fim do arquivo, o padrão
+    # do ffmpeg e de vários gravadores, precisa de seek:
+    # por pipe o ffmpeg não acha o áudio.
+    if not hasattr(os, "memfd_create"):
+        with tempfile.NamedTemporaryFile(
+            suffix=".audio",
+        ) as temporary_file:
+            temporary_file.write(content)
+            temporary_file.flush()
+
+            return await run_ffmpeg_decode(
+                ["-i", temporary_file.name, *arguments],
+            )
+
+    # No Linux o arquivo fica só em memória.
+    memory_fd = os.memfd_create("transcription-audio")
+
+    try:
+        with open(
+            memory_fd,
+            "wb",
+            closefd=False,
+        ) as memory_file:
+            memory_file.write(content)
+
+        return await run_ffmpeg_decode(
+            ["-i", f"/dev/fd/{memory_fd}", *arguments],
+            pass_fds=(memory_fd,),
+        )
+
+    finally:
+        os.close(memory_fd)
+
+
+async def run_ffmpeg_decode(
+    arguments: List[str],
+    pass_fds: Tuple[int, ...] = (),
+) -> Tuple[bytes, List[float]]:
+    process = await asyncio.create_subprocess_exec(
+        FFMPEG_PATH,
+        "-hide_banner",
+        "-nostats",
+        *arguments,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        pass_fds=pass_fds,
+    )
+
+    pcm, errors = await process.communicate()
+
+    output = errors.decode(
+        "utf-8",
+        errors="replace",
+    )
+
+    if process.returncode != 0 or not pcm:
+        raise AudioDecodeError(
+            output.strip().splitlines()[-1]
+            if output.strip()
+            else "ffmpeg failed"
+        )
+
+    return pcm, parse_silence_midpoints(output)
+
+
+# MARK: - Duration Probe
+
+
+def probe_duration_seconds(
+    content: bytes,
+) -> Optional[float]:
+    # None quando o formato não é reconhecido:
+    # aí o áudio é decodificado para medir.
+    if content[4:8] == b"ftyp":
+        return probe_mp4_duration(content)
+
+    if content[:4] == b"RIFF" and content[8:12] == b"WAVE":
+        return probe_wav_duration(content)
+
+    return None
+
+
+def probe_mp4_duration(
+    content: bytes,
+) -> Optional[float]:
+    # O moov pode estar antes ou depois do mdat;
+    # com o arquivo inteiro em memória, tanto faz.
+    moov = find_mp4_box(
+        content,
+        b"moov",
+        0,
+        len(content),
+    )
+
+    if moov is None:
+        return None
+
+    mvhd = find_mp4_box(
+        content,
+        b"mvhd",
+        *moov,
+    )
+
+    if mvhd is None:
+        return None
+
+    start, end = mvhd
+
+    try:
+        if content[start] == 1:
+            timescale, duration = struct.unpack_from(
+                ">IQ",
+                content,
+                start + 20,
+            )
+
+        else:
+            timescale, duration = struct.unpack_from(
+                ">II",
+                content,
+                start + 12,
+            )
+
+    except struct.error:
+        return None
+
+    if not timescale:
+        return None
+
+    return duration / timescale
+
+
+def find_mp4_box(
+    content: bytes,
+    box_type: bytes,
+    start: int,
+    end: int,
+) -> Optional[Tuple[int, int]]:
+    # Devolve o intervalo do conteúdo da caixa,
+    # sem o cabeçalho.
+    offset = start
+
+    while offset + 8 <= end:
+        size, current_type = struct.unpack_from(
+            ">I4s",
+            content,
+            offset,
+        )
+
+        header_size = 8
+
+        if size == 1:
+            if offset + 16 > end:
+                return None
+
+            size = struct.unpack_from(
+                ">Q",
+                content,
+                offset + 8,
+            )[0]
+
+            header_size = 16
+
+        elif size == 0:
+            size = end - offset
+
+        if size < header_size:
+            return None
+
+        if current_type == box_type:
+            return (
+                offset + header_size,
+                min(offset + size, end),
+            )
+
+        offset += size
+
+    return None
+
+
+def probe_wav_duration(
+    content: bytes,
+) -> Optional[float]:
+    byte_rate = None
+    offset = 12
+
+    while offset + 8 <= len(content):
+        chunk_id, chunk_size = struct.unpack_from(
+            "<4sI",
+            content,
+            offset,
+        )
+
+        if chunk_id == b"fmt " and chunk_size >= 12:
+            byte_rate = struct.unpack_from(
+                "<I",
+                content,
+                offset + 16,
+            )[0]
+
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+
+            return min(
+                chunk_size,
+                len(content) - offset - 8,
+            ) / byte_rate
+
+        offset += 8 + chunk_size + chunk_size % 2
+
+    return None
+
+
+def parse_silence_midpoints(
+    ffmpeg_output: str,
+) -> List[float]:
+    midpoints = []
+
+    for match in SILENCE_END_PATTERN.finditer(ffmpeg_output):
+        end = float(match.group("end"))
+        duration = float(match.group("duration"))
+
+        midpoints.append(
+            end - duration / 2
+        )
+
+    return midpoints
+
+
+def plan_segments(
+    duration: float,
+    silences: List[float],
+    target_seconds: float,
+    max_seconds: float,
+) -> List[Tuple[float, float]]:
+    segments = []
+    start = 0.0
+
+    while duration - start > max_seconds:
+        # Corta na pausa mais próxima do tamanho alvo,
+        # sem passar do máximo.
+        candidates = [
+            silence
+            for silence in silences
+            if start + target_seconds / 2
+            <= silence
+            <= start + max_seconds
+        ]
+
+        end = (
+            min(
+                candidates,
+                key=lambda silence: abs(
+                    silence - (start + target_seconds)
+                ),
+            )
+            if candidates
+            else start + max_seconds
+        )
+
+        segments.append(
+            (start, end)
+        )
+
+        start = end
+
+    segments.append(
+        (start, duration)
+    )
+
+    return segments
+
+
+def seconds_to_offset(
+    seconds: float,
+) -> int:
+    # Sempre em uma amostra inteira.
+    return int(seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+
+
+def encode_wav(
+    pcm: bytes,
+) -> bytes:
+    buffer = io.BytesIO()
+
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(pcm)
+
+    return buffer.getvalue()
\ No newline at end of file
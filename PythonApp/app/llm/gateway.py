@@ -0,0 +1,732 @@
+import asyncio
+import os
+import time
+
+from functools import lru_cache
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, List, Optional
+
+import httpx
+
+from dotenv import load_dotenv
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+
+from app.cache import build_cache_key
+from app.llm.metrics import llm_usage_metrics
+from app.llm.resilience import (
+    LLMDeadlineExceeded,
+    get_breaker,
+    get_endpoint_deadline,
+    latency_tracker,
+    run_hedged,
+    select_model,
+)
+from app.llm.scheduler import llm_scheduler
+from app.llm.single_flight import SingleFlight
+from app.llm.stub import (
+    LLM_STUB_MODE,
+    STUB_ENDPOINT_HEADER,
+    build_async_stub_transport,
+    build_sync_stub_transport,
+    is_stub_enabled,
+)
+from app.observability import logger
+
+
+load_dotenv()
+
+
+LLM_MAX_CONNECTIONS = int(
+    os.getenv(
+        "LLM_MAX_CONNECTIONS",
+        "200",
+    )
+)
+
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv(
+        "LLM_MAX_KEEPALIVE_CONNECTIONS",
+        "50",
+    )
+)
+
+
+completion_single_flight = SingleFlight(
+    "chat_completions"
+)
+
+# Erros que indicam modelo degradado e contam para o circuit breaker.
+DEGRADATION_ERRORS = (
+    APIConnectionError,
+    InternalServerError,
+)
+
+
+# MARK: - Clients
+
+
+def _get_api_key() -> str:
+    api_key = os.getenv(
+        "OPENAI_API_KEY"
+    )
+
+    if not api_key and LLM_STUB_MODE in ("synthetic", "replay"):
+        # O stub não chama a OpenAI.
+        return "stub"
+
+    if not api_key:
+        raise RuntimeError(
+            "A variável de ambiente OPENAI_API_KEY não foi configurada."
+        )
+
+    return api_key
+
+
+def _build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=
+            LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=
+            LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> AsyncOpenAI:
+    # Um único client por processo: as conexões HTTP ficam
+    # no pool e cada chamada em andamento custa só uma coroutine.
+    return AsyncOpenAI(
+        api_key=_get_api_key(),
+        http_client=DefaultAsyncHttpxClient(
+            limits=_build_limits(),
+            transport=build_async_stub_transport(
+                _build_limits()
+            ),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sync_client() -> OpenAI:
+    # Usado apenas fora do event loop (tasks do Celery).
+    return OpenAI(
+        api_key=_get_api_key(),
+        http_client=DefaultHttpxClient(
+            limits=_build_limits(),
+            transport=build_sync_stub_transport(
+                _build_limits()
+            ),
+        ),
+    )
+
+
+def _stub_headers(
+    endpoint: str,
+) -> Optional[Dict[str, str]]:
+    # Só o stub usa o nome do endpoint para escolher
+    # o formato da resposta sintética.
+    if not is_stub_enabled():
+        return None
+
+    return {
+        STUB_ENDPOINT_HEADER: endpoint,
+    }
+
+
+# MARK: - Chat Completions
+
+
+async def create_chat_completion(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    route_model: bool = True,
+    coalesce: bool = False,
+    **options: Any,
+):
+    started_at = time.perf_counter()
+
+    deadline_seconds = get_endpoint_deadline(
+        endpoint
+    )
+
+    # route_model=False quando o chamador já passou
+    # por select_model e escolheu o modelo.
+    selected_model = (
+        select_model(
+            endpoint,
+            model,
+        )
+        if route_model
+        else model
+    )
+
+    async def request_completion():
+        async with _scheduled_call(endpoint) as queue_wait_ms:
+            call_started_at = time.perf_counter()
+
+            try:
+                response = await (
+                    get_async_client()
+                    .chat
+                    .completions
+                    .create(
+                        model=selected_model,
+                        messages=messages,
+                        timeout=deadline_seconds,
+                        extra_headers=_stub_headers(endpoint),
+                        **options,
+                    )
+                )
+
+            except Exception as error:
+                _record_usage(
+                    endpoint=endpoint,
+                    model=selected_model,
+                    outcome=_classify_error(error),
+                    call_started_at=call_started_at,
+                    queue_wait_ms=queue_wait_ms,
+                )
+
+                raise
+
+            # Só o tempo da OpenAI, sem a espera na fila.
+            latency_tracker.record(
+                endpoint,
+                time.perf_counter()
+                - call_started_at,
+            )
+
+            _record_usage(
+                endpoint=endpoint,
+                model=selected_model,
+                outcome="success",
+                call_started_at=call_started_at,
+                queue_wait_ms=queue_wait_ms,
+                usage=response.usage,
+            )
+
+            return response
+
+    async def request_hedged_completion():
+        return await run_hedged(
+            endpoint,
+            request_completion,
+        )
+
+    if coalesce:
+        # Chamadas simultâneas com o mesmo prompt
+        # compartilham uma única requisição à OpenAI.
+        pending_response = completion_single_flight.run(
+            build_cache_key(
+                selected_model,
+                messages,
+                options,
+            ),
+            request_hedged_completion,
+        )
+
+    else:
+        pending_response = request_hedged_completion()
+
+    response = await _with_deadline(
+        endpoint=endpoint,
+        model=selected_model,
+        deadline_seconds=deadline_seconds,
+        pending=pending_response,
+    )
+
+    _log_call(
+        endpoint=endpoint,
+        model=selected_model,
+        started_at=started_at,
+    )
+
+    return response
+
+
+def create_chat_completion_sync(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    **options: Any,
+):
+    started_at = time.perf_counter()
+
+    selected_model = select_model(
+        endpoint,
+        model,
+    )
+
+    breaker = get_breaker(
+        selected_model
+    )
+
+    # As tasks do Celery (feedback de currículo, banco de
+    # perguntas) respeitam os mesmos limites e o backoff
+    # de 429 que as chamadas da API.
+    with _scheduled_call_sync(endpoint) as queue_wait_ms:
+        call_started_at = time.perf_counter()
+
+        try:
+            response = (
+                get_sync_client()
+                .chat
+                .completions
+                .create(
+                    model=selected_model,
+                    messages=messages,
+                    timeout=get_endpoint_deadline(
+                        endpoint
+                    ),
+                    extra_headers=_stub_headers(endpoint),
+                    **options,
+                )
+            )
+
+        except Exception as error:
+            if isinstance(error, DEGRADATION_ERRORS):
+                breaker.record_failure()
+
+            _record_usage(
+                endpoint=endpoint,
+                model=selected_model,
+                outcome=_classify_error(error),
+                call_started_at=call_started_at,
+                queue_wait_ms=queue_wait_ms,
+            )
+
+            raise
+
+    breaker.record_success()
+
+    _record_usage(
+        endpoint=endpoint,
+        model=selected_model,
+        outcome="success",
+        call_started_at=call_started_at,
+        queue_wait_ms=queue_wait_ms,
+        usage=response.usage,
+    )
+
+    _log_call(
+        endpoint=endpoint,
+        model=selected_model,
+        started_at=started_at,
+    )
+
+    return response
+
+
+async def stream_chat_completion(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    route_model: bool = True,
+    **options: Any,
+) -> AsyncIterator[str]:
+    started_at = time.perf_counter()
+
+    # route_model=False quando o chamador já passou
+    # por select_model e escolheu o modelo.
+    selected_model = (
+        select_model(
+            endpoint,
+            model,
+        )
+        if route_model
+        else model
+    )
+
+    usage = None
+
+    # A vaga fica ocupada até o fim do stream.
+    async with _scheduled_call(endpoint) as queue_wait_ms:
+        call_started_at = time.perf_counter()
+
+        try:
+            # O prazo vale até o primeiro chunk; depois
+            # disso o timeout de leitura do client assume.
+            stream = await _with_deadline(
+                endpoint=endpoint,
+                model=selected_model,
+                deadline_seconds=get_endpoint_deadline(
+                    endpoint
+                ),
+                pending=(
+                    get_async_client()
+                    .chat
+                    .completions
+                    .create(
+                        model=selected_model,
+                        messages=messages,
+                        stream=True,
+                        # O último chunk traz o consumo de tokens.
+                        stream_options={
+                            "include_usage": True,
+                        },
+                        timeout=get_endpoint_deadline(
+                            endpoint
+                        ),
+                        extra_headers=_stub_headers(endpoint),
+                        **options,
+                    )
+                ),
+            )
+
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+
+                if not chunk.choices:
+                    continue
+
+                content = (
+                    chunk
+                    .choices[0]
+                    .delta
+                    .content
+                )
+
+                if content:
+                    yield content
+
+        except LLMDeadlineExceeded:
+            raise
+
+        except Exception as error:
+            _record_usage(
+                endpoint=endpoint,
+                model=selected_model,
+                outcome=_classify_error(error),
+                call_started_at=call_started_at,
+                queue_wait_ms=queue_wait_ms,
+            )
+
+            raise
+
+        _record_usage(
+            endpoint=endpoint,
+            model=selected_model,
+            outcome="success",
+            call_started_at=call_started_at,
+            queue_wait_ms=queue_wait_ms,
+            usage=usage,
+        )
+
+    _log_call(
+        endpoint=endpoint,
+        model=selected_model,
+        started_at=started_at,
+    )
+
+
+# MARK: - Audio Transcriptions
+
+
+async def create_transcription(
+    *,
+    endpoint: str,
+    model: str,
+    file: Any,
+    **options: Any,
+):
+    started_at = time.perf_counter()
+
+    deadline_seconds = get_endpoint_deadline(
+        endpoint
+    )
+
+    async def request_transcription():
+        async with _scheduled_call(endpoint) as queue_wait_ms:
+            call_started_at = time.perf_counter()
+
+            try:
+                transcription = await (
+                    get_async_client()
+                    .audio
+                    .transcriptions
+                    .create(
+                        model=model,
+                        file=file,
+                        timeout=deadline_seconds,
+                        extra_headers=_stub_headers(endpoint),
+                        **options,
+                    )
+                )
+
+            except Exception as error:
+                _record_usage(
+                    endpoint=endpoint,
+                    model=model,
+                    outcome=_classify_error(error),
+                    call_started_at=call_started_at,
+                    queue_wait_ms=queue_wait_ms,
+                )
+
+                raise
+
+            _record_usage(
+                endpoint=endpoint,
+                model=model,
+                outcome="success",
+                call_started_at=call_started_at,
+                queue_wait_ms=queue_wait_ms,
+            )
+
+            return transcription
+
+    transcription = await _with_deadline(
+        endpoint=endpoint,
+        model=model,
+        deadline_seconds=deadline_seconds,
+        pending=request_transcription(),
+    )
+
+    _log_call(
+        endpoint=endpoint,
+        model=model,
+        started_at=started_at,
+    )
+
+    return transcription
+
+
+# MARK: - Deadlines
+
+
+async def _with_deadline(
+    *,
+    endpoint: str,
+    model: str,
+    deadline_seconds: float,
+    pending: Awaitable[Any],
+) -> Any:
+    breaker = get_breaker(
+        model
+    )
+
+    try:
+        result = await asyncio.wait_for(
+            pending,
+            timeout=deadline_seconds,
+        )
+
+    except asyncio.TimeoutError as error:
+        breaker.record_failure()
+
+        llm_usage_metrics.record_call(
+            endpoint=endpoint,
+            model=model,
+            outcome="deadline_exceeded",
+            latency_ms=deadline_seconds * 1000,
+        )
+
+        logger.warning(
+            "llm call exceeded deadline",
+            extra={
+                "event":
+                    "llm_deadline_exceeded",
+                "endpoint":
+                    endpoint,
+                "model":
+                    model,
+                "deadlineSeconds":
+                    deadline_seconds,
+            },
+        )
+
+        raise LLMDeadlineExceeded(
+            endpoint,
+            deadline_seconds,
+        ) from error
+
+    except DEGRADATION_ERRORS:
+        breaker.record_failure()
+
+        raise
+
+    breaker.record_success()
+
+    return result
+
+
+# MARK: - Scheduling
+
+
+@asynccontextmanager
+async def _scheduled_call(
+    endpoint: str,
+) -> AsyncIterator[float]:
+    async with llm_scheduler.slot(
+        endpoint
+    ) as wait_ms:
+        if wait_ms >= 100:
+            logger.info(
+                "llm call waited for a slot",
+                extra={
+                    "event":
+                        "llm_scheduler_waited",
+                    "endpoint":
+                        endpoint,
+                    "waitMs":
+                        round(wait_ms, 2),
+                    "queueDepth":
+                        llm_scheduler.queue_depth(),
+                },
+            )
+
+        try:
+            yield wait_ms
+
+        except RateLimitError as error:
+            llm_scheduler.record_rate_limit(
+                _get_retry_after(error)
+            )
+
+            raise
+
+        llm_scheduler.record_success()
+
+
+@contextmanager
+def _scheduled_call_sync(
+    endpoint: str,
+) -> Iterator[float]:
+    with llm_scheduler.sync_slot(
+        endpoint
+    ) as wait_ms:
+        if wait_ms >= 100:
+            logger.info(
+                "llm call waited for a slot",
+                extra={
+                    "event":
+                        "llm_scheduler_waited",
+                    "endpoint":
+                        endpoint,
+                    "waitMs":
+                        round(wait_ms, 2),
+                    "queueDepth":
+                        llm_scheduler.queue_depth(),
+                },
+            )
+
+        try:
+            yield wait_ms
+
+        except RateLimitError as error:
+            llm_scheduler.record_rate_limit(
+                _get_retry_after(error)
+            )
+
+            raise
+
+        llm_scheduler.record_success()
+
+
+def _get_retry_after(
+    error: RateLimitError,
+) -> Optional[float]:
+    retry_after = error.response.headers.get(
+        "retry-after"
+    )
+
+    try:
+        return float(retry_after)
+
+    except (TypeError, ValueError):
+        return None
+
+
+# MARK: - Usage
+
+
+def _record_usage(
+    *,
+    endpoint: str,
+    model: str,
+    outcome: str,
+    call_started_at: float,
+    queue_wait_ms: float = 0.0,
+    usage: Any = None,
+) -> None:
+    llm_usage_metrics.record_call(
+        endpoint=endpoint,
+        model=model,
+        outcome=outcome,
+        latency_ms=(
+            time.perf_counter()
+            - call_started_at
+        )
+        * 1000,
+        queue_wait_ms=queue_wait_ms,
+        prompt_tokens=getattr(
+            usage,
+            "prompt_tokens",
+            0,
+        )
+        or 0,
+        completion_tokens=getattr(
+            usage,
+            "completion_tokens",
+            0,
+        )
+        or 0,
+    )
+
+
+def _classify_error(
+    error: Exception,
+) -> str:
+    if isinstance(error, RateLimitError):
+        return "rate_limited"
+
+    if isinstance(error, APITimeoutError):
+        return "timeout"
+
+    if isinstance(error, DEGRADATION_ERRORS):
+        return "provider_error"
+
+    return "error"
+
+
+# MARK: - Logging
+
+
+def _log_call(
+    endpoint: str,
+    model: str,
+    started_at: float,
+) -> None:
+    logger.debug(
+        "llm gateway call completed",
+        extra={
+            "event":
+                "llm_gateway_call_completed",
+            "endpoint":
+                endpoint,
+            "model":
+                model,
+            "durationMs":
+                round(
+                    (
+                        time.perf_counter()
+                        - started_at
+                    )
+                    * 1000,
+                    2,
+                ),
+        },
+    )
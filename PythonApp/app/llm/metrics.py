@@ -0,0 +1,308 @@
+import bisect
+import threading
+
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+
+# Preenchido pelo middleware HTTP a partir do token,
+# para atribuir o consumo ao usuário da requisição.
+current_usage_user_id: ContextVar[Optional[UUID]] = ContextVar(
+    "current_usage_user_id",
+    default=None,
+)
+
+
+# MARK: - Pricing
+
+
+# Dólares por 1M de tokens (entrada, saída).
+MODEL_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+}
+
+
+def estimate_cost_usd(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+) -> float:
+    prices = MODEL_PRICES_PER_MILLION.get(
+        model
+    )
+
+    if prices is None:
+        # Versões datadas, como "gpt-4o-2024-08-06".
+        for known_model in sorted(
+            MODEL_PRICES_PER_MILLION,
+            key=len,
+            reverse=True,
+        ):
+            if model.startswith(f"{known_model}-"):
+                prices = MODEL_PRICES_PER_MILLION[
+                    known_model
+                ]
+
+                break
+
+    if prices is None:
+        return 0.0
+
+    input_price, output_price = prices
+
+    return (
+        prompt_tokens * input_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+# MARK: - Histogram
+
+
+LATENCY_BUCKETS_MS = (
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    20000,
+    30000,
+    60000,
+)
+
+
+class Histogram:
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS,
+    ):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(
+        self,
+        value: float,
+    ) -> None:
+        self.counts[
+            bisect.bisect_left(
+                self.buckets,
+                value,
+            )
+        ] += 1
+
+        self.count += 1
+        self.total += value
+
+    def quantile(
+        self,
+        quantile: float,
+    ) -> Optional[float]:
+        # Aproximação pelo limite superior do bucket.
+        if not self.count:
+            return None
+
+        target = quantile * self.count
+        cumulative = 0
+
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+
+            if cumulative >= target:
+                if index < len(self.buckets):
+                    return float(self.buckets[index])
+
+                return float(self.buckets[-1])
+
+        return float(self.buckets[-1])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count":
+                self.count,
+            "averageMs":
+                round(self.total / self.count, 2)
+                if self.count
+                else None,
+            "p50Ms":
+                self.quantile(0.5),
+            "p95Ms":
+                self.quantile(0.95),
+            "p99Ms":
+                self.quantile(0.99),
+            "buckets": {
+                f"le_{bucket}": count
+                for bucket, count in zip(
+                    list(self.buckets) + ["inf"],
+                    self.counts,
+                )
+            },
+        }
+
+
+# MARK: - Usage Metrics
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.calls_by_outcome: Dict[str, int] = {}
+        self.calls_by_model: Dict[str, int] = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latency = Histogram()
+        self.queue_wait = Histogram()
+
+
+class LLMUsageMetrics:
+    def __init__(self):
+        # Também recebe chamadas das threads do Celery.
+        self._lock = threading.Lock()
+
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+
+        # (user_id, dia, endpoint, modelo) -> totais ainda
+        # não gravados no banco.
+        self._pending_usage: Dict[
+            Tuple[UUID, date, str, str],
+            Dict[str, float],
+        ] = {}
+
+    def record_call(
+        self,
+        *,
+        endpoint: str,
+        model: str,
+        outcome: str,
+        latency_ms: float,
+        queue_wait_ms: float = 0.0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        cost_usd = estimate_cost_usd(
+            model,
+            prompt_tokens,
+            completion_tokens,
+        )
+
+        user_id = current_usage_user_id.get()
+
+        with self._lock:
+            metrics = self._endpoints.setdefault(
+                endpoint,
+                _EndpointMetrics(),
+            )
+
+            metrics.calls_by_outcome[outcome] = (
+                metrics.calls_by_outcome.get(outcome, 0)
+                + 1
+            )
+            metrics.calls_by_model[model] = (
+                metrics.calls_by_model.get(model, 0)
+                + 1
+            )
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            metrics.cost_usd += cost_usd
+            metrics.latency.observe(latency_ms)
+            metrics.queue_wait.observe(queue_wait_ms)
+
+            if user_id is None:
+                return
+
+            usage = self._pending_usage.setdefault(
+                (
+                    user_id,
+                    date.today(),
+                    endpoint,
+                    model,
+                ),
+                {
+                    "calls": 0,
+                    "error_calls": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                    "total_latency_ms": 0.0,
+                },
+            )
+
+            usage["calls"] += 1
+            usage["error_calls"] += (
+                0 if outcome == "success" else 1
+            )
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+            usage["cost_usd"] += cost_usd
+            usage["total_latency_ms"] += latency_ms
+
+    def drain_pending_usage(
+        self,
+    ) -> List[Tuple[Tuple[UUID, date, str, str], Dict[str, float]]]:
+        with self._lock:
+            pending_usage = list(
+                self._pending_usage.items()
+            )
+
+            self._pending_usage.clear()
+
+        return pending_usage
+
+    def restore_pending_usage(
+        self,
+        pending_usage: List[
+            Tuple[Tuple[UUID, date, str, str], Dict[str, float]]
+        ],
+    ) -> None:
+        # Devolve ao buffer o que não foi gravado.
+        with self._lock:
+            for key, values in pending_usage:
+                usage = self._pending_usage.setdefault(
+                    key,
+                    {
+                        field: 0
+                        for field in values
+                    },
+                )
+
+                for field, value in values.items():
+                    usage[field] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "calls":
+                        metrics.latency.count,
+                    "callsByOutcome":
+                        dict(metrics.calls_by_outcome),
+                    "callsByModel":
+                        dict(metrics.calls_by_model),
+                    "promptTokens":
+                        metrics.prompt_tokens,
+                    "completionTokens":
+                        metrics.completion_tokens,
+                    "costUsd":
+                        round(metrics.cost_usd, 6),
+                    "latency":
+                        metrics.latency.snapshot(),
+                    "queueWait":
+                        metrics.queue_wait.snapshot(),
+                }
+                for endpoint, metrics in self._endpoints.items()
+            }
+
+
+llm_usage_metrics = LLMUsageMetrics()
\ No newline at end of file
@@ -0,0 +1,414 @@
+import math
+import os
+import re
+
+from typing import Dict, List, Set, Tuple
+
+from dotenv import load_dotenv
+
+from app.observability import logger
+
+
+load_dotenv()
+
+
+# Orçamento de tokens do currículo dentro de cada prompt.
+RESUME_TOKEN_BUDGETS: Dict[str, int] = {
+    "generate_interview_questions": int(
+        os.getenv(
+            "INTERVIEW_QUESTIONS_RESUME_TOKEN_BUDGET",
+            "1200",
+        )
+    ),
+    "resume_feedback": int(
+        os.getenv(
+            "RESUME_FEEDBACK_RESUME_TOKEN_BUDGET",
+            "3000",
+        )
+    ),
+    "study_plan": int(
+        os.getenv(
+            "STUDY_PLAN_RESUME_TOKEN_BUDGET",
+            "1500",
+        )
+    ),
+    "resume_profile": int(
+        os.getenv(
+            "RESUME_PROFILE_RESUME_TOKEN_BUDGET",
+            "4000",
+        )
+    ),
+}
+
+DEFAULT_RESUME_TOKEN_BUDGET = 1500
+
+# Média aproximada para português/inglês nos modelos GPT.
+CHARS_PER_TOKEN = 4
+
+SECTION_HEADINGS = (
+    "experiência",
+    "experiencia",
+    "experience",
+    "histórico profissional",
+    "habilidades",
+    "competências",
+    "skills",
+    "tecnologias",
+    "projetos",
+    "projects",
+    "formação",
+    "education",
+    "certificações",
+    "certifications",
+    "idiomas",
+    "languages",
+    "resumo",
+    "summary",
+    "objetivo",
+    "sobre",
+    "about",
+    "cursos",
+)
+
+# Seções que costumam ser mais úteis para perguntas
+# e planos de estudo do que dados pessoais ou idiomas.
+SECTION_PRIORITY_BOOSTS = {
+    "experiência": 3,
+    "experiencia": 3,
+    "experience": 3,
+    "histórico profissional": 3,
+    "habilidades": 3,
+    "competências": 3,
+    "skills": 3,
+    "tecnologias": 3,
+    "projetos": 2,
+    "projects": 2,
+    "resumo": 2,
+    "summary": 2,
+    "certificações": 1,
+    "certifications": 1,
+}
+
+# Separador de páginas no texto extraído do PDF.
+PAGE_BREAK = "\f"
+
+# Linhas do topo e do fim de cada página onde
+# cabeçalhos e rodapés são procurados.
+PAGE_EDGE_LINES = 2
+
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^(p[áa]gina|page)?\s*\d+\s*((de|of|/)\s*\d+)?$",
+    re.IGNORECASE,
+)
+
+
+# MARK: - Tokens
+
+
+def estimate_tokens(
+    text: str,
+) -> int:
+    return math.ceil(
+        len(text)
+        / CHARS_PER_TOKEN
+    )
+
+
+# MARK: - Resume Condensation
+
+
+def fit_resume_to_budget(
+    resume_text: str,
+    endpoint: str,
+    job_title: str = "",
+    description: str = "",
+) -> str:
+    if not resume_text:
+        return ""
+
+    budget = RESUME_TOKEN_BUDGETS.get(
+        endpoint,
+        DEFAULT_RESUME_TOKEN_BUDGET,
+    )
+
+    original_tokens = estimate_tokens(
+        resume_text
+    )
+
+    # Dentro do orçamento o currículo vai como está.
+    if original_tokens <= budget:
+        return resume_text.replace(
+            PAGE_BREAK,
+            "\n",
+        )
+
+    sections = split_resume_sections(
+        remove_page_headers(
+            resume_text
+        )
+    )
+
+    condensed_text = select_resume_sections(
+        sections=sections,
+        budget=budget,
+        keywords=extract_keywords(
+            f"{job_title} {description}"
+        ),
+    )
+
+    condensed_tokens = estimate_tokens(
+        condensed_text
+    )
+
+    logger.info(
+        "resume fitted to prompt budget",
+        extra={
+            "event":
+                "prompt_resume_budget_applied",
+            "endpoint":
+                endpoint,
+            "budgetTokens":
+                budget,
+            "originalTokens":
+                original_tokens,
+            "condensedTokens":
+                condensed_tokens,
+            "sectionCount":
+                len(sections),
+        },
+    )
+
+    return condensed_text
+
+
+def remove_page_headers(
+    resume_text: str,
+) -> List[str]:
+    # Cabeçalhos, rodapés e números de página se repetem
+    # na mesma posição da borda de cada página. Linhas
+    # iguais no meio do texto (dois cargos com a mesma
+    # stack, por exemplo) são conteúdo e ficam.
+    pages = [
+        [
+            " ".join(raw_line.split())
+            for raw_line in page_text.splitlines()
+            if raw_line.strip()
+        ]
+        for page_text in resume_text.split(PAGE_BREAK)
+    ]
+
+    edge_counts: Dict[Tuple[str, int, str], int] = {}
+
+    for page_lines in pages:
+        for edge in {
+            edge
+            for position in range(len(page_lines))
+            for edge in get_page_edges(page_lines, position)
+        }:
+            edge_counts[edge] = edge_counts.get(edge, 0) + 1
+
+    lines: List[str] = []
+
+    for page_lines in pages:
+        for position, line in enumerate(page_lines):
+            edges = get_page_edges(
+                page_lines,
+                position,
+            )
+
+            if edges and (
+                PAGE_NUMBER_PATTERN.match(line)
+                or any(
+                    edge_counts[edge] >= 2
+                    for edge in edges
+                )
+            ):
+                continue
+
+            lines.append(
+                line
+            )
+
+    return lines
+
+
+def get_page_edges(
+    page_lines: List[str],
+    position: int,
+) -> List[Tuple[str, int, str]]:
+    # Posição contada a partir do topo e do fim da página.
+    line = page_lines[position].lower()
+
+    from_bottom = len(page_lines) - 1 - position
+
+    return [
+        *(
+            [("top", position, line)]
+            if position < PAGE_EDGE_LINES
+            else []
+        ),
+        *(
+            [("bottom", from_bottom, line)]
+            if from_bottom < PAGE_EDGE_LINES
+            else []
+        ),
+    ]
+
+
+def split_resume_sections(
+    lines: List[str],
+) -> List[Tuple[str, List[str]]]:
+    # A primeira seção (nome, contato, resumo)
+    # fica sem título.
+    sections: List[Tuple[str, List[str]]] = [
+        ("", [])
+    ]
+
+    for line in lines:
+        heading = match_section_heading(
+            line
+        )
+
+        if heading:
+            sections.append(
+                (heading, [line])
+            )
+
+        else:
+            sections[-1][1].append(
+                line
+            )
+
+    return [
+        section
+        for section in sections
+        if section[1]
+    ]
+
+
+def match_section_heading(
+    line: str,
+) -> str:
+    if len(line) > 40:
+        return ""
+
+    normalized_line = line.lower().strip(
+        " :-•"
+    )
+
+    for heading in SECTION_HEADINGS:
+        if normalized_line.startswith(
+            heading
+        ):
+            return heading
+
+    return ""
+
+
+def extract_keywords(
+    text: str,
+) -> Set[str]:
+    return {
+        word
+        for word in re.findall(
+            r"[\w+#.]+",
+            text.lower(),
+        )
+        if len(word) >= 3
+    }
+
+
+def select_resume_sections(
+    sections: List[Tuple[str, List[str]]],
+    budget: int,
+    keywords: Set[str],
+) -> str:
+    full_text = "\n".join(
+        line
+        for _, lines in sections
+        for line in lines
+    )
+
+    if estimate_tokens(full_text) <= budget:
+        return full_text
+
+    scored_indexes = sorted(
+        range(len(sections)),
+        key=lambda index: score_resume_section(
+            index=index,
+            section=sections[index],
+            keywords=keywords,
+        ),
+        reverse=True,
+    )
+
+    selected_lines: Dict[int, List[str]] = {}
+
+    remaining_tokens = budget
+
+    for index in scored_indexes:
+        for line in sections[index][1]:
+            # +1 pela quebra de linha.
+            line_tokens = estimate_tokens(
+                line
+            ) + 1
+
+            if line_tokens > remaining_tokens:
+                break
+
+            selected_lines.setdefault(
+                index,
+                [],
+            ).append(
+                line
+            )
+
+            remaining_tokens -= line_tokens
+
+        # Título sem conteúdo só gasta tokens.
+        heading, lines = sections[index]
+
+        if (
+            heading
+            and len(selected_lines.get(index, [])) == 1
+        ):
+            selected_lines.pop(
+                index
+            )
+
+            remaining_tokens += estimate_tokens(
+                lines[0]
+            ) + 1
+
+        if remaining_tokens <= 0:
+            break
+
+    # Mantém a ordem original do currículo.
+    return "\n".join(
+        line
+        for index in sorted(selected_lines)
+        for line in selected_lines[index]
+    )
+
+
+def score_resume_section(
+    index: int,
+    section: Tuple[str, List[str]],
+    keywords: Set[str],
+) -> float:
+    heading, lines = section
+
+    if index == 0 and not heading:
+        return float("inf")
+
+    section_words = extract_keywords(
+        " ".join(lines)
+    )
+
+    return (
+        len(section_words & keywords)
+        + SECTION_PRIORITY_BOOSTS.get(
+            heading,
+            0,
+        )
+    )
\ No newline at end of file
@@ -0,0 +1,472 @@
+import asyncio
+import math
+import os
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from app.observability import logger
+
+
+T = TypeVar("T")
+
+
+# MARK: - Configuration
+
+
+LLM_DEFAULT_DEADLINE_SECONDS = float(
+    os.getenv(
+        "LLM_DEFAULT_DEADLINE_SECONDS",
+        "60",
+    )
+)
+
+# Formato: "simulation_questions=15,simulation_evaluation=30"
+LLM_ENDPOINT_DEADLINES = os.getenv(
+    "LLM_ENDPOINT_DEADLINES",
+    (
+        "simulation_questions=15,"
+        "simulation_evaluation=30,"
+        "simulation_answer_evaluation=20"
+    ),
+)
+
+LLM_HEDGED_ENDPOINTS = os.getenv(
+    "LLM_HEDGED_ENDPOINTS",
+    "simulation_questions,simulation_evaluation",
+)
+
+# Amostras necessárias antes de confiar no p95.
+LLM_HEDGE_MIN_SAMPLES = int(
+    os.getenv(
+        "LLM_HEDGE_MIN_SAMPLES",
+        "20",
+    )
+)
+
+# Vazio desativa o fallback.
+LLM_FALLBACK_MODEL = os.getenv(
+    "LLM_FALLBACK_MODEL",
+    "",
+).strip()
+
+LLM_BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv(
+        "LLM_BREAKER_FAILURE_THRESHOLD",
+        "5",
+    )
+)
+
+LLM_BREAKER_RESET_SECONDS = float(
+    os.getenv(
+        "LLM_BREAKER_RESET_SECONDS",
+        "30",
+    )
+)
+
+
+def parse_endpoint_seconds(
+    raw_values: str,
+) -> Dict[str, float]:
+    values: Dict[str, float] = {}
+
+    for raw_value in raw_values.split(","):
+        endpoint, _, seconds = (
+            raw_value.partition("=")
+        )
+
+        try:
+            values[endpoint.strip()] = float(
+                seconds
+            )
+
+        except ValueError:
+            continue
+
+    return values
+
+
+ENDPOINT_DEADLINES = parse_endpoint_seconds(
+    LLM_ENDPOINT_DEADLINES
+)
+
+HEDGED_ENDPOINTS = {
+    endpoint.strip()
+    for endpoint in LLM_HEDGED_ENDPOINTS.split(",")
+    if endpoint.strip()
+}
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    def __init__(
+        self,
+        endpoint: str,
+        deadline_seconds: float,
+    ):
+        super().__init__(
+            f"LLM call for {endpoint} exceeded "
+            f"{deadline_seconds}s deadline."
+        )
+
+        self.endpoint = endpoint
+        self.deadline_seconds = deadline_seconds
+
+
+class LLMUnavailable(HTTPException):
+    # Circuito aberto sem modelo reserva: falha na hora, em vez
+    # de mandar a chamada para o modelo que está falhando. É um
+    # HTTPException para os routers já responderem 503.
+    def __init__(
+        self,
+        endpoint: str,
+        model: str,
+    ):
+        super().__init__(
+            status_code=503,
+            detail=(
+                "A inteligência artificial está indisponível "
+                "no momento. Tente novamente em instantes."
+            ),
+            headers={
+                "Retry-After":
+                    str(math.ceil(LLM_BREAKER_RESET_SECONDS)),
+            },
+        )
+
+        self.endpoint = endpoint
+        self.model = model
+
+
+def get_endpoint_deadline(
+    endpoint: str,
+) -> float:
+    return ENDPOINT_DEADLINES.get(
+        endpoint,
+        LLM_DEFAULT_DEADLINE_SECONDS,
+    )
+
+
+# MARK: - Latency Tracking
+
+
+class LatencyTracker:
+    def __init__(
+        self,
+        max_samples: int = 200,
+    ):
+        self.max_samples = max_samples
+
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(
+        self,
+        endpoint: str,
+        duration_seconds: float,
+    ) -> None:
+        self._samples.setdefault(
+            endpoint,
+            deque(maxlen=self.max_samples),
+        ).append(
+            duration_seconds
+        )
+
+    def percentile(
+        self,
+        endpoint: str,
+        percentile: float,
+    ) -> Optional[float]:
+        samples = self._samples.get(
+            endpoint
+        )
+
+        if not samples or len(samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+
+        ordered_samples = sorted(samples)
+
+        index = min(
+            len(ordered_samples) - 1,
+            math.ceil(
+                percentile
+                * len(ordered_samples)
+            )
+            - 1,
+        )
+
+        return ordered_samples[index]
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+
+        for endpoint, samples in self._samples.items():
+            p95 = self.percentile(
+                endpoint,
+                0.95,
+            )
+
+            stats[endpoint] = {
+                "samples":
+                    len(samples),
+                "p95Ms":
+                    round(p95 * 1000, 2)
+                    if p95 is not None
+                    else None,
+            }
+
+        return stats
+
+
+latency_tracker = LatencyTracker()
+
+
+# MARK: - Hedging
+
+
+async def run_hedged(
+    endpoint: str,
+    factory: Callable[[], Awaitable[T]],
+) -> T:
+    hedge_delay = (
+        latency_tracker.percentile(
+            endpoint,
+            0.95,
+        )
+        if endpoint in HEDGED_ENDPOINTS
+        else None
+    )
+
+    if hedge_delay is None:
+        return await factory()
+
+    first_attempt = asyncio.ensure_future(
+        factory()
+    )
+
+    pending = {first_attempt}
+
+    try:
+        done, pending = await asyncio.wait(
+            pending,
+            timeout=hedge_delay,
+        )
+
+        if done:
+            return first_attempt.result()
+
+        # A primeira tentativa passou do p95:
+        # dispara uma segunda e fica com a que terminar antes.
+        logger.info(
+            "llm hedged request fired",
+            extra={
+                "event":
+                    "llm_hedge_fired",
+                "endpoint":
+                    endpoint,
+                "hedgeDelayMs":
+                    round(hedge_delay * 1000, 2),
+            },
+        )
+
+        pending.add(
+            asyncio.ensure_future(
+                factory()
+            )
+        )
+
+        last_error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+
+                last_error = attempt.exception()
+
+        raise last_error
+
+    finally:
+        for attempt in pending:
+            attempt.cancel()
+
+
+# MARK: - Circuit Breaker
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+
+        # Início da chamada de teste em half_open. Se ela não
+        # registrar resultado, outra é liberada após reset_seconds.
+        self.probe_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+
+        if (
+            time.monotonic() - self.opened_at
+            >= self.reset_seconds
+        ):
+            # Deixa uma chamada passar para testar o modelo.
+            return "half_open"
+
+        return "open"
+
+    def allows_request(self) -> bool:
+        state = self.state
+
+        if state != "half_open":
+            return state == "closed"
+
+        # Só uma chamada de teste por vez: as demais seguem
+        # para o fallback até o resultado dela chegar.
+        now = time.monotonic()
+
+        if (
+            self.probe_started_at is not None
+            and now - self.probe_started_at
+            < self.reset_seconds
+        ):
+            return False
+
+        self.probe_started_at = now
+
+        return True
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(
+                "llm circuit breaker closed",
+                extra={
+                    "event":
+                        "llm_breaker_closed",
+                    "model":
+                        self.name,
+                },
+            )
+
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+
+        if (
+            self.state == "half_open"
+            or self.consecutive_failures
+            >= self.failure_threshold
+        ):
+            if self.state != "open":
+                logger.warning(
+                    "llm circuit breaker opened",
+                    extra={
+                        "event":
+                            "llm_breaker_opened",
+                        "model":
+                            self.name,
+                        "consecutiveFailures":
+                            self.consecutive_failures,
+                    },
+                )
+
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(
+    model: str,
+) -> CircuitBreaker:
+    if model not in _breakers:
+        _breakers[model] = CircuitBreaker(
+            name=model,
+            failure_threshold=LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=LLM_BREAKER_RESET_SECONDS,
+        )
+
+    return _breakers[model]
+
+
+def select_model(
+    endpoint: str,
+    model: str,
+) -> str:
+    if get_breaker(model).allows_request():
+        return model
+
+    if (
+        not LLM_FALLBACK_MODEL
+        or LLM_FALLBACK_MODEL == model
+        or not get_breaker(LLM_FALLBACK_MODEL).allows_request()
+    ):
+        logger.warning(
+            "llm call rejected by open circuit",
+            extra={
+                "event":
+                    "llm_circuit_open_rejected",
+                "endpoint":
+                    endpoint,
+                "model":
+                    model,
+                "fallbackModel":
+                    LLM_FALLBACK_MODEL or None,
+            },
+        )
+
+        raise LLMUnavailable(
+            endpoint,
+            model,
+        )
+
+    logger.info(
+        "llm call routed to fallback model",
+        extra={
+            "event":
+                "llm_fallback_model_used",
+            "endpoint":
+                endpoint,
+            "model":
+                model,
+            "fallbackModel":
+                LLM_FALLBACK_MODEL,
+        },
+    )
+
+    return LLM_FALLBACK_MODEL
+
+
+def breaker_stats() -> Dict[str, Any]:
+    return {
+        model: {
+            "state":
+                breaker.state,
+            "consecutiveFailures":
+                breaker.consecutive_failures,
+            "probeInFlight":
+                breaker.probe_started_at is not None,
+        }
+        for model, breaker in _breakers.items()
+    }
\ No newline at end of file
@@ -0,0 +1,588 @@
+import asyncio
+import os
+import threading
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from app.observability import logger
+
+
+# MARK: - Priorities
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_STANDARD: "standard",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# A simulação acontece com a pessoa esperando a próxima
+# pergunta; feedback de currículo pode esperar um pouco mais.
+ENDPOINT_PRIORITIES = {
+    "simulation_questions": PRIORITY_INTERACTIVE,
+    "simulation_transcription": PRIORITY_INTERACTIVE,
+    "simulation_evaluation": PRIORITY_INTERACTIVE,
+    "simulation_answer_evaluation": PRIORITY_INTERACTIVE,
+    "resume_feedback": PRIORITY_BACKGROUND,
+    "resume_feedback_stream": PRIORITY_BACKGROUND,
+    "resume_profile": PRIORITY_BACKGROUND,
+    "question_bank_refill": PRIORITY_BACKGROUND,
+}
+
+
+# MARK: - Configuration
+
+
+LLM_MAX_CONCURRENCY = int(
+    os.getenv(
+        "LLM_MAX_CONCURRENCY",
+        "32",
+    )
+)
+
+# Formato: "simulation_evaluation=8,resume_feedback=4"
+LLM_ENDPOINT_CONCURRENCY = os.getenv(
+    "LLM_ENDPOINT_CONCURRENCY",
+    "",
+)
+
+LLM_RATE_LIMIT_BASE_BACKOFF_SECONDS = float(
+    os.getenv(
+        "LLM_RATE_LIMIT_BASE_BACKOFF_SECONDS",
+        "1",
+    )
+)
+
+LLM_RATE_LIMIT_MAX_BACKOFF_SECONDS = float(
+    os.getenv(
+        "LLM_RATE_LIMIT_MAX_BACKOFF_SECONDS",
+        "30",
+    )
+)
+
+# Sucessos seguidos necessários para liberar mais uma vaga
+# depois que um 429 reduziu o limite.
+LLM_CONCURRENCY_RECOVERY_SUCCESSES = int(
+    os.getenv(
+        "LLM_CONCURRENCY_RECOVERY_SUCCESSES",
+        "10",
+    )
+)
+
+
+# Chamadas síncronas (tasks do Celery) não entram na fila do
+# event loop: conferem a vaga de novo a cada intervalo.
+LLM_SYNC_POLL_SECONDS = 0.05
+
+
+def parse_endpoint_limits(
+    raw_limits: str,
+) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+
+    for raw_limit in raw_limits.split(","):
+        endpoint, _, value = (
+            raw_limit.partition("=")
+        )
+
+        if endpoint.strip() and value.strip().isdigit():
+            limits[endpoint.strip()] = max(
+                1,
+                int(value),
+            )
+
+    return limits
+
+
+# MARK: - Scheduler
+
+
+class _Waiter:
+    def __init__(
+        self,
+        endpoint: str,
+        future: "asyncio.Future[None]",
+    ):
+        self.endpoint = endpoint
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        endpoint_limits: Dict[str, int],
+    ):
+        self.max_concurrency = max(
+            1,
+            max_concurrency,
+        )
+        self.endpoint_limits = endpoint_limits
+
+        # Limite atual: cai pela metade a cada 429
+        # e volta a subir aos poucos (AIMD).
+        self.current_limit = self.max_concurrency
+
+        self._queues: Dict[int, Deque[_Waiter]] = {
+            priority: deque()
+            for priority in PRIORITY_NAMES
+        }
+
+        self._active = 0
+        self._active_by_endpoint: Dict[str, int] = {}
+
+        self._backoff_until = 0.0
+        self._backoff_seconds = 0.0
+        self._successes_since_rate_limit = 0
+        self._dispatch_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Chamadas síncronas dividem os mesmos limites, mas
+        # têm contadores próprios, protegidos pela Condition.
+        self._sync_condition = threading.Condition()
+        self._sync_active = 0
+        self._sync_active_by_endpoint: Dict[str, int] = {}
+        self._sync_waiting = 0
+
+        self.rate_limited_calls = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.granted_calls = 0
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        endpoint: str,
+    ) -> AsyncIterator[float]:
+        wait_ms = await self._acquire(
+            endpoint
+        )
+
+        try:
+            yield wait_ms
+
+        finally:
+            self._release(
+                endpoint
+            )
+
+    @contextmanager
+    def sync_slot(
+        self,
+        endpoint: str,
+    ) -> Iterator[float]:
+        wait_ms = self._acquire_sync(
+            endpoint
+        )
+
+        try:
+            yield wait_ms
+
+        finally:
+            self._release_sync(
+                endpoint
+            )
+
+    def record_success(self) -> None:
+        if self.current_limit >= self.max_concurrency:
+            return
+
+        self._successes_since_rate_limit += 1
+
+        if (
+            self._successes_since_rate_limit
+            >= LLM_CONCURRENCY_RECOVERY_SUCCESSES
+        ):
+            self._successes_since_rate_limit = 0
+            self.current_limit += 1
+
+            self._wake()
+
+    def record_rate_limit(
+        self,
+        retry_after: Optional[float],
+    ) -> None:
+        self.rate_limited_calls += 1
+        self._successes_since_rate_limit = 0
+
+        self.current_limit = max(
+            1,
+            self.current_limit // 2,
+        )
+
+        self._backoff_seconds = min(
+            LLM_RATE_LIMIT_MAX_BACKOFF_SECONDS,
+            max(
+                LLM_RATE_LIMIT_BASE_BACKOFF_SECONDS,
+                self._backoff_seconds * 2,
+            ),
+        )
+
+        backoff_seconds = (
+            retry_after
+            if retry_after is not None
+            else self._backoff_seconds
+        )
+
+        self._backoff_until = max(
+            self._backoff_until,
+            time.monotonic() + backoff_seconds,
+        )
+
+        logger.warning(
+            "llm rate limit reached",
+            extra={
+                "event":
+                    "llm_scheduler_rate_limited",
+                "currentLimit":
+                    self.current_limit,
+                "backoffSeconds":
+                    round(backoff_seconds, 2),
+                "queueDepth":
+                    self.queue_depth(),
+            },
+        )
+
+    def queue_depth(self) -> int:
+        return self._sync_waiting + sum(
+            len(queue)
+            for queue in self._queues.values()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active":
+                self._active,
+            "currentLimit":
+                self.current_limit,
+            "maxConcurrency":
+                self.max_concurrency,
+            "queueDepth": {
+                PRIORITY_NAMES[priority]: len(queue)
+                for priority, queue in self._queues.items()
+            },
+            "activeByEndpoint":
+                dict(self._active_by_endpoint),
+            "syncActive":
+                self._sync_active,
+            "syncWaiting":
+                self._sync_waiting,
+            "grantedCalls":
+                self.granted_calls,
+            "rateLimitedCalls":
+                self.rate_limited_calls,
+            "averageWaitMs":
+                round(
+                    self.total_wait_ms
+                    / self.granted_calls,
+                    2,
+                )
+                if self.granted_calls
+                else 0.0,
+            "maxWaitMs":
+                round(self.max_wait_ms, 2),
+            "backoffRemainingSeconds":
+                round(
+                    max(
+                        0.0,
+                        self._backoff_until
+                        - time.monotonic(),
+                    ),
+                    2,
+                ),
+        }
+
+    async def _acquire(
+        self,
+        endpoint: str,
+    ) -> float:
+        self._loop = asyncio.get_running_loop()
+
+        waiter = _Waiter(
+            endpoint,
+            self._loop.create_future(),
+        )
+
+        self._queues[
+            ENDPOINT_PRIORITIES.get(
+                endpoint,
+                PRIORITY_STANDARD,
+            )
+        ].append(waiter)
+
+        self._dispatch()
+
+        try:
+            await waiter.future
+
+        except asyncio.CancelledError:
+            if (
+                waiter.future.done()
+                and not waiter.future.cancelled()
+            ):
+                # A vaga foi concedida junto com o cancelamento.
+                self._release(endpoint)
+
+            else:
+                self._remove(waiter)
+
+            raise
+
+        wait_ms = (
+            time.perf_counter()
+            - waiter.enqueued_at
+        ) * 1000
+
+        self.granted_calls += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(
+            self.max_wait_ms,
+            wait_ms,
+        )
+
+        return wait_ms
+
+    def _release(
+        self,
+        endpoint: str,
+    ) -> None:
+        self._active -= 1
+        self._active_by_endpoint[endpoint] -= 1
+
+        if not self._active_by_endpoint[endpoint]:
+            self._active_by_endpoint.pop(endpoint)
+
+        self._dispatch()
+
+        with self._sync_condition:
+            self._sync_condition.notify_all()
+
+    def _acquire_sync(
+        self,
+        endpoint: str,
+    ) -> float:
+        enqueued_at = time.perf_counter()
+
+        priority = ENDPOINT_PRIORITIES.get(
+            endpoint,
+            PRIORITY_STANDARD,
+        )
+
+        with self._sync_condition:
+            self._sync_waiting += 1
+
+            try:
+                while True:
+                    remaining_backoff = (
+                        self._backoff_until
+                        - time.monotonic()
+                    )
+
+                    if (
+                        remaining_backoff <= 0
+                        and self._has_sync_capacity(
+                            endpoint,
+                            priority,
+                        )
+                    ):
+                        break
+
+                    self._sync_condition.wait(
+                        timeout=max(
+                            remaining_backoff,
+                            LLM_SYNC_POLL_SECONDS,
+                        )
+                    )
+
+            finally:
+                self._sync_waiting -= 1
+
+            self._sync_active += 1
+            self._sync_active_by_endpoint[endpoint] = (
+                self._sync_active_by_endpoint.get(
+                    endpoint,
+                    0,
+                )
+                + 1
+            )
+
+        wait_ms = (
+            time.perf_counter()
+            - enqueued_at
+        ) * 1000
+
+        self.granted_calls += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(
+            self.max_wait_ms,
+            wait_ms,
+        )
+
+        return wait_ms
+
+    def _release_sync(
+        self,
+        endpoint: str,
+    ) -> None:
+        with self._sync_condition:
+            self._sync_active -= 1
+            self._sync_active_by_endpoint[endpoint] -= 1
+
+            if not self._sync_active_by_endpoint[endpoint]:
+                self._sync_active_by_endpoint.pop(endpoint)
+
+        self._wake()
+
+    def _has_sync_capacity(
+        self,
+        endpoint: str,
+        priority: int,
+    ) -> bool:
+        if (
+            self._active + self._sync_active
+            >= self.current_limit
+        ):
+            return False
+
+        endpoint_limit = self.endpoint_limits.get(
+            endpoint
+        )
+
+        if (
+            endpoint_limit is not None
+            and self._count_endpoint_active(endpoint)
+            >= endpoint_limit
+        ):
+            return False
+
+        # Chamadas assíncronas mais prioritárias
+        # na fila passam na frente.
+        return not any(
+            self._queues[queued_priority]
+            for queued_priority in self._queues
+            if queued_priority < priority
+        )
+
+    def _count_endpoint_active(
+        self,
+        endpoint: str,
+    ) -> int:
+        return (
+            self._active_by_endpoint.get(endpoint, 0)
+            + self._sync_active_by_endpoint.get(endpoint, 0)
+        )
+
+    def _wake(self) -> None:
+        # Pode rodar fora do event loop: o dispatch
+        # assíncrono é agendado no loop dono da fila.
+        with self._sync_condition:
+            self._sync_condition.notify_all()
+
+        loop = self._loop
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(
+                self._dispatch
+            )
+
+    def _remove(
+        self,
+        waiter: _Waiter,
+    ) -> None:
+        for queue in self._queues.values():
+            if waiter in queue:
+                queue.remove(waiter)
+
+                return
+
+    def _dispatch(self) -> None:
+        remaining_backoff = (
+            self._backoff_until
+            - time.monotonic()
+        )
+
+        if remaining_backoff > 0:
+            self._schedule_dispatch(
+                remaining_backoff
+            )
+
+            return
+
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+
+            # Um endpoint no limite não bloqueia
+            # os outros da mesma prioridade.
+            for waiter in list(queue):
+                if (
+                    self._active + self._sync_active
+                    >= self.current_limit
+                ):
+                    return
+
+                if waiter.future.done():
+                    queue.remove(waiter)
+
+                    continue
+
+                endpoint_limit = self.endpoint_limits.get(
+                    waiter.endpoint
+                )
+
+                if (
+                    endpoint_limit is not None
+                    and self._count_endpoint_active(
+                        waiter.endpoint
+                    )
+                    >= endpoint_limit
+                ):
+                    continue
+
+                queue.remove(waiter)
+
+                self._active += 1
+                self._active_by_endpoint[waiter.endpoint] = (
+                    self._active_by_endpoint.get(
+                        waiter.endpoint,
+                        0,
+                    )
+                    + 1
+                )
+
+                waiter.future.set_result(None)
+
+    def _schedule_dispatch(
+        self,
+        delay: float,
+    ) -> None:
+        if (
+            self._dispatch_handle is not None
+            and not self._dispatch_handle.cancelled()
+            and self._dispatch_handle.when()
+            > asyncio.get_running_loop().time()
+        ):
+            return
+
+        self._dispatch_handle = (
+            asyncio.get_running_loop()
+            .call_later(
+                delay,
+                self._dispatch,
+            )
+        )
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    endpoint_limits=parse_endpoint_limits(
+        LLM_ENDPOINT_CONCURRENCY
+    ),
+)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import asyncio
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+)
+
+from app.observability import logger
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        name: str,
+    ):
+        self.name = name
+
+        self.leader_calls = 0
+        self.coalesced_calls = 0
+
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        task = self._in_flight.get(
+            key
+        )
+
+        if task is None:
+            self.leader_calls += 1
+
+            # A chamada roda numa task própria para que o
+            # cancelamento de um cliente não cancele a chamada
+            # que os outros também estão aguardando.
+            task = asyncio.ensure_future(
+                factory()
+            )
+
+            self._in_flight[key] = task
+
+            task.add_done_callback(
+                lambda finished_task: self._finish(
+                    key,
+                    finished_task,
+                )
+            )
+
+        else:
+            self.coalesced_calls += 1
+
+            logger.info(
+                "llm call coalesced with in-flight request",
+                extra={
+                    "event":
+                        "llm_call_coalesced",
+                    "singleFlight":
+                        self.name,
+                    "leaderCalls":
+                        self.leader_calls,
+                    "coalescedCalls":
+                        self.coalesced_calls,
+                },
+            )
+
+        return await asyncio.shield(
+            task
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leader_calls":
+                self.leader_calls,
+            "coalesced_calls":
+                self.coalesced_calls,
+            "in_flight":
+                len(self._in_flight),
+        }
+
+    def _finish(
+        self,
+        key: str,
+        task: asyncio.Task,
+    ) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Evita o aviso de exceção não lida quando todos
+        # os clientes que aguardavam foram cancelados.
+        if not task.cancelled():
+            task.exception()
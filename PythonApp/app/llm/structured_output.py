@@ -0,0 +1,464 @@
+import json
+import os
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Type
+
+from openai import BadRequestError
+from pydantic import BaseModel, ValidationError
+
+from app.llm.gateway import (
+    create_chat_completion,
+    stream_chat_completion,
+)
+from app.llm.resilience import select_model
+from app.observability import logger
+
+
+# MARK: - Configuration
+
+
+# "json_schema" pede saída validada pelo schema do response model.
+# "json_object" só garante um objeto JSON.
+# "off" mantém apenas as instruções do prompt.
+LLM_STRUCTURED_OUTPUT = os.getenv(
+    "LLM_STRUCTURED_OUTPUT",
+    "json_schema",
+).strip().lower()
+
+# Modelos que recusaram response_format; seguem só com o prompt.
+# A chave é o modelo enviado, que pode ser o reserva.
+_unsupported_models: Set[str] = set()
+
+
+# MARK: - Schema
+
+
+def build_strict_schema(
+    response_model: Type[BaseModel],
+) -> Dict[str, Any]:
+    return _make_strict(
+        response_model.model_json_schema()
+    )
+
+
+def _make_strict(
+    node: Any,
+) -> Any:
+    if isinstance(node, list):
+        return [
+            _make_strict(item)
+            for item in node
+        ]
+
+    if not isinstance(node, dict):
+        return node
+
+    strict: Dict[str, Any] = {}
+
+    for key, value in node.items():
+        # O modo strict não aceita "default", e "title"
+        # só aumenta o prompt.
+        if key in ("title", "default"):
+            continue
+
+        if key in ("properties", "$defs"):
+            strict[key] = {
+                name: _make_strict(schema)
+                for name, schema in value.items()
+            }
+
+        else:
+            strict[key] = _make_strict(value)
+
+    if strict.get("type") == "object":
+        strict["additionalProperties"] = False
+        strict["required"] = list(
+            strict.get("properties", {})
+        )
+
+    return strict
+
+
+def build_response_format(
+    model: str,
+    name: str,
+    schema: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    if model in _unsupported_models or LLM_STRUCTURED_OUTPUT == "off":
+        return None
+
+    if LLM_STRUCTURED_OUTPUT == "json_object":
+        return {
+            "type": "json_object",
+        }
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": schema,
+        },
+    }
+
+
+def _select_fields(
+    schema: Dict[str, Any],
+    fields: List[str],
+) -> Dict[str, Any]:
+    return {
+        **schema,
+        "properties": {
+            field: schema["properties"][field]
+            for field in fields
+        },
+        "required": fields,
+    }
+
+
+def _is_response_format_error(
+    error: BadRequestError,
+) -> bool:
+    return "response_format" in str(error)
+
+
+def _mark_unsupported(
+    endpoint: str,
+    model: str,
+) -> None:
+    _unsupported_models.add(model)
+
+    logger.warning(
+        "model does not support structured output",
+        extra={
+            "event":
+                "llm_structured_output_unsupported",
+            "endpoint":
+                endpoint,
+            "model":
+                model,
+        },
+    )
+
+
+# MARK: - Parsing
+
+
+def parse_json_object(
+    content: str,
+) -> Dict[str, Any]:
+    if not content or not content.strip():
+        raise ValueError(
+            "A OpenAI retornou uma resposta vazia."
+        )
+
+    try:
+        parsed = json.loads(content)
+
+    except json.JSONDecodeError:
+        # Sem response_format o modelo ainda pode cercar
+        # o JSON com markdown ou texto.
+        start_index = content.find("{")
+        end_index = content.rfind("}")
+
+        if start_index == -1 or end_index == -1:
+            raise ValueError(
+                "A OpenAI não retornou um JSON válido."
+            )
+
+        try:
+            parsed = json.loads(
+                content[start_index:end_index + 1]
+            )
+
+        except json.JSONDecodeError as error:
+            raise ValueError(
+                "JSON inválido retornado pela OpenAI: {}".format(
+                    error.msg
+                )
+            ) from error
+
+    if not isinstance(parsed, dict):
+        raise ValueError(
+            "A OpenAI não retornou um objeto JSON."
+        )
+
+    return parsed
+
+
+def find_invalid_fields(
+    data: Dict[str, Any],
+    response_model: Type[BaseModel],
+) -> List[str]:
+    try:
+        response_model.model_validate(data)
+
+    except ValidationError as error:
+        return sorted(
+            {
+                str(detail["loc"][0])
+                for detail in error.errors()
+                if detail["loc"]
+                and detail["loc"][0] in response_model.model_fields
+            }
+        )
+
+    return []
+
+
+# MARK: - Completions
+
+
+async def create_structured_completion(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    name: str,
+    response_model: Type[BaseModel],
+    **options: Any,
+) -> Dict[str, Any]:
+    schema = build_strict_schema(response_model)
+
+    # O modelo é escolhido uma vez aqui: o formato e o
+    # reparo seguem o que o modelo enviado suporta.
+    model = select_model(
+        endpoint,
+        model,
+    )
+
+    content = await _complete(
+        endpoint=endpoint,
+        model=model,
+        messages=messages,
+        response_format=build_response_format(
+            model,
+            name,
+            schema,
+        ),
+        **options,
+    )
+
+    return await validate_structured_output(
+        endpoint=endpoint,
+        model=model,
+        messages=messages,
+        content=content,
+        name=name,
+        response_model=response_model,
+        schema=schema,
+        route_model=False,
+        **options,
+    )
+
+
+async def stream_structured_completion(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    name: str,
+    response_model: Type[BaseModel],
+    **options: Any,
+) -> AsyncIterator[str]:
+    model = select_model(
+        endpoint,
+        model,
+    )
+
+    response_format = build_response_format(
+        model,
+        name,
+        build_strict_schema(response_model),
+    )
+
+    try:
+        async for token in stream_chat_completion(
+            endpoint=endpoint,
+            model=model,
+            messages=messages,
+            route_model=False,
+            **_with_response_format(
+                options,
+                response_format,
+            ),
+        ):
+            yield token
+
+        return
+
+    except BadRequestError as error:
+        # O erro chega antes do primeiro token.
+        if response_format is None or not _is_response_format_error(error):
+            raise
+
+        _mark_unsupported(
+            endpoint,
+            model,
+        )
+
+    async for token in stream_chat_completion(
+        endpoint=endpoint,
+        model=model,
+        messages=messages,
+        route_model=False,
+        **options,
+    ):
+        yield token
+
+
+async def validate_structured_output(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    content: str,
+    name: str,
+    response_model: Type[BaseModel],
+    schema: Optional[Dict[str, Any]] = None,
+    route_model: bool = True,
+    **options: Any,
+) -> Dict[str, Any]:
+    schema = schema or build_strict_schema(response_model)
+
+    data = parse_json_object(content)
+
+    invalid_fields = find_invalid_fields(
+        data,
+        response_model,
+    )
+
+    if not invalid_fields:
+        return response_model.model_validate(
+            data
+        ).model_dump()
+
+    # Só os campos com problema são pedidos de novo,
+    # sem refazer a resposta inteira.
+    logger.info(
+        "structured output repair requested",
+        extra={
+            "event":
+                "llm_structured_output_repair",
+            "endpoint":
+                endpoint,
+            "invalidFields":
+                invalid_fields,
+        },
+    )
+
+    # Chamado de fora (ex.: stream do plano de estudos),
+    # o reparo ainda passa pelo circuit breaker.
+    if route_model:
+        model = select_model(
+            endpoint,
+            model,
+        )
+
+    repair_content = await _complete(
+        endpoint=endpoint,
+        model=model,
+        messages=[
+            *messages,
+            {
+                "role": "assistant",
+                "content": content,
+            },
+            {
+                "role": "user",
+                "content": (
+                    "Os campos a seguir estão ausentes ou inválidos: "
+                    f"{', '.join(invalid_fields)}. "
+                    "Retorne somente um objeto JSON com esses campos "
+                    "corrigidos, no mesmo formato pedido."
+                ),
+            },
+        ],
+        response_format=build_response_format(
+            model,
+            f"{name}_repair",
+            _select_fields(
+                schema,
+                invalid_fields,
+            ),
+        ),
+        **options,
+    )
+
+    repaired = parse_json_object(repair_content)
+
+    data.update(
+        {
+            field: repaired[field]
+            for field in invalid_fields
+            if field in repaired
+        }
+    )
+
+    try:
+        return response_model.model_validate(
+            data
+        ).model_dump()
+
+    except ValidationError as error:
+        raise ValueError(
+            "A resposta da OpenAI não segue o formato esperado."
+        ) from error
+
+
+async def _complete(
+    *,
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    response_format: Optional[Dict[str, Any]],
+    **options: Any,
+) -> str:
+    try:
+        response = await create_chat_completion(
+            endpoint=endpoint,
+            model=model,
+            messages=messages,
+            route_model=False,
+            **_with_response_format(
+                options,
+                response_format,
+            ),
+        )
+
+    except BadRequestError as error:
+        if response_format is None or not _is_response_format_error(error):
+            raise
+
+        _mark_unsupported(
+            endpoint,
+            model,
+        )
+
+        response = await create_chat_completion(
+            endpoint=endpoint,
+            model=model,
+            messages=messages,
+            route_model=False,
+            **options,
+        )
+
+    if not response.choices:
+        raise ValueError(
+            "A OpenAI não retornou uma resposta."
+        )
+
+    return response.choices[0].message.content or ""
+
+
+def _with_response_format(
+    options: Dict[str, Any],
+    response_format: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    if response_format is None:
+        return options
+
+    return {
+        **options,
+        "response_format": response_format,
+    }
\ No newline at end of file
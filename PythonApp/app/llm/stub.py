@@ -0,0 +1,891 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from dotenv import load_dotenv
+
+from app.llm.prompt_budget import estimate_tokens
+from app.observability import logger
+
+
+load_dotenv()
+
+
+# MARK: - Configuration
+
+
+# "" usa a OpenAI normalmente.
+# "synthetic" responde com conteúdo gerado localmente.
+# "replay" devolve respostas gravadas (e sintetiza as que faltarem).
+# "record" chama a OpenAI e grava cada resposta para o replay.
+LLM_STUB_MODE = os.getenv(
+    "LLM_STUB_MODE",
+    "",
+).strip().lower()
+
+LLM_STUB_RECORDINGS_DIR = Path(
+    os.getenv(
+        "LLM_STUB_RECORDINGS_DIR",
+        "llm_recordings",
+    )
+)
+
+# Latência no formato "p50:p95", em milissegundos.
+LLM_STUB_LATENCY_MS = os.getenv(
+    "LLM_STUB_LATENCY_MS",
+    "800:2500",
+)
+
+# Formato: "simulation_transcription=1500:4000,study_plan=3000:8000"
+LLM_STUB_ENDPOINT_LATENCY_MS = os.getenv(
+    "LLM_STUB_ENDPOINT_LATENCY_MS",
+    "",
+)
+
+LLM_STUB_ERROR_RATE = float(
+    os.getenv(
+        "LLM_STUB_ERROR_RATE",
+        "0",
+    )
+)
+
+LLM_STUB_RATE_LIMIT_RATE = float(
+    os.getenv(
+        "LLM_STUB_RATE_LIMIT_RATE",
+        "0",
+    )
+)
+
+# Mesma semente, mesma sequência de latências e erros.
+LLM_STUB_SEED = os.getenv(
+    "LLM_STUB_SEED",
+    "",
+)
+
+STUB_MODES = (
+    "synthetic",
+    "replay",
+    "record",
+)
+
+# Enviado pelo gateway para o stub saber qual
+# formato de resposta a rota espera.
+STUB_ENDPOINT_HEADER = "X-LLM-Endpoint"
+
+STREAM_CHUNK_CHARS = 24
+
+
+def is_stub_enabled() -> bool:
+    return LLM_STUB_MODE in STUB_MODES
+
+
+def parse_latency(
+    raw_latency: str,
+) -> Optional[Tuple[float, float]]:
+    p50, _, p95 = raw_latency.partition(":")
+
+    try:
+        p50_ms = float(p50)
+        p95_ms = float(p95 or p50)
+
+    except ValueError:
+        return None
+
+    return (
+        max(0.0, p50_ms),
+        max(p50_ms, p95_ms),
+    )
+
+
+def parse_endpoint_latencies(
+    raw_latencies: str,
+) -> Dict[str, Tuple[float, float]]:
+    latencies: Dict[str, Tuple[float, float]] = {}
+
+    for raw_latency in raw_latencies.split(","):
+        endpoint, _, value = (
+            raw_latency.partition("=")
+        )
+
+        latency = parse_latency(value)
+
+        if endpoint.strip() and latency is not None:
+            latencies[endpoint.strip()] = latency
+
+    return latencies
+
+
+DEFAULT_LATENCY = (
+    parse_latency(LLM_STUB_LATENCY_MS)
+    or (800.0, 2500.0)
+)
+
+ENDPOINT_LATENCIES = parse_endpoint_latencies(
+    LLM_STUB_ENDPOINT_LATENCY_MS
+)
+
+
+# MARK: - Stub
+
+
+class LLMStub:
+    def __init__(self):
+        self._rng = random.Random(
+            LLM_STUB_SEED or None
+        )
+        self._ids = itertools.count(1)
+
+    def sample_latency_seconds(
+        self,
+        endpoint: str,
+    ) -> float:
+        p50_ms, p95_ms = ENDPOINT_LATENCIES.get(
+            endpoint,
+            DEFAULT_LATENCY,
+        )
+
+        if p50_ms <= 0:
+            return 0.0
+
+        # Log-normal ajustada pela mediana e pelo p95:
+        # a maioria das chamadas é rápida, com cauda longa.
+        sigma = math.log(p95_ms / p50_ms) / 1.645
+
+        return self._rng.lognormvariate(
+            math.log(p50_ms),
+            sigma,
+        ) / 1000
+
+    def sample_failure(
+        self,
+    ) -> Optional[httpx.Response]:
+        draw = self._rng.random()
+
+        if draw < LLM_STUB_RATE_LIMIT_RATE:
+            return _build_error_response(
+                429,
+                "rate_limit_exceeded",
+                "Rate limit reached (stub).",
+                headers={
+                    "retry-after": "1",
+                },
+            )
+
+        if draw < LLM_STUB_RATE_LIMIT_RATE + LLM_STUB_ERROR_RATE:
+            return _build_error_response(
+                500,
+                "server_error",
+                "The server had an error (stub).",
+            )
+
+        return None
+
+    def respond(
+        self,
+        request: httpx.Request,
+        endpoint: str,
+        key: str,
+    ) -> httpx.Response:
+        failure = self.sample_failure()
+
+        if failure is not None:
+            return failure
+
+        if LLM_STUB_MODE == "replay":
+            recording = load_recording(key)
+
+            if recording is not None:
+                return recording
+
+            logger.warning(
+                "llm stub recording not found",
+                extra={
+                    "event":
+                        "llm_stub_replay_miss",
+                    "endpoint":
+                        endpoint,
+                    "recordingKey":
+                        key,
+                },
+            )
+
+        return self.synthesize(
+            request,
+            endpoint,
+            key,
+        )
+
+    def synthesize(
+        self,
+        request: httpx.Request,
+        endpoint: str,
+        key: str,
+    ) -> httpx.Response:
+        if request.url.path.endswith("/audio/transcriptions"):
+            return httpx.Response(
+                200,
+                json={
+                    "text": SYNTHETIC_TRANSCRIPT,
+                },
+            )
+
+        payload = json.loads(
+            request.content or b"{}"
+        )
+
+        prompt = "\n".join(
+            str(message.get("content") or "")
+            for message in payload.get("messages", [])
+        )
+
+        # O conteúdo depende só da requisição; latência e
+        # erros seguem a sequência da semente.
+        content_rng = random.Random(key)
+
+        content = build_synthetic_content(
+            endpoint,
+            prompt,
+            content_rng,
+        )
+
+        usage = {
+            "prompt_tokens":
+                estimate_tokens(prompt),
+            "completion_tokens":
+                estimate_tokens(content),
+        }
+
+        usage["total_tokens"] = (
+            usage["prompt_tokens"]
+            + usage["completion_tokens"]
+        )
+
+        completion_id = f"chatcmpl-stub-{next(self._ids)}"
+        model = payload.get("model", "stub")
+
+        if payload.get("stream"):
+            return httpx.Response(
+                200,
+                headers={
+                    "content-type": "text/event-stream",
+                },
+                content=_build_stream_body(
+                    completion_id,
+                    model,
+                    content,
+                    usage
+                    if (
+                        payload.get("stream_options")
+                        or {}
+                    ).get("include_usage")
+                    else None,
+                ),
+            )
+
+        return httpx.Response(
+            200,
+            json={
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": content,
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+
+# MARK: - Recordings
+
+
+def build_request_key(
+    request: httpx.Request,
+) -> str:
+    body = request.content or b""
+
+    content_type = request.headers.get(
+        "content-type",
+        "",
+    )
+
+    if content_type.startswith("application/json"):
+        body = json.dumps(
+            json.loads(body or b"{}"),
+            sort_keys=True,
+        ).encode("utf-8")
+
+    # O boundary do multipart muda a cada envio de áudio.
+    _, _, boundary = content_type.partition("boundary=")
+
+    if boundary:
+        body = body.replace(
+            boundary.encode("utf-8"),
+            b"",
+        )
+
+    return hashlib.sha256(
+        request.url.path.encode("utf-8")
+        + b"\n"
+        + body
+    ).hexdigest()
+
+
+def load_recording(
+    key: str,
+) -> Optional[httpx.Response]:
+    path = LLM_STUB_RECORDINGS_DIR / f"{key}.json"
+
+    if not path.exists():
+        return None
+
+    recording = json.loads(
+        path.read_text(encoding="utf-8")
+    )
+
+    return httpx.Response(
+        recording["status"],
+        headers={
+            "content-type": recording["contentType"],
+        },
+        content=recording["body"].encode("utf-8"),
+    )
+
+
+def save_recording(
+    key: str,
+    endpoint: str,
+    response: httpx.Response,
+    body: bytes,
+) -> None:
+    LLM_STUB_RECORDINGS_DIR.mkdir(
+        parents=True,
+        exist_ok=True,
+    )
+
+    (LLM_STUB_RECORDINGS_DIR / f"{key}.json").write_text(
+        json.dumps(
+            {
+                "endpoint": endpoint,
+                "status": response.status_code,
+                "contentType": response.headers.get(
+                    "content-type",
+                    "application/json",
+                ),
+                "body": body.decode(
+                    "utf-8",
+                    errors="replace",
+                ),
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+
+def _recorded_response(
+    response: httpx.Response,
+    body: bytes,
+) -> httpx.Response:
+    # O corpo já foi descompactado; os headers de
+    # encoding e tamanho não valem mais.
+    return httpx.Response(
+        response.status_code,
+        headers={
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in (
+                "content-encoding",
+                "content-length",
+                "transfer-encoding",
+            )
+        },
+        content=body,
+    )
+
+
+# MARK: - Transports
+
+
+class AsyncStubTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        stub: LLMStub,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.stub = stub
+        self.transport = transport
+
+    async def handle_async_request(
+        self,
+        request: httpx.Request,
+    ) -> httpx.Response:
+        await request.aread()
+
+        endpoint = request.headers.get(
+            STUB_ENDPOINT_HEADER,
+            "unknown",
+        )
+
+        key = build_request_key(request)
+
+        if LLM_STUB_MODE == "record":
+            response = await self.transport.handle_async_request(
+                request
+            )
+
+            try:
+                body = await response.aread()
+
+            finally:
+                await response.aclose()
+
+            if response.status_code == 200:
+                await asyncio.to_thread(
+                    save_recording,
+                    key,
+                    endpoint,
+                    response,
+                    body,
+                )
+
+            return _recorded_response(
+                response,
+                body,
+            )
+
+        await asyncio.sleep(
+            self.stub.sample_latency_seconds(
+                endpoint
+            )
+        )
+
+        return self.stub.respond(
+            request,
+            endpoint,
+            key,
+        )
+
+    async def aclose(self) -> None:
+        if self.transport is not None:
+            await self.transport.aclose()
+
+
+class StubTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        stub: LLMStub,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.stub = stub
+        self.transport = transport
+
+    def handle_request(
+        self,
+        request: httpx.Request,
+    ) -> httpx.Response:
+        request.read()
+
+        endpoint = request.headers.get(
+            STUB_ENDPOINT_HEADER,
+            "unknown",
+        )
+
+        key = build_request_key(request)
+
+        if LLM_STUB_MODE == "record":
+            response = self.transport.handle_request(
+                request
+            )
+
+            try:
+                body = response.read()
+
+            finally:
+                response.close()
+
+            if response.status_code == 200:
+                save_recording(
+                    key,
+                    endpoint,
+                    response,
+                    body,
+                )
+
+            return _recorded_response(
+                response,
+                body,
+            )
+
+        time.sleep(
+            self.stub.sample_latency_seconds(
+                endpoint
+            )
+        )
+
+        return self.stub.respond(
+            request,
+            endpoint,
+            key,
+        )
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+
+_stub = LLMStub()
+
+
+def build_async_stub_transport(
+    limits: httpx.Limits,
+) -> Optional[httpx.AsyncBaseTransport]:
+    if not is_stub_enabled():
+        return None
+
+    logger.warning(
+        "llm stub transport enabled",
+        extra={
+            "event":
+                "llm_stub_enabled",
+            "mode":
+                LLM_STUB_MODE,
+        },
+    )
+
+    return AsyncStubTransport(
+        _stub,
+        httpx.AsyncHTTPTransport(limits=limits)
+        if LLM_STUB_MODE == "record"
+        else None,
+    )
+
+
+def build_sync_stub_transport(
+    limits: httpx.Limits,
+) -> Optional[httpx.BaseTransport]:
+    if not is_stub_enabled():
+        return None
+
+    logger.warning(
+        "llm stub transport enabled",
+        extra={
+            "event":
+                "llm_stub_enabled",
+            "mode":
+                LLM_STUB_MODE,
+        },
+    )
+
+    return StubTransport(
+        _stub,
+        httpx.HTTPTransport(limits=limits)
+        if LLM_STUB_MODE == "record"
+        else None,
+    )
+
+
+def _build_error_response(
+    status_code: int,
+    code: str,
+    message: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    return httpx.Response(
+        status_code,
+        headers=headers,
+        json={
+            "error": {
+                "message": message,
+                "type": code,
+                "code": code,
+            },
+        },
+    )
+
+
+def _build_stream_body(
+    completion_id: str,
+    model: str,
+    content: str,
+    usage: Optional[Dict[str, int]],
+) -> bytes:
+    created = int(time.time())
+
+    chunks: List[Dict[str, Any]] = [
+        {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {
+                        "content": content[
+                            start:start + STREAM_CHUNK_CHARS
+                        ],
+                    },
+                    "finish_reason": None,
+                }
+            ],
+        }
+        for start in range(
+            0,
+            len(content),
+            STREAM_CHUNK_CHARS,
+        )
+    ]
+
+    if usage is not None:
+        # Igual à OpenAI: o último chunk vem sem choices.
+        chunks.append(
+            {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            }
+        )
+
+    return (
+        "".join(
+            f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            for chunk in chunks
+        )
+        + "data: [DONE]\n\n"
+    ).encode("utf-8")
+
+
+# MARK: - Synthetic Content
+
+
+SYNTHETIC_TRANSCRIPT = (
+    "Na minha última experiência eu fui responsável por "
+    "migrar um serviço monolítico para uma arquitetura "
+    "baseada em filas, o que reduziu o tempo de resposta "
+    "da API em cerca de quarenta por cento."
+)
+
+SYNTHETIC_TOPICS = [
+    "Fundamentos da linguagem",
+    "Estruturas de dados",
+    "Bancos de dados relacionais",
+    "APIs REST",
+    "Testes automatizados",
+    "Arquitetura de sistemas",
+    "Observabilidade",
+    "Segurança de aplicações",
+]
+
+SYNTHETIC_QUESTIONS = [
+    "Como você projetaria uma API com alta disponibilidade?",
+    "Explique a diferença entre processos e threads.",
+    "Como você lida com migrações de banco em produção?",
+    "Conte sobre um incidente que você ajudou a resolver.",
+    "Quando vale a pena usar cache e como invalidá-lo?",
+    "Como você organiza testes em um projeto grande?",
+    "Que métricas você acompanha em um serviço em produção?",
+    "Como você revisaria o código de uma pessoa júnior?",
+    "Explique como funciona um índice em um banco relacional.",
+    "Como você evitaria condições de corrida em um worker?",
+]
+
+QUESTION_ENDPOINTS = {
+    "generate_interview_questions",
+    "simulation_questions",
+    "question_bank_refill",
+}
+
+EVALUATION_ENDPOINTS = {
+    "simulation_evaluation",
+    "simulation_answer_evaluation",
+}
+
+STUDY_PLAN_ENDPOINTS = {
+    "study_plan",
+    "study_plan_stream",
+}
+
+
+def build_synthetic_content(
+    endpoint: str,
+    prompt: str,
+    rng: random.Random,
+) -> str:
+    if endpoint in QUESTION_ENDPOINTS:
+        match = re.search(
+            r"exatamente (\d+) perguntas",
+            prompt,
+        )
+
+        question_count = (
+            int(match.group(1))
+            if match
+            else 5
+        )
+
+        return "\n".join(
+            f"{index}. {question}"
+            for index, question in enumerate(
+                rng.sample(
+                    SYNTHETIC_QUESTIONS,
+                    min(
+                        question_count,
+                        len(SYNTHETIC_QUESTIONS),
+                    ),
+                ),
+                start=1,
+            )
+        )
+
+    if endpoint in EVALUATION_ENDPOINTS:
+        scores = {
+            criterion: rng.randint(50, 95)
+            for criterion in (
+                "clarity",
+                "objectivity",
+                "examples",
+                "technical_knowledge",
+                "response_time",
+            )
+        }
+
+        return json.dumps(
+            {
+                **scores,
+                "overall": round(
+                    sum(scores.values())
+                    / len(scores)
+                ),
+                "summary": (
+                    "Respostas claras, com espaço para "
+                    "mais exemplos práticos."
+                ),
+                "strengths": [
+                    "Boa organização das ideias",
+                ],
+                "improvements": [
+                    "Trazer resultados mensuráveis",
+                ],
+            },
+            ensure_ascii=False,
+        )
+
+    if endpoint in STUDY_PLAN_ENDPOINTS:
+        topics = [
+            {
+                "title": title,
+                "description": (
+                    f"{title} aparecem com frequência "
+                    "em entrevistas técnicas."
+                ),
+                "priority": rng.choice(
+                    [
+                        "high",
+                        "medium",
+                        "low",
+                    ]
+                ),
+                "estimated_hours": rng.randint(2, 8),
+                "subtopics": [
+                    f"{title}: conceitos",
+                    f"{title}: prática",
+                ],
+                "practice": (
+                    f"Implemente um exemplo pequeno de {title.lower()}."
+                ),
+            }
+            for title in rng.sample(
+                SYNTHETIC_TOPICS,
+                5,
+            )
+        ]
+
+        return json.dumps(
+            {
+                "title": "Plano de estudos",
+                "summary": (
+                    "Plano focado nos temas mais "
+                    "cobrados para a vaga."
+                ),
+                "estimated_total_hours": sum(
+                    topic["estimated_hours"]
+                    for topic in topics
+                ),
+                "topics": topics,
+            },
+            ensure_ascii=False,
+        )
+
+    if endpoint == "resume_profile":
+        return json.dumps(
+            {
+                "summary": (
+                    "Pessoa desenvolvedora com experiência "
+                    "em backend e serviços web."
+                ),
+                "skills": rng.sample(
+                    [
+                        "Python",
+                        "FastAPI",
+                        "PostgreSQL",
+                        "Docker",
+                        "Redis",
+                        "Celery",
+                        "AWS",
+                        "Git",
+                    ],
+                    5,
+                ),
+                "experiences": [
+                    {
+                        "role": "Desenvolvedora Backend",
+                        "company": "Empresa Exemplo",
+                        "period": "2021 - atual",
+                        "highlights": [
+                            "Criou APIs usadas por milhares de clientes",
+                        ],
+                    }
+                ],
+                "education": [
+                    {
+                        "institution": "Universidade Exemplo",
+                        "degree": "Ciência da Computação",
+                        "period": "2016 - 2020",
+                    }
+                ],
+            },
+            ensure_ascii=False,
+        )
+
+    return (
+        "Pontos fortes:\n"
+        "- Experiências bem organizadas e fáceis de ler.\n\n"
+        "Sugestões:\n"
+        "- Inclua resultados mensuráveis em cada experiência.\n"
+        "- Destaque as palavras-chave da vaga no resumo.\n"
+        "- Padronize o formato das datas."
+    )
\ No newline at end of file
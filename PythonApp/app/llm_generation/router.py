@@ -2,29 +2,66 @@
 
 import asyncio
 import os
-import re
 import time
 
 from typing import Optional
+from uuid import UUID
 
 from dotenv import load_dotenv
 
 from fastapi import (
     APIRouter,
+    Depends,
     File,
     Form,
     HTTPException,
+    Query,
     UploadFile,
 )
+from fastapi.responses import (
+    StreamingResponse,
+)
 
-from openai import OpenAI
+from sqlalchemy.orm import Session
 
-from .services import (
-    extract_text_from_pdf,
+from .. import models
+
+from ..auth.dependencies import (
+    get_optional_current_user,
+)
+
+from ..database import get_db
+
+from ..llm.gateway import (
+    create_chat_completion,
+    stream_chat_completion,
 )
 
 from ..observability import logger
 
+from ..resumes.dependencies import (
+    get_owned_resume_profile,
+)
+
+from ..resumes.ingestion import (
+    ResumeIngestionError,
+    ingest_resume,
+    validate_resume_size,
+)
+
+from ..resumes.service import (
+    build_resume_profile_context,
+)
+
+from ..utils.blob_store import (
+    blob_store,
+)
+
+from ..utils.sse import (
+    SSE_HEADERS,
+    format_sse_event,
+)
+
 from ..worker.tasks import (
     process_resume_feedback,
 )
@@ -33,6 +70,19 @@ from ..worker.celery_app import (
     celery_app,
 )
 
+from ..worker.notifications import (
+    TASK_WAIT_MAX_SECONDS,
+    stream_task_completion,
+    wait_for_task,
+)
+
+from .services import (
+    build_prompt,
+    build_resume_feedback_messages,
+    build_resume_feedback_prompt,
+    parse_questions,
+)
+
 from .schemas import (
     SimulationEvaluationRequest,
     SimulationEvaluationResponse,
@@ -48,13 +98,6 @@ router = APIRouter(
 )
 
 
-client = OpenAI(
-    api_key=os.getenv(
-        "OPENAI_API_KEY"
-    )
-)
-
-
 OPENAI_MODEL = os.getenv(
     "OPENAI_INTERVIEW_MODEL",
     "gpt-4",
@@ -76,6 +119,13 @@ async def generate_questions(
     resume: Optional[UploadFile] = File(
         None
     ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -106,6 +156,10 @@ async def generate_questions(
                 ),
             "hasResume":
                 resume is not None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
         },
     )
 
@@ -130,8 +184,20 @@ async def generate_questions(
 
         resume_text = ""
 
+        # Currículo salvo: usa o perfil estruturado,
+        # sem reenviar nem reprocessar o PDF.
+        if resume_id is not None:
+            resume_text = build_resume_profile_context(
+                await asyncio.to_thread(
+                    get_owned_resume_profile,
+                    resume_id,
+                    current_user,
+                    db,
+                )
+            )
+
         # Currículo opcional.
-        if resume is not None:
+        elif resume is not None:
             try:
                 logger.info(
                     "resume received for interview question generation",
@@ -163,7 +229,7 @@ async def generate_questions(
 
                 if content:
                     resume_text = (
-                        extract_text_from_pdf(
+                        await read_resume_text(
                             content
                         )
                     )
@@ -209,9 +275,10 @@ async def generate_questions(
             time.perf_counter()
         )
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        response = await create_chat_completion(
+            endpoint="generate_interview_questions",
             model=OPENAI_MODEL,
+            coalesce=True,
             messages=[
                 {
                     "role":
@@ -380,108 +447,6 @@ async def generate_questions(
         ) from error
 
 
-# MARK: - Parse Questions
-
-
-def parse_questions(
-    content: str
-) -> list[str]:
-    questions: list[str] = []
-
-    for line in content.splitlines():
-        normalized_line = (
-            line.strip()
-        )
-
-        if not normalized_line:
-            continue
-
-        # Remove formatos:
-        #
-        # 1. Pergunta
-        # 1) Pergunta
-        # - Pergunta
-        # * Pergunta
-        # • Pergunta
-
-        normalized_line = re.sub(
-            r"^(?:\d+[\.\)]|[-*•])\s*",
-            "",
-            normalized_line,
-        ).strip()
-
-        if normalized_line:
-            questions.append(
-                normalized_line
-            )
-
-    parsed_questions = (
-        questions[:7]
-    )
-
-    logger.info(
-        "openai questions parsed",
-        extra={
-            "event":
-                "interview_questions_parsed",
-            "questionCount":
-                len(
-                    parsed_questions
-                ),
-        },
-    )
-
-    return parsed_questions
-
-
-# MARK: - Build Prompt
-
-
-def build_prompt(
-    resume_text: str,
-    job_title: str,
-    seniority: str,
-    description: str = "",
-) -> str:
-    context_parts = [
-        f"Cargo: {job_title}",
-        f"Senioridade: {seniority}",
-    ]
-
-    if description:
-        context_parts.append(
-            f"""
-Descrição da vaga:
-{description}
-""".strip()
-        )
-
-    if resume_text:
-        context_parts.append(
-            f"""
-Currículo da pessoa candidata:
-{resume_text}
-""".strip()
-        )
-
-    context = "\n\n".join(
-        context_parts
-    )
-
-    return f"""
-Com base nas informações abaixo, gere exatamente 5 perguntas técnicas para uma entrevista.
-
-{context}
-
-Regras:
-- As perguntas devem ser adequadas ao cargo e à senioridade.
-- Use a descrição da vaga quando ela estiver disponível.
-- Use o currículo quando ele estiver disponível.
-- Não inclua introduções, títulos ou explicações.
-- Retorne somente as perguntas, uma por linha.
-""".strip()
-
-
 # MARK: - Resume Feedback
 
 
@@ -489,7 +454,16 @@ Regras:
     "/resume-feedback/"
 )
 async def resume_feedback(
-    resume: UploadFile = File(...)
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -499,33 +473,22 @@ async def resume_feedback(
             "event":
                 "resume_feedback_started",
             "fileName":
-                resume.filename,
-            "contentType":
-                resume.content_type,
+                resume.filename
+                if resume
+                else None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
         },
     )
 
     try:
-        if (
-            resume.content_type
-            and resume.content_type
-            != "application/pdf"
-        ):
-            raise HTTPException(
-                status_code=422,
-                detail=(
-                    "O currículo deve "
-                    "ser enviado em "
-                    "formato PDF."
-                ),
-            )
-
-        content = await resume.read()
-
-        resume_text = (
-            extract_text_from_pdf(
-                content
-            )
+        resume_text = await load_feedback_resume_text(
+            resume=resume,
+            resume_id=resume_id,
+            current_user=current_user,
+            db=db,
         )
 
         logger.info(
@@ -540,20 +503,8 @@ async def resume_feedback(
             },
         )
 
-        prompt = (
-            "Você é um recrutador profissional "
-            "experiente. Analise o currículo abaixo "
-            "e forneça sugestões de melhorias "
-            "em relação a clareza, uso de palavras-chave "
-            "relevantes, formatação, impacto e boas práticas "
-            "para destacar o candidato:\n\n"
-            f"{resume_text}\n\n"
-            "Escreva um parecer estruturado com feedback "
-            "construtivo e sugestões específicas de melhoria. "
-            "Não escreva em markdown, entre asteriscos, "
-            "apenas numere e titule cada sessão de melhoria "
-            "sem nenhuma formatação. "
-            "Exemplo certo: 1. Resumo Pessoal:"
+        prompt = build_resume_feedback_prompt(
+            resume_text
         )
 
         logger.info(
@@ -572,25 +523,12 @@ async def resume_feedback(
             time.perf_counter()
         )
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        response = await create_chat_completion(
+            endpoint="resume_feedback",
             model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role":
-                        "system",
-                    "content": (
-                        "Você é um recrutador "
-                        "profissional experiente."
-                    ),
-                },
-                {
-                    "role":
-                        "user",
-                    "content":
-                        prompt,
-                },
-            ],
+            messages=build_resume_feedback_messages(
+                prompt
+            ),
             temperature=0.7,
         )
 
@@ -718,7 +656,277 @@ async def resume_feedback(
         ) from error
 
     finally:
-        await resume.close()
+        if resume is not None:
+            await resume.close()
+
+
+# MARK: - Resume Feedback Stream
+
+
+@router.post(
+    "/resume-feedback/stream"
+)
+async def resume_feedback_stream(
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
+):
+    started_at = time.perf_counter()
+
+    logger.info(
+        "resume feedback stream started",
+        extra={
+            "event":
+                "resume_feedback_stream_started",
+            "fileName":
+                resume.filename
+                if resume
+                else None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
+        },
+    )
+
+    # Validação e extração acontecem antes do stream,
+    # para que erros ainda voltem como respostas HTTP comuns.
+    try:
+        resume_text = await load_feedback_resume_text(
+            resume=resume,
+            resume_id=resume_id,
+            current_user=current_user,
+            db=db,
+        )
+
+    except HTTPException as error:
+        logger.info(
+            "resume feedback stream rejected",
+            extra={
+                "event":
+                    "resume_feedback_stream_rejected",
+                "statusCode":
+                    error.status_code,
+            },
+        )
+
+        raise
+
+    except Exception as error:
+        logger.exception(
+            "failed to read resume for feedback stream",
+            extra={
+                "event":
+                    "resume_feedback_stream_read_failed",
+            },
+        )
+
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                "Erro ao gerar "
+                "feedback de currículo"
+            ),
+        ) from error
+
+    finally:
+        if resume is not None:
+            await resume.close()
+
+    prompt = build_resume_feedback_prompt(
+        resume_text
+    )
+
+    async def event_stream():
+        feedback_parts: list[str] = []
+
+        first_token_ms = None
+
+        try:
+            async for token in stream_chat_completion(
+                endpoint="resume_feedback_stream",
+                model=OPENAI_MODEL,
+                messages=build_resume_feedback_messages(
+                    prompt
+                ),
+                temperature=0.7,
+            ):
+                if first_token_ms is None:
+                    first_token_ms = round(
+                        (
+                            time.perf_counter()
+                            - started_at
+                        )
+                        * 1000,
+                        2,
+                    )
+
+                feedback_parts.append(
+                    token
+                )
+
+                yield format_sse_event(
+                    "token",
+                    {
+                        "content":
+                            token
+                    },
+                )
+
+            feedback = (
+                "".join(
+                    feedback_parts
+                ).strip()
+            )
+
+            if not feedback:
+                yield format_sse_event(
+                    "error",
+                    {
+                        "detail": (
+                            "A inteligência artificial "
+                            "retornou um feedback vazio."
+                        )
+                    },
+                )
+
+                return
+
+            logger.info(
+                "resume feedback stream completed",
+                extra={
+                    "event":
+                        "resume_feedback_stream_completed",
+                    "feedbackLength":
+                        len(
+                            feedback
+                        ),
+                    "firstTokenMs":
+                        first_token_ms,
+                    "durationMs":
+                        round(
+                            (
+                                time.perf_counter()
+                                - started_at
+                            )
+                            * 1000,
+                            2,
+                        ),
+                },
+            )
+
+            yield format_sse_event(
+                "done",
+                {
+                    "feedback":
+                        feedback
+                },
+            )
+
+        except Exception:
+            logger.exception(
+                "failed to stream resume feedback",
+                extra={
+                    "event":
+                        "resume_feedback_stream_failed",
+                    "streamedLength":
+                        sum(
+                            len(part)
+                            for part in feedback_parts
+                        ),
+                },
+            )
+
+            yield format_sse_event(
+                "error",
+                {
+                    "detail": (
+                        "Erro ao gerar "
+                        "feedback de currículo"
+                    )
+                },
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# MARK: - Resume Text
+
+
+async def read_resume_text(
+    content: bytes,
+) -> str:
+    try:
+        resume_document = await ingest_resume(
+            content
+        )
+
+    except ResumeIngestionError as error:
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=error.detail,
+        ) from error
+
+    return resume_document.text
+
+
+async def load_feedback_resume_text(
+    resume: Optional[UploadFile],
+    resume_id: Optional[UUID],
+    current_user: Optional[models.User],
+    db: Session,
+) -> str:
+    # O feedback avalia o documento, então usa
+    # o texto completo guardado no perfil.
+    if resume_id is not None:
+        profile = await asyncio.to_thread(
+            get_owned_resume_profile,
+            resume_id,
+            current_user,
+            db,
+        )
+
+        return profile.resume_text
+
+    if resume is None:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "Envie um currículo "
+                "ou informe o resume_id."
+            ),
+        )
+
+    if (
+        resume.content_type
+        and resume.content_type
+        != "application/pdf"
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "O currículo deve "
+                "ser enviado em "
+                "formato PDF."
+            ),
+        )
+
+    content = await resume.read()
+
+    return await read_resume_text(
+        content
+    )
 
 
 # MARK: - Submit Async Feedback
@@ -728,7 +936,16 @@ async def resume_feedback(
     "/submit-feedback/"
 )
 async def submit_resume(
-    resume: UploadFile = File(...)
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -738,35 +955,93 @@ async def submit_resume(
             "event":
                 "resume_feedback_task_submission_started",
             "fileName":
-                resume.filename,
-            "contentType":
-                resume.content_type,
+                resume.filename
+                if resume
+                else None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
         },
     )
 
     try:
-        if (
-            resume.content_type
-            and resume.content_type
-            != "application/pdf"
-        ):
-            raise HTTPException(
-                status_code=422,
-                detail=(
-                    "O currículo deve "
-                    "ser enviado em "
-                    "formato PDF."
-                ),
+        content = b""
+
+        # Com resume_id o worker lê o texto do perfil salvo.
+        if resume_id is not None:
+            await asyncio.to_thread(
+                get_owned_resume_profile,
+                resume_id,
+                current_user,
+                db,
             )
 
-        content = await resume.read()
+            task = (
+                process_resume_feedback
+                .delay(
+                    resume_id=str(resume_id)
+                )
+            )
+
+        else:
+            if resume is None:
+                raise HTTPException(
+                    status_code=422,
+                    detail=(
+                        "Envie um currículo "
+                        "ou informe o resume_id."
+                    ),
+                )
+
+            if (
+                resume.content_type
+                and resume.content_type
+                != "application/pdf"
+            ):
+                raise HTTPException(
+                    status_code=422,
+                    detail=(
+                        "O currículo deve "
+                        "ser enviado em "
+                        "formato PDF."
+                    ),
+                )
+
+            content = await resume.read()
+
+            try:
+                validate_resume_size(
+                    content
+                )
 
-        task = (
-            process_resume_feedback
-            .delay(
-                content
+            except ResumeIngestionError as error:
+                raise HTTPException(
+                    status_code=error.status_code,
+                    detail=error.detail,
+                ) from error
+
+            # A fila recebe só a chave; o PDF fica no blob store
+            # até o worker terminar.
+            resume_blob_key = await asyncio.to_thread(
+                blob_store.put,
+                content,
             )
-        )
+
+            try:
+                task = (
+                    process_resume_feedback
+                    .delay(
+                        resume_blob_key=resume_blob_key
+                    )
+                )
+
+            except Exception:
+                blob_store.release(
+                    resume_blob_key
+                )
+
+                raise
 
         duration_ms = round(
             (
@@ -837,7 +1112,8 @@ async def submit_resume(
         ) from error
 
     finally:
-        await resume.close()
+        if resume is not None:
+            await resume.close()
 
 
 # MARK: - Feedback Status
@@ -982,4 +1258,100 @@ def get_result(
                 "Erro ao buscar "
                 "o resultado do feedback."
             ),
-        ) from error
\ No newline at end of file
+        ) from error
+
+
+# MARK: - Wait Feedback
+
+
+@router.get(
+    "/feedback-wait/{task_id}"
+)
+async def wait_feedback(
+    task_id: str,
+    timeout: float = Query(
+        default=25,
+        gt=0,
+        le=TASK_WAIT_MAX_SECONDS,
+    ),
+):
+    # Long-poll: responde assim que a task termina,
+    # ou com o status atual ao fim do timeout.
+    await wait_for_task(
+        task_id,
+        timeout,
+    )
+
+    return await asyncio.to_thread(
+        build_feedback_task_response,
+        task_id,
+    )
+
+
+@router.get(
+    "/feedback-events/{task_id}"
+)
+async def feedback_events(
+    task_id: str,
+):
+    def load_event():
+        response = build_feedback_task_response(
+            task_id
+        )
+
+        if "error" in response:
+            return "error", response
+
+        return "done", response
+
+    return StreamingResponse(
+        stream_task_completion(
+            task_id,
+            load_event,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def build_feedback_task_response(
+    task_id: str,
+) -> dict:
+    result = celery_app.AsyncResult(
+        task_id
+    )
+
+    if not result.ready():
+        return {
+            "status":
+                result.status,
+        }
+
+    if not result.successful():
+        logger.info(
+            "resume feedback task failed",
+            extra={
+                "event":
+                    "resume_feedback_task_failed",
+                "taskId":
+                    task_id,
+                "taskStatus":
+                    result.status,
+            },
+        )
+
+        return {
+            "status":
+                result.status,
+            "error": (
+                "Erro ao gerar "
+                "o feedback."
+            ),
+        }
+
+    return {
+        "status":
+            result.status,
+        "feedback":
+            result.get(),
+    }
\ No newline at end of file
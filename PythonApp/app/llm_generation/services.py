@@ -1,33 +1,167 @@
 # app/llm_generation/services.py
-from pypdf import PdfReader
-from io import BytesIO
-from typing import Optional # Importe Optional para o tipo description
-
-def extract_text_from_pdf(pdf_content: bytes) -> str:
-    """
-    Extrai texto de um conteúdo PDF em bytes.
-    """
-    reader = PdfReader(BytesIO(pdf_content))
-    text = ""
-    for page in reader.pages:
-        # Use .extract_text() para obter o texto de cada página
-        text += page.extract_text() or ""
-    return text
-
-def build_prompt(resume_text: str, job_title: str, seniority: str, description: Optional[str]) -> str:
-    """
-    Constrói o prompt para a geração de perguntas de entrevista.
-    """
-    prompt = (
-        f"Analise o currículo abaixo para a vaga de {job_title} ({seniority}).\n"
-        f"Gere 5 perguntas de entrevista técnicas e 3 comportamentais baseadas exclusivamente no currículo e na descrição da vaga (se houver).\n"
-        f"O currículo é o seguinte:\n{resume_text}\n"
+
+import re
+
+from ..llm.prompt_budget import (
+    fit_resume_to_budget,
+)
+
+from ..observability import logger
+
+
+# MARK: - Parse Questions
+
+
+def parse_questions(
+    content: str
+) -> list[str]:
+    questions: list[str] = []
+
+    for line in content.splitlines():
+        normalized_line = (
+            line.strip()
+        )
+
+        if not normalized_line:
+            continue
+
+        # Remove formatos:
+        #
+        # 1. Pergunta
+        # 1) Pergunta
+        # - Pergunta
+        # * Pergunta
+        # • Pergunta
+
+        normalized_line = re.sub(
+            r"^(?:\d+[\.\)]|[-*•])\s*",
+            "",
+            normalized_line,
+        ).strip()
+
+        if normalized_line:
+            questions.append(
+                normalized_line
+            )
+
+    parsed_questions = (
+        questions[:7]
+    )
+
+    logger.info(
+        "openai questions parsed",
+        extra={
+            "event":
+                "interview_questions_parsed",
+            "questionCount":
+                len(
+                    parsed_questions
+                ),
+        },
     )
+
+    return parsed_questions
+
+
+# MARK: - Build Prompt
+
+
+def build_prompt(
+    resume_text: str,
+    job_title: str,
+    seniority: str,
+    description: str = "",
+) -> str:
+    context_parts = [
+        f"Cargo: {job_title}",
+        f"Senioridade: {seniority}",
+    ]
+
     if description:
-        prompt += f"A descrição da vaga é:\n{description}\n"
-    prompt += "Liste as perguntas numericamente."
-    return prompt
+        context_parts.append(
+            f"""
+Descrição da vaga:
+{description}
+""".strip()
+        )
+
+    resume_text = fit_resume_to_budget(
+        resume_text,
+        endpoint="generate_interview_questions",
+        job_title=job_title,
+        description=description,
+    )
+
+    if resume_text:
+        context_parts.append(
+            f"""
+Currículo da pessoa candidata:
+{resume_text}
+""".strip()
+        )
+
+    context = "\n\n".join(
+        context_parts
+    )
+
+    return f"""
+Com base nas informações abaixo, gere exatamente 5 perguntas técnicas para uma entrevista.
+
+{context}
+
+Regras:
+- As perguntas devem ser adequadas ao cargo e à senioridade.
+- Use a descrição da vaga quando ela estiver disponível.
+- Use o currículo quando ele estiver disponível.
+- Não inclua introduções, títulos ou explicações.
+- Retorne somente as perguntas, uma por linha.
+""".strip()
+
+
+# MARK: - Resume Feedback Prompt
+
+
+def build_resume_feedback_prompt(
+    resume_text: str,
+) -> str:
+    resume_text = fit_resume_to_budget(
+        resume_text,
+        endpoint="resume_feedback",
+    )
+
+    return (
+        "Você é um recrutador profissional "
+        "experiente. Analise o currículo abaixo "
+        "e forneça sugestões de melhorias "
+        "em relação a clareza, uso de palavras-chave "
+        "relevantes, formatação, impacto e boas práticas "
+        "para destacar o candidato:\n\n"
+        f"{resume_text}\n\n"
+        "Escreva um parecer estruturado com feedback "
+        "construtivo e sugestões específicas de melhoria. "
+        "Não escreva em markdown, entre asteriscos, "
+        "apenas numere e titule cada sessão de melhoria "
+        "sem nenhuma formatação. "
+        "Exemplo certo: 1. Resumo Pessoal:"
+    )
+
 
-# O cliente OpenAI não é definido aqui neste arquivo de serviços,
-# ele será definido no router ou no worker que o utiliza diretamente.
-# Caso contrário, você pode ter importações circulares ou problemas de inicialização.
\ No newline at end of file
+def build_resume_feedback_messages(
+    prompt: str,
+) -> list[dict]:
+    return [
+        {
+            "role":
+                "system",
+            "content": (
+                "Você é um recrutador "
+                "profissional experiente."
+            ),
+        },
+        {
+            "role":
+                "user",
+            "content":
+                prompt,
+        },
+    ]
\ No newline at end of file
@@ -7,6 +7,9 @@ load_dotenv()
 from app import database
 import app.models
 import app.interview_simulation.models
+import app.resumes.models
+import app.metrics.models
+import app.ai_jobs.models
 import app.auth.models
 
 import time
@@ -31,6 +34,24 @@ from app.tutors.router import (
 from app.videos.router import (
     router as videos_router,
 )
+from app.resumes.router import (
+    router as resumes_router,
+)
+from app.metrics.router import (
+    router as metrics_router,
+)
+from app.ai_jobs.router import (
+    router as ai_jobs_router,
+)
+from app.auth.token_service import (
+    decode_access_token,
+)
+from app.llm.metrics import (
+    current_usage_user_id,
+)
+from app.metrics.service import (
+    schedule_llm_usage_flush,
+)
 
 from app.observability import (
     logger,
@@ -45,6 +66,27 @@ app = FastAPI(
     version="0.1.0",
 )
 
+def get_request_user_id(
+    request: Request,
+):
+    scheme, _, token = (
+        request.headers.get(
+            "Authorization",
+            "",
+        )
+        .partition(" ")
+    )
+
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return decode_access_token(
+            token
+        )
+    except Exception:
+        return None
+
 @app.middleware("http")
 async def observability_middleware(
     request: Request,
@@ -61,6 +103,13 @@ async def observability_middleware(
         time.perf_counter()
     )
 
+    # Atribui o consumo de LLM desta requisição ao usuário.
+    usage_token = current_usage_user_id.set(
+        get_request_user_id(
+            request
+        )
+    )
+
     try:
         response = await call_next(
             request
@@ -129,6 +178,13 @@ async def observability_middleware(
 
         raise
 
+    finally:
+        current_usage_user_id.reset(
+            usage_token
+        )
+
+        schedule_llm_usage_flush()
+
 app.include_router(auth_router)
 app.include_router(interviews_router)
 app.include_router(llm_router)
@@ -138,6 +194,9 @@ app.include_router(interview_simulation_router)
 app.include_router(dashboard_router)
 app.include_router(tutors_router)
 app.include_router(videos_router)
+app.include_router(resumes_router)
+app.include_router(metrics_router)
+app.include_router(ai_jobs_router)
 
 # Todos os models importados acima serão registrados neste metadata.
 database.Base.metadata.create_all(
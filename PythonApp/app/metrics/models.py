@@ -0,0 +1,100 @@
+import uuid
+
+from datetime import date
+
+from sqlalchemy import (
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class LLMUsageDaily(Base):
+    __tablename__ = "llm_usage_daily"
+
+    # Uma linha por usuário, dia, endpoint e modelo;
+    # os totais são somados a cada gravação.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "day",
+            "endpoint",
+            "model",
+            name="uq_llm_usage_daily_user_day_endpoint_model",
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    day = Column(
+        Date,
+        nullable=False,
+        default=date.today,
+    )
+
+    endpoint = Column(
+        String(80),
+        nullable=False,
+    )
+
+    model = Column(
+        String(80),
+        nullable=False,
+    )
+
+    calls = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    error_calls = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    prompt_tokens = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    completion_tokens = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    cost_usd = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+    )
+
+    total_latency_ms = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+    )
\ No newline at end of file
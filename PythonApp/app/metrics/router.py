@@ -0,0 +1,124 @@
+# app/metrics/router.py
+
+import os
+import secrets
+
+from typing import Any, Dict, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+from sqlalchemy.orm import Session
+
+from app import models
+from app.auth.dependencies import get_current_user
+from app.cache import cache_stats
+from app.database import get_db
+from app.interview_simulation.transcription import (
+    transcription_single_flight,
+)
+from app.llm.gateway import completion_single_flight
+from app.llm.metrics import llm_usage_metrics
+from app.llm.resilience import (
+    breaker_stats,
+    latency_tracker,
+)
+from app.llm.scheduler import llm_scheduler
+from app.metrics.schemas import LLMUsageDailyResponse
+from app.metrics.service import list_user_llm_usage
+from app.worker.notifications import task_event_listener
+
+
+# Vazio desativa as métricas agregadas: a rota
+# responde 404 em vez de ficar pública.
+METRICS_TOKEN = os.getenv(
+    "METRICS_TOKEN",
+    "",
+)
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+
+def require_metrics_token(
+    x_metrics_token: Optional[str] = Header(None),
+) -> None:
+    if not METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+    if not x_metrics_token or not secrets.compare_digest(
+        x_metrics_token,
+        METRICS_TOKEN,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de métricas inválido.",
+        )
+
+
+# MARK: - LLM Metrics
+
+
+@router.get(
+    "/llm",
+    dependencies=[
+        Depends(require_metrics_token)
+    ],
+)
+def get_llm_metrics() -> Dict[str, Any]:
+    return {
+        "endpoints":
+            llm_usage_metrics.snapshot(),
+        "scheduler":
+            llm_scheduler.stats(),
+        "singleFlight":
+            completion_single_flight.stats(),
+        "transcriptionSingleFlight":
+            transcription_single_flight.stats(),
+        "providerLatency":
+            latency_tracker.stats(),
+        "breakers":
+            breaker_stats(),
+        "caches":
+            cache_stats(),
+        "taskEvents":
+            task_event_listener.stats(),
+    }
+
+
+# MARK: - User Usage
+
+
+@router.get(
+    "/llm/usage",
+    response_model=list[
+        LLMUsageDailyResponse
+    ],
+)
+def get_my_llm_usage(
+    days: int = Query(
+        default=30,
+        ge=1,
+        le=90,
+    ),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return list_user_llm_usage(
+        db,
+        current_user.id,
+        days,
+    )
\ No newline at end of file
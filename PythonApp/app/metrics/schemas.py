@@ -0,0 +1,18 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+class LLMUsageDailyResponse(BaseModel):
+    day: date
+    endpoint: str
+    model: str
+    calls: int
+    error_calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    total_latency_ms: float
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
\ No newline at end of file
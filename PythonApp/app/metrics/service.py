@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.llm.metrics import llm_usage_metrics
+from app.metrics.models import LLMUsageDaily
+from app.observability import logger
+
+
+# Intervalo mínimo entre gravações do consumo acumulado.
+LLM_USAGE_FLUSH_SECONDS = float(
+    os.getenv(
+        "LLM_USAGE_FLUSH_SECONDS",
+        "60",
+    )
+)
+
+
+_last_flush_at = time.monotonic()
+_flush_task: Optional["asyncio.Task[None]"] = None
+
+
+# MARK: - Flush
+
+
+def flush_llm_usage() -> int:
+    pending_usage = (
+        llm_usage_metrics.drain_pending_usage()
+    )
+
+    if not pending_usage:
+        return 0
+
+    db = SessionLocal()
+
+    try:
+        for (user_id, day, endpoint, model), values in pending_usage:
+            statement = insert(LLMUsageDaily).values(
+                user_id=user_id,
+                day=day,
+                endpoint=endpoint,
+                model=model,
+                **values,
+            )
+
+            db.execute(
+                statement.on_conflict_do_update(
+                    constraint="uq_llm_usage_daily_user_day_endpoint_model",
+                    set_={
+                        field: (
+                            getattr(LLMUsageDaily, field)
+                            + statement.excluded[field]
+                        )
+                        for field in values
+                    },
+                )
+            )
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+
+        # Volta para o buffer e tenta de novo no próximo ciclo.
+        llm_usage_metrics.restore_pending_usage(
+            pending_usage
+        )
+
+        logger.exception(
+            "failed to flush llm usage",
+            extra={
+                "event":
+                    "llm_usage_flush_failed",
+                "rowCount":
+                    len(pending_usage),
+            },
+        )
+
+        return 0
+
+    finally:
+        db.close()
+
+    return len(pending_usage)
+
+
+def schedule_llm_usage_flush() -> None:
+    global _flush_task
+    global _last_flush_at
+
+    if (
+        time.monotonic() - _last_flush_at
+        < LLM_USAGE_FLUSH_SECONDS
+    ):
+        return
+
+    if _flush_task is not None and not _flush_task.done():
+        return
+
+    _last_flush_at = time.monotonic()
+
+    # A gravação usa a sessão síncrona, fora do event loop.
+    _flush_task = asyncio.create_task(
+        asyncio.to_thread(
+            flush_llm_usage
+        )
+    )
+
+
+# MARK: - Queries
+
+
+def list_user_llm_usage(
+    db: Session,
+    user_id: UUID,
+    days: int,
+) -> List[LLMUsageDaily]:
+    return (
+        db.query(LLMUsageDaily)
+        .filter(
+            LLMUsageDaily.user_id == user_id,
+            LLMUsageDaily.day
+            > date.today() - timedelta(days=days),
+        )
+        .order_by(
+            LLMUsageDaily.day.desc(),
+            LLMUsageDaily.endpoint,
+        )
+        .all()
+    )
\ No newline at end of file
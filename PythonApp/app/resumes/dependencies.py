@@ -0,0 +1,44 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import (
+    HTTPException,
+    status,
+)
+from sqlalchemy.orm import Session
+
+from app import models
+from app.resumes.models import ResumeProfile
+from app.resumes.service import find_resume_profile
+
+
+def get_owned_resume_profile(
+    resume_id: UUID,
+    current_user: Optional[models.User],
+    db: Session,
+) -> ResumeProfile:
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=(
+                "Faça login para usar "
+                "um currículo salvo."
+            ),
+            headers={
+                "WWW-Authenticate": "Bearer"
+            },
+        )
+
+    profile = find_resume_profile(
+        db,
+        resume_id,
+        current_user.id,
+    )
+
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Currículo não encontrado.",
+        )
+
+    return profile
\ No newline at end of file
@@ -0,0 +1,525 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.llm.prompt_budget import PAGE_BREAK
+from app.observability import logger
+from app.resumes.schemas import ResumeDocument
+from app.resumes.text_cache import (
+    build_resume_hash,
+    resume_text_cache,
+)
+
+
+load_dotenv()
+
+
+RESUME_MAX_BYTES = int(
+    os.getenv(
+        "RESUME_MAX_BYTES",
+        str(5 * 1024 * 1024),
+    )
+)
+
+RESUME_MAX_PAGES = int(
+    os.getenv(
+        "RESUME_MAX_PAGES",
+        "20",
+    )
+)
+
+RESUME_EXTRACTION_TIMEOUT_SECONDS = float(
+    os.getenv(
+        "RESUME_EXTRACTION_TIMEOUT_SECONDS",
+        "10",
+    )
+)
+
+RESUME_EXTRACTION_WORKERS = int(
+    os.getenv(
+        "RESUME_EXTRACTION_WORKERS",
+        "2",
+    )
+)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class ResumeIngestionError(Exception):
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+    ):
+        super().__init__(detail)
+
+        self.status_code = status_code
+        self.detail = detail
+
+    # Necessário para o erro atravessar o process pool.
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (
+                self.status_code,
+                self.detail,
+            ),
+        )
+
+
+# MARK: - Public API
+
+
+async def ingest_resume(
+    content: bytes,
+) -> ResumeDocument:
+    validate_resume_size(
+        content
+    )
+
+    resume_hash = build_resume_hash(
+        content
+    )
+
+    cached_document = await resume_text_cache.get(
+        resume_hash
+    )
+
+    if cached_document is not None:
+        _log_cache_hit(
+            resume_hash
+        )
+
+        return ResumeDocument(
+            **cached_document
+        )
+
+    started_at = time.perf_counter()
+
+    try:
+        extracted = await _extract_in_pool(
+            content,
+            resume_hash,
+        )
+
+    except ResumeIngestionError as error:
+        if error.status_code == 504:
+            logger.warning(
+                "resume extraction timed out",
+                extra={
+                    "event":
+                        "resume_extraction_timeout",
+                    "resumeHash":
+                        resume_hash[:12],
+                    "timeoutSeconds":
+                        RESUME_EXTRACTION_TIMEOUT_SECONDS,
+                },
+            )
+
+        raise
+
+    except BrokenProcessPool as error:
+        logger.exception(
+            "resume extraction pool crashed",
+            extra={
+                "event":
+                    "resume_extraction_pool_crashed",
+                "resumeHash":
+                    resume_hash[:12],
+            },
+        )
+
+        raise ResumeIngestionError(
+            status_code=422,
+            detail=(
+                "Não foi possível "
+                "ler o currículo."
+            ),
+        ) from error
+
+    document = _build_document(
+        resume_hash,
+        extracted,
+    )
+
+    await resume_text_cache.set(
+        resume_hash,
+        document.model_dump(),
+    )
+
+    _log_extracted(
+        document,
+        started_at,
+    )
+
+    return document
+
+
+async def _extract_in_pool(
+    content: bytes,
+    resume_hash: str,
+    can_retry: bool = True,
+) -> Dict[str, Any]:
+    pool = _get_process_pool()
+
+    submitted_at = time.monotonic()
+
+    try:
+        # O limite de tempo é aplicado dentro do processo e só
+        # começa a contar quando o documento sai da fila.
+        return await asyncio.get_running_loop().run_in_executor(
+            pool,
+            extract_resume_pages_limited,
+            content,
+            RESUME_MAX_PAGES,
+            RESUME_EXTRACTION_TIMEOUT_SECONDS,
+        )
+
+    except BrokenProcessPool:
+        # Um PDF malformado, ou um que estourou o limite de
+        # CPU, derruba o processo e todo o pool com ele.
+        _discard_process_pool(pool)
+
+        # Quem estourou o limite de CPU rodou pelo menos o
+        # timeout inteiro; os que falharam antes disso só
+        # estavam no pool e tentam de novo, uma vez.
+        if (
+            not can_retry
+            or time.monotonic() - submitted_at
+            >= RESUME_EXTRACTION_TIMEOUT_SECONDS
+        ):
+            raise
+
+    logger.warning(
+        "resume extraction retried after pool crash",
+        extra={
+            "event":
+                "resume_extraction_retried",
+            "resumeHash":
+                resume_hash[:12],
+        },
+    )
+
+    return await _extract_in_pool(
+        content,
+        resume_hash,
+        can_retry=False,
+    )
+
+
+def ingest_resume_sync(
+    content: bytes,
+) -> ResumeDocument:
+    # Usado pelo worker do Celery, que já roda
+    # fora do event loop da API.
+    validate_resume_size(
+        content
+    )
+
+    resume_hash = build_resume_hash(
+        content
+    )
+
+    cached_document = resume_text_cache.get_sync(
+        resume_hash
+    )
+
+    if cached_document is not None:
+        _log_cache_hit(
+            resume_hash
+        )
+
+        return ResumeDocument(
+            **cached_document
+        )
+
+    started_at = time.perf_counter()
+
+    document = _build_document(
+        resume_hash,
+        extract_resume_pages(
+            content,
+            RESUME_MAX_PAGES,
+            RESUME_EXTRACTION_TIMEOUT_SECONDS,
+        ),
+    )
+
+    resume_text_cache.set_sync(
+        resume_hash,
+        document.model_dump(),
+    )
+
+    _log_extracted(
+        document,
+        started_at,
+    )
+
+    return document
+
+
+# MARK: - Validation
+
+
+def validate_resume_size(
+    content: bytes,
+) -> None:
+    if not content:
+        raise ResumeIngestionError(
+            status_code=422,
+            detail=(
+                "O currículo "
+                "está vazio."
+            ),
+        )
+
+    if len(content) > RESUME_MAX_BYTES:
+        raise ResumeIngestionError(
+            status_code=413,
+            detail=(
+                "O currículo deve ter "
+                f"no máximo {RESUME_MAX_BYTES // (1024 * 1024)} MB."
+            ),
+        )
+
+
+# MARK: - Extraction
+
+
+def extract_resume_pages_limited(
+    content: bytes,
+    max_pages: int,
+    timeout_seconds: float,
+) -> Dict[str, Any]:
+    # Roda dentro do process pool. A checagem por página não
+    # interrompe uma página travada no parser; o limite de CPU
+    # mata o processo nesse caso e libera a vaga do pool.
+    import resource
+
+    soft_limit, hard_limit = resource.getrlimit(
+        resource.RLIMIT_CPU
+    )
+
+    usage = resource.getrusage(
+        resource.RUSAGE_SELF
+    )
+
+    cpu_limit = math.ceil(
+        usage.ru_utime
+        + usage.ru_stime
+        + timeout_seconds
+    ) + 1
+
+    if hard_limit != resource.RLIM_INFINITY:
+        cpu_limit = min(
+            cpu_limit,
+            hard_limit,
+        )
+
+    resource.setrlimit(
+        resource.RLIMIT_CPU,
+        (
+            cpu_limit,
+            hard_limit,
+        ),
+    )
+
+    try:
+        return extract_resume_pages(
+            content,
+            max_pages,
+            timeout_seconds,
+        )
+
+    finally:
+        # O processo é reaproveitado pelos próximos documentos.
+        resource.setrlimit(
+            resource.RLIMIT_CPU,
+            (
+                soft_limit,
+                hard_limit,
+            ),
+        )
+
+
+def extract_resume_pages(
+    content: bytes,
+    max_pages: int,
+    timeout_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Roda dentro do process pool: recebe e devolve
+    # apenas tipos simples.
+    import pymupdf
+
+    started_at = time.monotonic()
+
+    try:
+        document = pymupdf.open(
+            stream=content,
+            filetype="pdf",
+        )
+
+    except Exception as error:
+        raise ResumeIngestionError(
+            status_code=422,
+            detail=(
+                "Não foi possível "
+                "ler o currículo."
+            ),
+        ) from error
+
+    with document:
+        if document.page_count > max_pages:
+            raise ResumeIngestionError(
+                status_code=422,
+                detail=(
+                    "O currículo deve ter "
+                    f"no máximo {max_pages} páginas."
+                ),
+            )
+
+        page_texts = []
+
+        for page in document:
+            if (
+                timeout_seconds is not None
+                and time.monotonic() - started_at
+                > timeout_seconds
+            ):
+                raise ResumeIngestionError(
+                    status_code=504,
+                    detail=(
+                        "Tempo esgotado ao "
+                        "ler o currículo."
+                    ),
+                )
+
+            page_texts.append(
+                page.get_text("text")
+            )
+
+    return {
+        "page_count":
+            len(page_texts),
+        "page_texts":
+            page_texts,
+    }
+
+
+def _build_document(
+    resume_hash: str,
+    extracted: Dict[str, Any],
+) -> ResumeDocument:
+    page_texts = extracted["page_texts"]
+
+    return ResumeDocument(
+        resume_hash=resume_hash,
+        # O separador de páginas deixa o orçamento de prompt
+        # reconhecer cabeçalhos e rodapés repetidos.
+        text=PAGE_BREAK.join(
+            page_text
+            for page_text in page_texts
+            if page_text
+        ),
+        page_count=extracted["page_count"],
+        pages=[
+            {
+                "number":
+                    index + 1,
+                "char_count":
+                    len(page_text),
+                "word_count":
+                    len(page_text.split()),
+            }
+            for index, page_text in enumerate(
+                page_texts
+            )
+        ],
+    )
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+
+    if _process_pool is None:
+        # "spawn" evita fork de um processo com threads
+        # (uvicorn/httpx) e herda só o que o parser precisa.
+        _process_pool = ProcessPoolExecutor(
+            max_workers=RESUME_EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context(
+                "spawn"
+            ),
+        )
+
+    return _process_pool
+
+
+def _discard_process_pool(
+    pool: ProcessPoolExecutor,
+) -> None:
+    global _process_pool
+
+    # Várias chamadas veem o mesmo pool quebrar; só a
+    # primeira troca o pool, as outras já usam o novo.
+    if _process_pool is pool:
+        _process_pool = None
+
+    # Libera os processos e o thread de gerenciamento
+    # do pool quebrado.
+    pool.shutdown(
+        wait=False,
+        cancel_futures=True,
+    )
+
+
+# MARK: - Logging
+
+
+def _log_cache_hit(
+    resume_hash: str,
+) -> None:
+    logger.info(
+        "resume document served from cache",
+        extra={
+            "event":
+                "resume_document_cache_hit",
+            "resumeHash":
+                resume_hash[:12],
+        },
+    )
+
+
+def _log_extracted(
+    document: ResumeDocument,
+    started_at: float,
+) -> None:
+    logger.info(
+        "resume document extracted",
+        extra={
+            "event":
+                "resume_document_extracted",
+            "resumeHash":
+                document.resume_hash[:12],
+            "pageCount":
+                document.page_count,
+            "resumeTextLength":
+                len(document.text),
+            "durationMs":
+                round(
+                    (
+                        time.perf_counter()
+                        - started_at
+                    )
+                    * 1000,
+                    2,
+                ),
+        },
+    )
\ No newline at end of file
@@ -0,0 +1,105 @@
+import uuid
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    JSONB,
+    UUID,
+)
+
+from app.database import Base
+
+
+class ResumeProfile(Base):
+    __tablename__ = "resume_profiles"
+
+    # O mesmo PDF enviado duas vezes pelo mesmo
+    # usuário reaproveita o perfil existente.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "resume_hash",
+            name="uq_resume_profiles_user_hash",
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+
+    resume_hash = Column(
+        String(64),
+        nullable=False,
+    )
+
+    file_name = Column(
+        String(255),
+        nullable=True,
+    )
+
+    page_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    summary = Column(
+        Text,
+        nullable=False,
+        default="",
+    )
+
+    skills = Column(
+        ARRAY(String),
+        nullable=False,
+        default=list,
+    )
+
+    # Lista de {"role", "company", "period", "highlights"}.
+    experiences = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+    )
+
+    # Lista de {"institution", "degree", "period"}.
+    education = Column(
+        JSONB,
+        nullable=False,
+        default=list,
+    )
+
+    # Texto completo, usado pelo feedback de currículo.
+    resume_text = Column(
+        Text,
+        nullable=False,
+        default="",
+    )
+
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
\ No newline at end of file
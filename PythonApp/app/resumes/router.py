@@ -0,0 +1,306 @@
+# app/resumes/router.py
+
+import time
+
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    UploadFile,
+    status,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.observability import logger
+from app.resumes.dependencies import get_owned_resume_profile
+from app.resumes.ingestion import (
+    ResumeIngestionError,
+    ingest_resume,
+)
+from app.resumes.models import ResumeProfile
+from app.resumes.schemas import ResumeProfileResponse
+from app.resumes.service import (
+    extract_resume_profile,
+    find_resume_profile_by_hash,
+)
+
+
+router = APIRouter(
+    prefix="/resumes",
+    tags=["Resumes"],
+)
+
+
+# MARK: - Upload Resume
+
+
+@router.post(
+    "/",
+    response_model=ResumeProfileResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_resume(
+    resume: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    started_at = time.perf_counter()
+
+    logger.info(
+        "resume profile upload started",
+        extra={
+            "event":
+                "resume_profile_upload_started",
+            "userId":
+                str(current_user.id),
+            "fileName":
+                resume.filename,
+            "contentType":
+                resume.content_type,
+        },
+    )
+
+    try:
+        if (
+            resume.content_type
+            and resume.content_type
+            != "application/pdf"
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    "O currículo deve "
+                    "ser enviado em "
+                    "formato PDF."
+                ),
+            )
+
+        content = await resume.read()
+
+        try:
+            resume_document = await ingest_resume(
+                content
+            )
+
+        except ResumeIngestionError as error:
+            raise HTTPException(
+                status_code=error.status_code,
+                detail=error.detail,
+            ) from error
+
+        existing_profile = find_resume_profile_by_hash(
+            db,
+            current_user.id,
+            resume_document.resume_hash,
+        )
+
+        if existing_profile is not None:
+            logger.info(
+                "resume profile reused",
+                extra={
+                    "event":
+                        "resume_profile_reused",
+                    "userId":
+                        str(current_user.id),
+                    "resumeId":
+                        str(existing_profile.id),
+                },
+            )
+
+            return existing_profile
+
+        profile_data = await extract_resume_profile(
+            resume_document.text
+        )
+
+        profile = ResumeProfile(
+            user_id=current_user.id,
+            resume_hash=resume_document.resume_hash,
+            file_name=(
+                resume.filename or ""
+            )[:255] or None,
+            page_count=resume_document.page_count,
+            resume_text=resume_document.text,
+            **profile_data,
+        )
+
+        db.add(profile)
+
+        try:
+            db.commit()
+
+        except IntegrityError:
+            # Outro upload do mesmo PDF terminou antes.
+            db.rollback()
+
+            return find_resume_profile_by_hash(
+                db,
+                current_user.id,
+                resume_document.resume_hash,
+            )
+
+        db.refresh(profile)
+
+        logger.info(
+            "resume profile created",
+            extra={
+                "event":
+                    "resume_profile_created",
+                "userId":
+                    str(current_user.id),
+                "resumeId":
+                    str(profile.id),
+                "skillCount":
+                    len(profile.skills),
+                "experienceCount":
+                    len(profile.experiences),
+                "durationMs":
+                    round(
+                        (
+                            time.perf_counter()
+                            - started_at
+                        )
+                        * 1000,
+                        2,
+                    ),
+            },
+        )
+
+        return profile
+
+    except HTTPException:
+        raise
+
+    except ValueError as error:
+        logger.exception(
+            "invalid resume profile response",
+            extra={
+                "event":
+                    "resume_profile_invalid_response",
+                "userId":
+                    str(current_user.id),
+            },
+        )
+
+        raise HTTPException(
+            status_code=502,
+            detail=str(error),
+        ) from error
+
+    except Exception as error:
+        db.rollback()
+
+        logger.exception(
+            "resume profile upload failed",
+            extra={
+                "event":
+                    "resume_profile_upload_failed",
+                "userId":
+                    str(current_user.id),
+            },
+        )
+
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                "Erro ao processar "
+                "o currículo."
+            ),
+        ) from error
+
+    finally:
+        await resume.close()
+
+
+# MARK: - List Resumes
+
+
+@router.get(
+    "/",
+    response_model=list[
+        ResumeProfileResponse
+    ],
+)
+def list_resumes(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return (
+        db.query(ResumeProfile)
+        .filter(
+            ResumeProfile.user_id
+            == current_user.id
+        )
+        .order_by(
+            ResumeProfile.created_at.desc()
+        )
+        .all()
+    )
+
+
+# MARK: - Get Resume
+
+
+@router.get(
+    "/{resume_id}",
+    response_model=ResumeProfileResponse,
+)
+def get_resume(
+    resume_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    return get_owned_resume_profile(
+        resume_id,
+        current_user,
+        db,
+    )
+
+
+# MARK: - Delete Resume
+
+
+@router.delete(
+    "/{resume_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+def delete_resume(
+    resume_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(
+        get_current_user
+    ),
+):
+    profile = get_owned_resume_profile(
+        resume_id,
+        current_user,
+        db,
+    )
+
+    db.delete(profile)
+    db.commit()
+
+    logger.info(
+        "resume profile deleted",
+        extra={
+            "event":
+                "resume_profile_deleted",
+            "userId":
+                str(current_user.id),
+            "resumeId":
+                str(resume_id),
+        },
+    )
\ No newline at end of file
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+class ResumePage(BaseModel):
+    number: int
+    char_count: int
+    word_count: int
+
+class ResumeDocument(BaseModel):
+    resume_hash: str
+    text: str
+    page_count: int
+    pages: List[ResumePage]
+
+class ResumeExperience(BaseModel):
+    role: str
+    company: str
+    period: str
+    highlights: List[str]
+
+class ResumeEducation(BaseModel):
+    institution: str
+    degree: str
+    period: str
+
+class ResumeProfileData(BaseModel):
+    summary: str
+    skills: List[str]
+    experiences: List[ResumeExperience]
+    education: List[ResumeEducation]
+
+class ResumeProfileResponse(BaseModel):
+    id: UUID
+    file_name: Optional[str] = None
+    page_count: int
+    summary: str
+    skills: List[str]
+    experiences: List[ResumeExperience]
+    education: List[ResumeEducation]
+    created_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
\ No newline at end of file
@@ -0,0 +1,241 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import OPENAI_MODEL
+from app.llm.prompt_budget import fit_resume_to_budget
+from app.llm.structured_output import create_structured_completion
+from app.resumes.models import ResumeProfile
+from app.resumes.schemas import ResumeProfileData
+from app.study_plan.service import normalize_string_list
+
+
+# MARK: - Queries
+
+
+def find_resume_profile(
+    db: Session,
+    resume_id: UUID,
+    user_id: UUID,
+) -> Optional[ResumeProfile]:
+    return (
+        db.query(ResumeProfile)
+        .filter(
+            ResumeProfile.id == resume_id,
+            ResumeProfile.user_id == user_id,
+        )
+        .first()
+    )
+
+
+def find_resume_profile_by_hash(
+    db: Session,
+    user_id: UUID,
+    resume_hash: str,
+) -> Optional[ResumeProfile]:
+    return (
+        db.query(ResumeProfile)
+        .filter(
+            ResumeProfile.user_id == user_id,
+            ResumeProfile.resume_hash == resume_hash,
+        )
+        .first()
+    )
+
+
+# MARK: - Profile Extraction
+
+
+def build_resume_profile_messages(
+    resume_text: str,
+) -> List[Dict[str, str]]:
+    prompt = """
+Extraia um perfil estruturado do currículo abaixo.
+
+Currículo:
+{resume_text}
+
+Regras:
+- Não invente informações que não estejam no currículo.
+- O resumo deve ter no máximo 3 frases.
+- Liste até 30 habilidades técnicas, sem repetições.
+- Liste as experiências da mais recente para a mais antiga.
+- Cada experiência deve ter até 4 destaques curtos.
+
+Retorne somente um objeto JSON válido, sem markdown,
+neste formato:
+
+{{
+  "summary": "string",
+  "skills": ["string"],
+  "experiences": [
+    {{
+      "role": "string",
+      "company": "string",
+      "period": "string",
+      "highlights": ["string"]
+    }}
+  ],
+  "education": [
+    {{
+      "institution": "string",
+      "degree": "string",
+      "period": "string"
+    }}
+  ]
+}}
+""".strip().format(
+        resume_text=fit_resume_to_budget(
+            resume_text,
+            endpoint="resume_profile",
+        ),
+    )
+
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Você extrai dados de currículos "
+                "com precisão e responde somente com JSON."
+            ),
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
+
+
+async def extract_resume_profile(
+    resume_text: str,
+) -> Dict[str, Any]:
+    profile_data = await create_structured_completion(
+        endpoint="resume_profile",
+        model=OPENAI_MODEL,
+        messages=build_resume_profile_messages(
+            resume_text
+        ),
+        name="resume_profile",
+        response_model=ResumeProfileData,
+        temperature=0,
+    )
+
+    return normalize_resume_profile(
+        profile_data
+    )
+
+
+def normalize_resume_profile(
+    data: Dict[str, Any],
+) -> Dict[str, Any]:
+    experiences = []
+
+    for item in data.get("experiences") or []:
+        if not isinstance(item, dict):
+            continue
+
+        experiences.append(
+            {
+                "role": str(item.get("role") or "").strip(),
+                "company": str(item.get("company") or "").strip(),
+                "period": str(item.get("period") or "").strip(),
+                "highlights": normalize_string_list(
+                    item.get("highlights")
+                )[:4],
+            }
+        )
+
+    education = []
+
+    for item in data.get("education") or []:
+        if not isinstance(item, dict):
+            continue
+
+        education.append(
+            {
+                "institution": str(item.get("institution") or "").strip(),
+                "degree": str(item.get("degree") or "").strip(),
+                "period": str(item.get("period") or "").strip(),
+            }
+        )
+
+    skills = []
+
+    for skill in normalize_string_list(
+        data.get("skills")
+    ):
+        if skill.lower() not in {
+            existing.lower()
+            for existing in skills
+        }:
+            skills.append(skill)
+
+    return {
+        "summary": str(data.get("summary") or "").strip(),
+        "skills": skills[:30],
+        "experiences": experiences,
+        "education": education,
+    }
+
+
+# MARK: - Prompt Context
+
+
+def build_resume_profile_context(
+    profile: ResumeProfile,
+) -> str:
+    # Versão compacta do currículo usada nos prompts
+    # no lugar do texto extraído do PDF.
+    context_parts = []
+
+    if profile.summary:
+        context_parts.append(
+            "Resumo: {}".format(
+                profile.summary
+            )
+        )
+
+    if profile.skills:
+        context_parts.append(
+            "Habilidades: {}".format(
+                ", ".join(profile.skills)
+            )
+        )
+
+    if profile.experiences:
+        experience_lines = ["Experiências:"]
+
+        for experience in profile.experiences:
+            experience_lines.append(
+                "- {} | {} | {}".format(
+                    experience.get("role", ""),
+                    experience.get("company", ""),
+                    experience.get("period", ""),
+                )
+            )
+
+            for highlight in experience.get("highlights", []):
+                experience_lines.append(
+                    "  • {}".format(highlight)
+                )
+
+        context_parts.append(
+            "\n".join(experience_lines)
+        )
+
+    if profile.education:
+        context_parts.append(
+            "Formação:\n{}".format(
+                "\n".join(
+                    "- {} | {} | {}".format(
+                        item.get("degree", ""),
+                        item.get("institution", ""),
+                        item.get("period", ""),
+                    )
+                    for item in profile.education
+                )
+            )
+        )
+
+    return "\n\n".join(context_parts)
\ No newline at end of file
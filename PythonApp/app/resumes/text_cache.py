@@ -0,0 +1,44 @@
+import hashlib
+import os
+
+from dotenv import load_dotenv
+
+from app.cache import TTLCache
+
+
+load_dotenv()
+
+
+RESUME_TEXT_CACHE_TTL_SECONDS = int(
+    os.getenv(
+        "RESUME_TEXT_CACHE_TTL_SECONDS",
+        "604800",
+    )
+)
+
+RESUME_TEXT_CACHE_MAX_ENTRIES = int(
+    os.getenv(
+        "RESUME_TEXT_CACHE_MAX_ENTRIES",
+        "200",
+    )
+)
+
+
+# O mesmo PDF gera o mesmo documento, então a chave
+# é só o hash do conteúdo e vale para todos os endpoints.
+resume_text_cache = TTLCache(
+    namespace="resume_documents",
+    ttl_seconds=RESUME_TEXT_CACHE_TTL_SECONDS,
+    max_entries=RESUME_TEXT_CACHE_MAX_ENTRIES,
+)
+
+
+# MARK: - Keys
+
+
+def build_resume_hash(
+    content: bytes,
+) -> str:
+    return hashlib.sha256(
+        content
+    ).hexdigest()
\ No newline at end of file
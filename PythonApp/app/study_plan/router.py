@@ -3,23 +3,45 @@
 import time
 
 from typing import Optional
+from uuid import UUID
 
 from fastapi import (
     APIRouter,
+    Depends,
     File,
     Form,
     HTTPException,
     UploadFile,
 )
+from fastapi.responses import (
+    StreamingResponse,
+)
+from sqlalchemy.orm import Session
 
-from app.config import OPENAI_MODEL
-from app.llm_generation.pdf_utils import (
-    extract_text_from_pdf,
+from app import models
+from app.auth.dependencies import (
+    get_optional_current_user,
 )
+from app.config import OPENAI_MODEL
+from app.database import get_db
 from app.observability import logger
-from app.openai_client import client
+from app.resumes.dependencies import (
+    get_owned_resume_profile,
+)
+from app.resumes.ingestion import (
+    ResumeIngestionError,
+    ingest_resume,
+)
+from app.resumes.service import (
+    build_resume_profile_context,
+)
 from app.study_plan.service import (
     create_study_plan,
+    stream_study_plan,
+)
+from app.utils.sse import (
+    SSE_HEADERS,
+    format_sse_event,
 )
 
 from .schemas import StudyPlanResponse
@@ -47,6 +69,13 @@ async def generate_study_plan(
     resume: Optional[UploadFile] = File(
         None
     ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
 ):
     started_at = time.perf_counter()
 
@@ -77,6 +106,10 @@ async def generate_study_plan(
                 ),
             "hasResume":
                 resume is not None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
             "model":
                 OPENAI_MODEL,
         },
@@ -85,197 +118,25 @@ async def generate_study_plan(
     try:
         # MARK: - Validation
 
-        if not normalized_job_title:
-            logger.info(
-                "study plan generation rejected because job title is empty",
-                extra={
-                    "event":
-                        "study_plan_validation_failed",
-                    "field":
-                        "job_title",
-                    "statusCode":
-                        422,
-                },
-            )
-
-            raise HTTPException(
-                status_code=422,
-                detail=(
-                    "O cargo é obrigatório."
-                ),
-            )
-
-        if not normalized_seniority:
-            logger.info(
-                "study plan generation rejected because seniority is empty",
-                extra={
-                    "event":
-                        "study_plan_validation_failed",
-                    "field":
-                        "seniority",
-                    "jobTitle":
-                        normalized_job_title,
-                    "statusCode":
-                        422,
-                },
-            )
-
-            raise HTTPException(
-                status_code=422,
-                detail=(
-                    "A senioridade "
-                    "é obrigatória."
-                ),
-            )
+        validate_study_plan_request(
+            normalized_job_title=
+                normalized_job_title,
+            normalized_seniority=
+                normalized_seniority,
+        )
 
         # MARK: - Resume
 
-        resume_text = ""
-
-        if resume is not None:
-            try:
-                filename = (
-                    resume.filename or ""
-                ).lower()
-
-                content_type = (
-                    resume.content_type or ""
-                ).lower()
-
-                logger.info(
-                    "resume received for study plan generation",
-                    extra={
-                        "event":
-                            "study_plan_resume_received",
-                        "jobTitle":
-                            normalized_job_title,
-                        "seniority":
-                            normalized_seniority,
-                        "fileName":
-                            filename,
-                        "contentType":
-                            content_type,
-                    },
-                )
-
-                is_pdf = (
-                    filename.endswith(
-                        ".pdf"
-                    )
-                    or content_type
-                    == "application/pdf"
-                )
-
-                if not is_pdf:
-                    logger.info(
-                        "study plan resume rejected because file is not pdf",
-                        extra={
-                            "event":
-                                "study_plan_resume_validation_failed",
-                            "jobTitle":
-                                normalized_job_title,
-                            "seniority":
-                                normalized_seniority,
-                            "fileName":
-                                filename,
-                            "contentType":
-                                content_type,
-                            "statusCode":
-                                422,
-                        },
-                    )
-
-                    raise HTTPException(
-                        status_code=422,
-                        detail=(
-                            "O currículo deve "
-                            "estar em formato PDF."
-                        ),
-                    )
-
-                content = (
-                    await resume.read()
-                )
-
-                logger.info(
-                    "study plan resume file read",
-                    extra={
-                        "event":
-                            "study_plan_resume_read",
-                        "jobTitle":
-                            normalized_job_title,
-                        "seniority":
-                            normalized_seniority,
-                        "fileSizeBytes":
-                            len(content),
-                    },
-                )
-
-                if content:
-                    extraction_started_at = (
-                        time.perf_counter()
-                    )
-
-                    resume_text = (
-                        extract_text_from_pdf(
-                            content
-                        )
-                    )
-
-                    extraction_duration_ms = (
-                        round(
-                            (
-                                time.perf_counter()
-                                - extraction_started_at
-                            )
-                            * 1000,
-                            2,
-                        )
-                    )
-
-                    logger.info(
-                        "resume text extracted for study plan",
-                        extra={
-                            "event":
-                                "study_plan_resume_extracted",
-                            "jobTitle":
-                                normalized_job_title,
-                            "seniority":
-                                normalized_seniority,
-                            "resumeTextLength":
-                                len(
-                                    resume_text
-                                ),
-                            "durationMs":
-                                extraction_duration_ms,
-                        },
-                    )
-
-                else:
-                    logger.info(
-                        "empty resume file received for study plan",
-                        extra={
-                            "event":
-                                "study_plan_resume_empty",
-                            "jobTitle":
-                                normalized_job_title,
-                            "seniority":
-                                normalized_seniority,
-                        },
-                    )
-
-            finally:
-                await resume.close()
-
-                logger.info(
-                    "study plan resume file closed",
-                    extra={
-                        "event":
-                            "study_plan_resume_closed",
-                        "jobTitle":
-                            normalized_job_title,
-                    },
-                )
+        resume_text = await read_resume_text(
+            resume=resume,
+            resume_id=resume_id,
+            current_user=current_user,
+            db=db,
+            normalized_job_title=
+                normalized_job_title,
+            normalized_seniority=
+                normalized_seniority,
+        )
 
         # MARK: - Generate Plan
 
@@ -315,7 +176,6 @@ async def generate_study_plan(
 
         study_plan = (
             await create_study_plan(
-                client=client,
                 model=
                     OPENAI_MODEL,
                 job_title=
@@ -470,4 +330,435 @@ async def generate_study_plan(
                 "Erro ao gerar plano "
                 "de estudos."
             ),
-        ) from error
\ No newline at end of file
+        ) from error
+
+
+# MARK: - Stream Study Plan
+
+
+@router.post(
+    "/generate/stream",
+)
+async def generate_study_plan_stream(
+    job_title: str = Form(...),
+    seniority: str = Form(...),
+    description: Optional[str] = Form(
+        None
+    ),
+    resume: Optional[UploadFile] = File(
+        None
+    ),
+    resume_id: Optional[UUID] = Form(
+        None
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[models.User] = Depends(
+        get_optional_current_user
+    ),
+):
+    started_at = time.perf_counter()
+
+    normalized_job_title = (
+        job_title.strip()
+    )
+
+    normalized_seniority = (
+        seniority.strip()
+    )
+
+    normalized_description = (
+        description or ""
+    ).strip()
+
+    logger.info(
+        "study plan stream started",
+        extra={
+            "event":
+                "study_plan_stream_started",
+            "jobTitle":
+                normalized_job_title,
+            "seniority":
+                normalized_seniority,
+            "hasDescription":
+                bool(
+                    normalized_description
+                ),
+            "hasResume":
+                resume is not None,
+            "resumeId":
+                str(resume_id)
+                if resume_id
+                else None,
+            "model":
+                OPENAI_MODEL,
+        },
+    )
+
+    # Erros de validação e de leitura do currículo
+    # continuam voltando como respostas HTTP comuns.
+    validate_study_plan_request(
+        normalized_job_title=
+            normalized_job_title,
+        normalized_seniority=
+            normalized_seniority,
+    )
+
+    resume_text = await read_resume_text(
+        resume=resume,
+        resume_id=resume_id,
+        current_user=current_user,
+        db=db,
+        normalized_job_title=
+            normalized_job_title,
+        normalized_seniority=
+            normalized_seniority,
+    )
+
+    async def event_stream():
+        topic_count = 0
+
+        first_topic_ms = None
+
+        try:
+            async for event, payload in stream_study_plan(
+                model=
+                    OPENAI_MODEL,
+                job_title=
+                    normalized_job_title,
+                seniority=
+                    normalized_seniority,
+                description=
+                    normalized_description,
+                resume_text=
+                    resume_text,
+            ):
+                if event == "topic":
+                    topic_count += 1
+
+                    if first_topic_ms is None:
+                        first_topic_ms = round(
+                            (
+                                time.perf_counter()
+                                - started_at
+                            )
+                            * 1000,
+                            2,
+                        )
+
+                yield format_sse_event(
+                    event,
+                    payload,
+                )
+
+            logger.info(
+                "study plan stream completed",
+                extra={
+                    "event":
+                        "study_plan_stream_completed",
+                    "jobTitle":
+                        normalized_job_title,
+                    "seniority":
+                        normalized_seniority,
+                    "topicCount":
+                        topic_count,
+                    "firstTopicMs":
+                        first_topic_ms,
+                    "durationMs":
+                        round(
+                            (
+                                time.perf_counter()
+                                - started_at
+                            )
+                            * 1000,
+                            2,
+                        ),
+                },
+            )
+
+        except ValueError as error:
+            logger.exception(
+                "invalid study plan stream response",
+                extra={
+                    "event":
+                        "study_plan_stream_invalid_response",
+                    "jobTitle":
+                        normalized_job_title,
+                    "topicCount":
+                        topic_count,
+                },
+            )
+
+            yield format_sse_event(
+                "error",
+                {
+                    "detail":
+                        str(error)
+                },
+            )
+
+        except Exception:
+            logger.exception(
+                "study plan stream failed",
+                extra={
+                    "event":
+                        "study_plan_stream_failed",
+                    "jobTitle":
+                        normalized_job_title,
+                    "topicCount":
+                        topic_count,
+                },
+            )
+
+            yield format_sse_event(
+                "error",
+                {
+                    "detail": (
+                        "Erro ao gerar plano "
+                        "de estudos."
+                    )
+                },
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# MARK: - Validation
+
+
+def validate_study_plan_request(
+    normalized_job_title: str,
+    normalized_seniority: str,
+) -> None:
+    if not normalized_job_title:
+        logger.info(
+            "study plan generation rejected because job title is empty",
+            extra={
+                "event":
+                    "study_plan_validation_failed",
+                "field":
+                    "job_title",
+                "statusCode":
+                    422,
+            },
+        )
+
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "O cargo é obrigatório."
+            ),
+        )
+
+    if not normalized_seniority:
+        logger.info(
+            "study plan generation rejected because seniority is empty",
+            extra={
+                "event":
+                    "study_plan_validation_failed",
+                "field":
+                    "seniority",
+                "jobTitle":
+                    normalized_job_title,
+                "statusCode":
+                    422,
+            },
+        )
+
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "A senioridade "
+                "é obrigatória."
+            ),
+        )
+
+
+# MARK: - Resume
+
+
+async def read_resume_text(
+    resume: Optional[UploadFile],
+    resume_id: Optional[UUID],
+    current_user: Optional[models.User],
+    db: Session,
+    normalized_job_title: str,
+    normalized_seniority: str,
+) -> str:
+    # Currículo salvo: usa o perfil estruturado,
+    # sem reenviar nem reprocessar o PDF.
+    if resume_id is not None:
+        return build_resume_profile_context(
+            get_owned_resume_profile(
+                resume_id,
+                current_user,
+                db,
+            )
+        )
+
+    if resume is None:
+        return ""
+
+    resume_text = ""
+
+    try:
+        filename = (
+            resume.filename or ""
+        ).lower()
+
+        content_type = (
+            resume.content_type or ""
+        ).lower()
+
+        logger.info(
+            "resume received for study plan generation",
+            extra={
+                "event":
+                    "study_plan_resume_received",
+                "jobTitle":
+                    normalized_job_title,
+                "seniority":
+                    normalized_seniority,
+                "fileName":
+                    filename,
+                "contentType":
+                    content_type,
+            },
+        )
+
+        is_pdf = (
+            filename.endswith(
+                ".pdf"
+            )
+            or content_type
+            == "application/pdf"
+        )
+
+        if not is_pdf:
+            logger.info(
+                "study plan resume rejected because file is not pdf",
+                extra={
+                    "event":
+                        "study_plan_resume_validation_failed",
+                    "jobTitle":
+                        normalized_job_title,
+                    "seniority":
+                        normalized_seniority,
+                    "fileName":
+                        filename,
+                    "contentType":
+                        content_type,
+                    "statusCode":
+                        422,
+                },
+            )
+
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    "O currículo deve "
+                    "estar em formato PDF."
+                ),
+            )
+
+        content = (
+            await resume.read()
+        )
+
+        logger.info(
+            "study plan resume file read",
+            extra={
+                "event":
+                    "study_plan_resume_read",
+                "jobTitle":
+                    normalized_job_title,
+                "seniority":
+                    normalized_seniority,
+                "fileSizeBytes":
+                    len(content),
+            },
+        )
+
+        if content:
+            extraction_started_at = (
+                time.perf_counter()
+            )
+
+            try:
+                resume_document = (
+                    await ingest_resume(
+                        content
+                    )
+                )
+
+            except ResumeIngestionError as error:
+                raise HTTPException(
+                    status_code=error.status_code,
+                    detail=error.detail,
+                ) from error
+
+            resume_text = (
+                resume_document.text
+            )
+
+            extraction_duration_ms = (
+                round(
+                    (
+                        time.perf_counter()
+                        - extraction_started_at
+                    )
+                    * 1000,
+                    2,
+                )
+            )
+
+            logger.info(
+                "resume text extracted for study plan",
+                extra={
+                    "event":
+                        "study_plan_resume_extracted",
+                    "jobTitle":
+                        normalized_job_title,
+                    "seniority":
+                        normalized_seniority,
+                    "resumeTextLength":
+                        len(
+                            resume_text
+                        ),
+                    "pageCount":
+                        resume_document.page_count,
+                    "durationMs":
+                        extraction_duration_ms,
+                },
+            )
+
+        else:
+            logger.info(
+                "empty resume file received for study plan",
+                extra={
+                    "event":
+                        "study_plan_resume_empty",
+                    "jobTitle":
+                        normalized_job_title,
+                    "seniority":
+                        normalized_seniority,
+                },
+            )
+
+    finally:
+        await resume.close()
+
+        logger.info(
+            "study plan resume file closed",
+            extra={
+                "event":
+                    "study_plan_resume_closed",
+                "jobTitle":
+                    normalized_job_title,
+            },
+        )
+
+    return resume_text
@@ -1,8 +1,17 @@
-import asyncio
 import json
 import re
 
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.llm.prompt_budget import (
+    fit_resume_to_budget,
+)
+from app.llm.structured_output import (
+    create_structured_completion,
+    stream_structured_completion,
+    validate_structured_output,
+)
+from app.study_plan.schemas import StudyPlanResponse
 
 def build_study_plan_prompt(
     job_title: str,
@@ -22,6 +31,13 @@ def build_study_plan_prompt(
             )
         )
 
+    resume_text = fit_resume_to_budget(
+        resume_text,
+        endpoint="study_plan",
+        job_title=job_title,
+        description=description,
+    )
+
     if resume_text:
         context_parts.append(
             "Currículo da pessoa candidata:\n{}".format(
@@ -80,7 +96,6 @@ high, medium ou low.
 
 
 async def create_study_plan(
-    client,
     model: str,
     job_title: str,
     seniority: str,
@@ -94,95 +109,210 @@ async def create_study_plan(
         resume_text=resume_text,
     )
 
-    response = await asyncio.to_thread(
-        client.chat.completions.create,
+    plan = await create_structured_completion(
+        endpoint="study_plan",
         model=model,
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "Você é um especialista em carreira, "
-                    "entrevistas técnicas e criação de "
-                    "planos de estudo personalizados. "
-                    "Responda somente com JSON válido."
-                ),
-            },
-            {
-                "role": "user",
-                "content": prompt,
-            },
-        ],
+        messages=build_study_plan_messages(
+            prompt
+        ),
+        name="study_plan",
+        response_model=StudyPlanResponse,
         temperature=0.4,
     )
 
-    if not response.choices:
-        raise ValueError(
-            "A OpenAI não retornou uma resposta."
-        )
-
-    content = (
-        response.choices[0].message.content
-        or ""
-    )
-
-    print(
-        "📚 Plano recebido da OpenAI:",
-        content,
-        flush=True,
-    )
-
-    plan = extract_json(content)
-
     return normalize_study_plan(plan)
 
 
-def extract_json(
-    content: str,
-) -> Dict[str, Any]:
-    if not content or not content.strip():
-        raise ValueError(
-            "A OpenAI retornou uma resposta vazia."
-        )
-
-    normalized = content.strip()
+def build_study_plan_messages(
+    prompt: str,
+) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Você é um especialista em carreira, "
+                "entrevistas técnicas e criação de "
+                "planos de estudo personalizados. "
+                "Responda somente com JSON válido."
+            ),
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
 
-    normalized = normalized.replace(
-        "```json",
-        "",
-    )
 
-    normalized = normalized.replace(
-        "```",
-        "",
+async def stream_study_plan(
+    model: str,
+    job_title: str,
+    seniority: str,
+    description: str = "",
+    resume_text: str = "",
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    prompt = build_study_plan_prompt(
+        job_title=job_title,
+        seniority=seniority,
+        description=description,
+        resume_text=resume_text,
     )
 
-    start_index = normalized.find("{")
-    end_index = normalized.rfind("}")
+    parser = StudyPlanTopicParser()
 
-    if start_index == -1 or end_index == -1:
-        raise ValueError(
-            "A OpenAI não retornou um JSON válido."
-        )
+    messages = build_study_plan_messages(
+        prompt
+    )
 
-    json_content = normalized[
-        start_index:end_index + 1
-    ]
+    async for token in stream_structured_completion(
+        endpoint="study_plan_stream",
+        model=model,
+        messages=messages,
+        name="study_plan",
+        response_model=StudyPlanResponse,
+        temperature=0.4,
+    ):
+        for raw_topic in parser.feed(token):
+            topic = normalize_study_plan_topic(
+                raw_topic
+            )
 
-    try:
-        return json.loads(json_content)
+            if topic is not None:
+                yield "topic", topic
 
-    except json.JSONDecodeError as error:
-        print(
-            "❌ JSON inválido:",
-            json_content,
-            flush=True,
-        )
+    # O plano completo passa pela mesma validação
+    # da rota sem streaming.
+    plan = await validate_structured_output(
+        endpoint="study_plan_stream",
+        model=model,
+        messages=messages,
+        content=parser.content,
+        name="study_plan",
+        response_model=StudyPlanResponse,
+        temperature=0.4,
+    )
 
-        raise ValueError(
-            "JSON inválido retornado pela OpenAI: {}".format(
-                error.msg
-            )
-        )
+    yield "plan", normalize_study_plan(plan)
+
+
+class StudyPlanTopicParser:
+    """
+    Lê o JSON do plano aos pedaços e devolve cada objeto
+    de "topics" assim que a chave de fechamento dele chega.
+    """
+
+    def __init__(self):
+        self.content = ""
+
+        self._position = 0
+        self._stack: List[str] = []
+
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._last_key = ""
+
+        self._topics_depth = -1
+        self._topic_start = -1
+
+    def feed(
+        self,
+        chunk: str,
+    ) -> List[Dict[str, Any]]:
+        self.content += chunk
+
+        topics: List[Dict[str, Any]] = []
+
+        while self._position < len(self.content):
+            character = self.content[
+                self._position
+            ]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+
+                elif character == "\\":
+                    self._escaped = True
+
+                elif character == '"':
+                    self._in_string = False
+
+                    if len(self._stack) == 1:
+                        self._last_key = self.content[
+                            self._string_start + 1:
+                            self._position
+                        ]
+
+            elif character == '"':
+                self._in_string = True
+                self._string_start = self._position
+
+            elif character in "{[":
+                if (
+                    character == "["
+                    and len(self._stack) == 1
+                    and self._last_key == "topics"
+                ):
+                    self._topics_depth = (
+                        len(self._stack) + 1
+                    )
+
+                if (
+                    character == "{"
+                    and len(self._stack)
+                    == self._topics_depth
+                ):
+                    self._topic_start = (
+                        self._position
+                    )
+
+                self._stack.append(
+                    character
+                )
+
+            elif character in "}]":
+                if self._stack:
+                    self._stack.pop()
+
+                if (
+                    character == "}"
+                    and self._topic_start != -1
+                    and len(self._stack)
+                    == self._topics_depth
+                ):
+                    topic = self._parse_topic(
+                        self.content[
+                            self._topic_start:
+                            self._position + 1
+                        ]
+                    )
+
+                    if topic is not None:
+                        topics.append(topic)
+
+                    self._topic_start = -1
+
+                if (
+                    character == "]"
+                    and len(self._stack)
+                    == self._topics_depth - 1
+                ):
+                    self._topics_depth = -1
+
+            self._position += 1
+
+        return topics
+
+    def _parse_topic(
+        self,
+        raw_topic: str,
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(raw_topic)
+
+        except json.JSONDecodeError:
+            # O tópico fica para a validação do plano completo.
+            return None
 
 
 def normalize_study_plan(
@@ -199,70 +329,14 @@ def normalize_study_plan(
     normalized_topics: List[Dict[str, Any]] = []
 
     for raw_topic in raw_topics:
-        if not isinstance(raw_topic, dict):
-            continue
-
-        title = str(
-            raw_topic.get(
-                "title",
-                "",
-            )
-        ).strip()
-
-        if not title:
-            continue
-
-        description = str(
-            raw_topic.get(
-                "description",
-                "",
-            )
-        ).strip()
-
-        priority = normalize_priority(
-            raw_topic.get(
-                "priority",
-                "medium",
-            )
-        )
-
-        estimated_hours = safe_int(
-            raw_topic.get(
-                "estimated_hours",
-                1,
-            ),
-            default=1,
+        topic = normalize_study_plan_topic(
+            raw_topic
         )
 
-        estimated_hours = max(
-            1,
-            min(estimated_hours, 40),
-        )
-
-        subtopics = normalize_string_list(
-            raw_topic.get(
-                "subtopics",
-                [],
-            )
-        )
-
-        practice = str(
-            raw_topic.get(
-                "practice",
-                "",
+        if topic is not None:
+            normalized_topics.append(
+                topic
             )
-        ).strip()
-
-        normalized_topics.append(
-            {
-                "title": title,
-                "description": description,
-                "priority": priority,
-                "estimated_hours": estimated_hours,
-                "subtopics": subtopics,
-                "practice": practice,
-            }
-        )
 
     if not normalized_topics:
         raise ValueError(
@@ -312,6 +386,73 @@ def normalize_study_plan(
     }
 
 
+def normalize_study_plan_topic(
+    raw_topic: Any,
+) -> Optional[Dict[str, Any]]:
+    if not isinstance(raw_topic, dict):
+        return None
+
+    title = str(
+        raw_topic.get(
+            "title",
+            "",
+        )
+    ).strip()
+
+    if not title:
+        return None
+
+    description = str(
+        raw_topic.get(
+            "description",
+            "",
+        )
+    ).strip()
+
+    priority = normalize_priority(
+        raw_topic.get(
+            "priority",
+            "medium",
+        )
+    )
+
+    estimated_hours = safe_int(
+        raw_topic.get(
+            "estimated_hours",
+            1,
+        ),
+        default=1,
+    )
+
+    estimated_hours = max(
+        1,
+        min(estimated_hours, 40),
+    )
+
+    subtopics = normalize_string_list(
+        raw_topic.get(
+            "subtopics",
+            [],
+        )
+    )
+
+    practice = str(
+        raw_topic.get(
+            "practice",
+            "",
+        )
+    ).strip()
+
+    return {
+        "title": title,
+        "description": description,
+        "priority": priority,
+        "estimated_hours": estimated_hours,
+        "subtopics": subtopics,
+        "practice": practice,
+    }
+
+
 def normalize_priority(
     value: Any,
 ) -> str:
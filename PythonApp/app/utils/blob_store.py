@@ -0,0 +1,341 @@
+import fcntl
+import hashlib
+import os
+import time
+import uuid
+
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from dotenv import load_dotenv
+
+from app.observability import logger
+
+
+load_dotenv()
+
+
+# Precisa ser o mesmo diretório para a API e o worker
+# (no Docker Compose, o volume montado em /app).
+BLOB_STORE_DIR = os.getenv(
+    "BLOB_STORE_DIR",
+    "blob_store",
+)
+
+# Arquivos sem referência há mais tempo que isso são
+# removidos pela limpeza periódica (ex.: task revogada).
+BLOB_STORE_MAX_AGE_SECONDS = int(
+    os.getenv(
+        "BLOB_STORE_MAX_AGE_SECONDS",
+        "86400",
+    )
+)
+
+
+class BlobNotFoundError(Exception):
+    pass
+
+
+# MARK: - Blob Store
+
+
+class LocalBlobStore:
+    # Conteúdo endereçado pelo SHA-256: o mesmo PDF enviado
+    # duas vezes ocupa um único arquivo. Cada envio ganha
+    # uma referência própria, e o arquivo só é apagado
+    # quando a última referência é liberada.
+
+    def __init__(
+        self,
+        root: str,
+    ):
+        self.root = root
+
+    def put(
+        self,
+        content: bytes,
+    ) -> str:
+        digest = hashlib.sha256(
+            content
+        ).hexdigest()
+
+        blob_path = self._blob_path(
+            digest
+        )
+
+        os.makedirs(
+            os.path.dirname(blob_path),
+            exist_ok=True,
+        )
+
+        reference_id = uuid.uuid4().hex
+
+        # O conteúdo é gravado fora do lock; só a troca
+        # de nomes e a referência ficam protegidas.
+        temporary_path = (
+            None
+            if os.path.exists(blob_path)
+            else self._write_temporary(
+                blob_path,
+                reference_id,
+                content,
+            )
+        )
+
+        with self._lock(digest):
+            with open(
+                self._reference_path(
+                    digest,
+                    reference_id,
+                ),
+                "wb",
+            ):
+                pass
+
+            if os.path.exists(blob_path):
+                if temporary_path is not None:
+                    os.remove(temporary_path)
+
+            else:
+                # Apagado entre a checagem e o lock.
+                os.replace(
+                    temporary_path
+                    or self._write_temporary(
+                        blob_path,
+                        reference_id,
+                        content,
+                    ),
+                    blob_path,
+                )
+
+        return f"{digest}.{reference_id}"
+
+    def get(
+        self,
+        key: str,
+    ) -> bytes:
+        digest, _ = self._parse_key(key)
+
+        try:
+            with open(
+                self._blob_path(digest),
+                "rb",
+            ) as file:
+                return file.read()
+
+        except FileNotFoundError as error:
+            raise BlobNotFoundError(
+                key
+            ) from error
+
+    def release(
+        self,
+        key: str,
+    ) -> None:
+        digest, reference_id = self._parse_key(key)
+
+        # Sem o lock, um put do mesmo conteúdo poderia ver o
+        # arquivo, pular a gravação e perdê-lo logo em seguida.
+        with self._lock(digest):
+            try:
+                os.remove(
+                    self._reference_path(
+                        digest,
+                        reference_id,
+                    )
+                )
+
+            except FileNotFoundError:
+                pass
+
+            self._remove_unreferenced(digest)
+
+    def purge_stale(
+        self,
+        max_age_seconds: float,
+    ) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+
+        for directory, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                path = os.path.join(
+                    directory,
+                    file_name,
+                )
+
+                try:
+                    if os.path.getmtime(path) >= cutoff:
+                        continue
+
+                    # Referências antigas são de jobs que nunca
+                    # rodaram; o conteúdo sai junto.
+                    if file_name.endswith(".ref"):
+                        os.remove(path)
+
+                        removed += 1
+
+                    elif file_name.endswith(".tmp"):
+                        os.remove(path)
+
+                except FileNotFoundError:
+                    continue
+
+        for directory, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                # Só o conteúdo não tem extensão
+                # (.ref, .tmp e o .lock do diretório).
+                if "." in file_name:
+                    continue
+
+                with self._lock(file_name):
+                    if self._remove_unreferenced(file_name):
+                        removed += 1
+
+        if removed:
+            logger.info(
+                "stale blobs purged",
+                extra={
+                    "event":
+                        "blob_store_purged",
+                    "removedCount":
+                        removed,
+                },
+            )
+
+        return removed
+
+    def _write_temporary(
+        self,
+        blob_path: str,
+        reference_id: str,
+        content: bytes,
+    ) -> str:
+        temporary_path = f"{blob_path}.{reference_id}.tmp"
+
+        with open(
+            temporary_path,
+            "wb",
+        ) as file:
+            file.write(content)
+
+        return temporary_path
+
+    @contextmanager
+    def _lock(
+        self,
+        digest: str,
+    ) -> Iterator[None]:
+        # Um lock por subdiretório, entre processos (API e
+        # worker). O arquivo nunca é apagado, senão dois
+        # processos poderiam travar arquivos diferentes.
+        directory = os.path.dirname(
+            self._blob_path(digest)
+        )
+
+        os.makedirs(
+            directory,
+            exist_ok=True,
+        )
+
+        with open(
+            os.path.join(
+                directory,
+                ".lock",
+            ),
+            "a",
+        ) as lock_file:
+            fcntl.flock(
+                lock_file,
+                fcntl.LOCK_EX,
+            )
+
+            try:
+                yield
+
+            finally:
+                fcntl.flock(
+                    lock_file,
+                    fcntl.LOCK_UN,
+                )
+
+    def _remove_unreferenced(
+        self,
+        digest: str,
+    ) -> bool:
+        # Chamado com o lock do digest.
+        if self._has_references(digest):
+            return False
+
+        try:
+            os.remove(
+                self._blob_path(digest)
+            )
+
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _blob_path(
+        self,
+        digest: str,
+    ) -> str:
+        return os.path.join(
+            self.root,
+            digest[:2],
+            digest,
+        )
+
+    def _reference_path(
+        self,
+        digest: str,
+        reference_id: str,
+    ) -> str:
+        return f"{self._blob_path(digest)}.{reference_id}.ref"
+
+    def _has_references(
+        self,
+        digest: str,
+    ) -> bool:
+        directory = os.path.dirname(
+            self._blob_path(digest)
+        )
+
+        try:
+            return any(
+                file_name.startswith(f"{digest}.")
+                and file_name.endswith(".ref")
+                for file_name in os.listdir(directory)
+            )
+
+        except FileNotFoundError:
+            return False
+
+    def _parse_key(
+        self,
+        key: str,
+    ) -> Tuple[str, str]:
+        digest, _, reference_id = key.partition(".")
+
+        # A chave vem da fila: não pode apontar para fora do diretório.
+        if (
+            len(digest) != 64
+            or not all(
+                character in "0123456789abcdef"
+                for character in digest + reference_id
+            )
+        ):
+            raise BlobNotFoundError(
+                key
+            )
+
+        return digest, reference_id
+
+
+blob_store = LocalBlobStore(
+    BLOB_STORE_DIR
+)
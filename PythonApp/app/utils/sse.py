@@ -0,0 +1,27 @@
+import json
+
+from typing import Any
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Impede que proxies (nginx/Railway) segurem os eventos em buffer.
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse_event(
+    event: str,
+    data: Any,
+) -> str:
+    payload = json.dumps(
+        data,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return (
+        f"event: {event}\n"
+        f"data: {payload}\n\n"
+    )
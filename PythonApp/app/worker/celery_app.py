@@ -1,6 +1,7 @@
 # app/worker/celery_app.py
 
 from celery import Celery
+from celery.signals import celeryd_after_setup
 import os
 from dotenv import load_dotenv
 
@@ -16,4 +17,39 @@ celery_app = Celery(
     # REMOVA OU COMENTE ESTA LINHA: include=["app.worker.tasks"]
 )
 
-celery_app.conf.timezone = "America/Sao_Paulo"
\ No newline at end of file
+celery_app.conf.timezone = "America/Sao_Paulo"
+
+# Os jobs de IA rodam num event loop por processo (ver
+# get_worker_event_loop): só prefork e solo executam uma
+# task por vez em cada processo.
+WORKER_EVENT_LOOP_POOLS = {
+    "celery.concurrency.prefork",
+    "celery.concurrency.solo",
+}
+
+celery_app.conf.worker_pool = "prefork"
+
+
+# O Celery só registra exceções comuns levantadas em signals;
+# SystemExit encerra o worker antes de consumir a fila.
+@celeryd_after_setup.connect
+def check_worker_pool(sender, instance, **kwargs):
+    if instance.pool_cls.__module__ not in WORKER_EVENT_LOOP_POOLS:
+        raise SystemExit(
+            "O worker precisa usar o pool prefork ou solo; "
+            f"recebido: {instance.pool_cls.__module__}"
+        )
+
+
+# Mantém os bancos de perguntas dos cargos mais comuns abastecidos (requer celery beat)
+celery_app.conf.beat_schedule = {
+    "seed-question-banks": {
+        "task": "app.worker.tasks.seed_question_banks",
+        "schedule": 6 * 60 * 60,
+    },
+    # Remove uploads que ficaram sem job no blob store
+    "purge-stale-blobs": {
+        "task": "app.worker.tasks.purge_stale_blobs",
+        "schedule": 60 * 60,
+    },
+}
\ No newline at end of file
@@ -0,0 +1,344 @@
+import asyncio
+import json
+import os
+import time
+
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from celery.signals import task_postrun, task_revoked
+
+from app.observability import logger
+from app.utils.sse import format_sse_event
+from app.worker.celery_app import (
+    REDIS_BACKEND_URL,
+    celery_app,
+)
+
+
+TASK_EVENTS_CHANNEL_PREFIX = "task-events:"
+
+# Tempo máximo de uma requisição de long-poll.
+TASK_WAIT_MAX_SECONDS = float(
+    os.getenv(
+        "TASK_WAIT_MAX_SECONDS",
+        "30",
+    )
+)
+
+# Tempo máximo de uma conexão SSE esperando uma task.
+TASK_EVENTS_MAX_SECONDS = float(
+    os.getenv(
+        "TASK_EVENTS_MAX_SECONDS",
+        "600",
+    )
+)
+
+TASK_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+
+# MARK: - Publish
+
+
+@lru_cache(maxsize=1)
+def _get_sync_redis_client():
+    import redis
+
+    return redis.from_url(
+        REDIS_BACKEND_URL,
+    )
+
+
+def publish_task_event(
+    task_id: str,
+    state: str,
+) -> None:
+    try:
+        _get_sync_redis_client().publish(
+            f"{TASK_EVENTS_CHANNEL_PREFIX}{task_id}",
+            json.dumps(
+                {
+                    "taskId": task_id,
+                    "state": state,
+                }
+            ),
+        )
+
+    except Exception:
+        # Quem espera ainda confere o estado ao reconectar
+        # ou ao fim do timeout.
+        logger.exception(
+            "failed to publish task event",
+            extra={
+                "event":
+                    "task_event_publish_failed",
+                "taskId":
+                    task_id,
+            },
+        )
+
+
+# O resultado já está no backend quando o task_postrun dispara.
+@task_postrun.connect
+def _publish_task_finished(
+    task_id: Optional[str] = None,
+    state: Optional[str] = None,
+    **kwargs: Any,
+) -> None:
+    if task_id:
+        publish_task_event(
+            task_id,
+            state or "",
+        )
+
+
+@task_revoked.connect
+def _publish_task_revoked(
+    request: Any = None,
+    **kwargs: Any,
+) -> None:
+    if request is not None and request.id:
+        publish_task_event(
+            request.id,
+            "REVOKED",
+        )
+
+
+# MARK: - Listener
+
+
+class TaskEventListener:
+    def __init__(self):
+        # Uma única inscrição no Redis por processo,
+        # compartilhada por todas as requisições esperando.
+        self._waiters: Dict[str, Set["asyncio.Future[None]"]] = {}
+        self._listen_task: Optional["asyncio.Task[None]"] = None
+
+    async def wait(
+        self,
+        task_id: str,
+        timeout: float,
+        is_ready: Callable[[], bool],
+    ) -> bool:
+        self._ensure_listening()
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            future = asyncio.get_running_loop().create_future()
+
+            self._waiters.setdefault(
+                task_id,
+                set(),
+            ).add(future)
+
+            try:
+                # Confere depois de se inscrever: uma task que
+                # terminou antes não publica de novo.
+                if await asyncio.to_thread(is_ready):
+                    return True
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return False
+
+                try:
+                    await asyncio.wait_for(
+                        future,
+                        remaining,
+                    )
+
+                except asyncio.TimeoutError:
+                    return await asyncio.to_thread(
+                        is_ready
+                    )
+
+            finally:
+                self._discard(
+                    task_id,
+                    future,
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "listening":
+                self._listen_task is not None
+                and not self._listen_task.done(),
+            "waitingTasks":
+                len(self._waiters),
+            "waiters":
+                sum(
+                    len(futures)
+                    for futures in self._waiters.values()
+                ),
+        }
+
+    def _ensure_listening(self) -> None:
+        if self._listen_task is None or self._listen_task.done():
+            self._listen_task = asyncio.create_task(
+                self._listen()
+            )
+
+    def _discard(
+        self,
+        task_id: str,
+        future: "asyncio.Future[None]",
+    ) -> None:
+        futures = self._waiters.get(
+            task_id
+        )
+
+        if futures is None:
+            return
+
+        futures.discard(future)
+
+        if not futures:
+            self._waiters.pop(task_id, None)
+
+    def _wake(
+        self,
+        task_id: Optional[str] = None,
+    ) -> None:
+        task_ids = (
+            [task_id]
+            if task_id is not None
+            else list(self._waiters)
+        )
+
+        for waiting_task_id in task_ids:
+            for future in self._waiters.get(
+                waiting_task_id,
+                (),
+            ):
+                if not future.done():
+                    future.set_result(None)
+
+    async def _listen(self) -> None:
+        from redis import asyncio as redis_asyncio
+
+        while True:
+            client = redis_asyncio.from_url(
+                REDIS_BACKEND_URL,
+            )
+
+            pubsub = client.pubsub()
+
+            try:
+                await pubsub.psubscribe(
+                    f"{TASK_EVENTS_CHANNEL_PREFIX}*"
+                )
+
+                # Eventos perdidos enquanto estava desconectado:
+                # todos conferem o estado de novo.
+                self._wake()
+
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+
+                    channel = message["channel"]
+
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+
+                    self._wake(
+                        channel[len(TASK_EVENTS_CHANNEL_PREFIX):]
+                    )
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception(
+                    "task event listener disconnected",
+                    extra={
+                        "event":
+                            "task_event_listener_failed",
+                    },
+                )
+
+                await asyncio.sleep(1)
+
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+
+                except Exception:
+                    pass
+
+
+task_event_listener = TaskEventListener()
+
+
+# MARK: - Wait
+
+
+def is_celery_task_ready(
+    task_id: str,
+) -> bool:
+    return celery_app.AsyncResult(
+        task_id
+    ).ready()
+
+
+async def wait_for_task(
+    task_id: str,
+    timeout: float,
+    is_ready: Optional[Callable[[], bool]] = None,
+) -> bool:
+    return await task_event_listener.wait(
+        task_id,
+        timeout,
+        is_ready
+        or (lambda: is_celery_task_ready(task_id)),
+    )
+
+
+async def stream_task_completion(
+    task_id: str,
+    load_event: Callable[[], Tuple[str, Any]],
+    is_ready: Optional[Callable[[], bool]] = None,
+) -> AsyncIterator[str]:
+    deadline = time.monotonic() + TASK_EVENTS_MAX_SECONDS
+
+    while True:
+        remaining = deadline - time.monotonic()
+
+        if await wait_for_task(
+            task_id,
+            max(
+                0.0,
+                min(
+                    TASK_EVENTS_KEEPALIVE_SECONDS,
+                    remaining,
+                ),
+            ),
+            is_ready,
+        ):
+            event, data = await asyncio.to_thread(
+                load_event
+            )
+
+            yield format_sse_event(
+                event,
+                data,
+            )
+
+            return
+
+        if remaining <= TASK_EVENTS_KEEPALIVE_SECONDS:
+            yield format_sse_event(
+                "timeout",
+                {
+                    "taskId":
+                        task_id,
+                },
+            )
+
+            return
+
+        # Comentário SSE: mantém a conexão aberta nos proxies.
+        yield ": keepalive\n\n"
\ No newline at end of file
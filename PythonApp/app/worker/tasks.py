@@ -3,24 +3,46 @@
 # A importação para celery_app permanece como está, pois é necessária para o decorator @celery_app.task
 from .celery_app import celery_app 
 import traceback
-from openai import OpenAI
-import os
-# CORREÇÃO AQUI: Ajuste o caminho de importação para extract_text_from_pdf
-# Baseado em discussões anteriores, ele está em app/llm_generation/services.py
-from app.llm_generation.services import extract_text_from_pdf 
+from uuid import UUID
+from app.llm.gateway import create_chat_completion_sync
+from app.llm.prompt_budget import fit_resume_to_budget
+from app.resumes.ingestion import ResumeIngestionError, ingest_resume_sync
+from app.database import SessionLocal
+from app.interview_simulation.question_bank import parse_seed_buckets, refill_bank
+from app.resumes.models import ResumeProfile
+from app.utils.blob_store import BLOB_STORE_MAX_AGE_SECONDS, BlobNotFoundError, blob_store
+# Registra as tabelas referenciadas pelas chaves estrangeiras
+import app.models
+# Conecta os sinais que avisam a API quando uma task termina
+import app.worker.notifications
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Mude o nome da instância do cliente OpenAI para evitar conflitos e deixar claro que é para o Celery
-celery_openai_client = OpenAI() 
-
 @celery_app.task(name="app.worker.tasks.process_resume_feedback") # Nome da tarefa com caminho completo
-def process_resume_feedback(resume_bytes: bytes) -> str:
+def process_resume_feedback(resume_bytes: bytes = None, resume_id: str = None, resume_blob_key: str = None) -> str:
     try:
         print("📥 Iniciando extração e análise do currículo...")
 
-        resume_text = extract_text_from_pdf(resume_bytes)
+        if resume_id:
+            # Currículo salvo: o texto já foi extraído no upload
+            resume_text = load_resume_profile_text(resume_id)
+            if resume_text is None:
+                return "❌ Currículo não encontrado."
+        else:
+            try:
+                # resume_bytes só chega de mensagens enfileiradas antes do blob store
+                if resume_blob_key:
+                    resume_bytes = blob_store.get(resume_blob_key)
+                resume_text = ingest_resume_sync(resume_bytes).text
+            except BlobNotFoundError:
+                return "❌ Currículo não encontrado."
+            except ResumeIngestionError as e:
+                return f"❌ {e.detail}"
+            finally:
+                # O PDF não é mais necessário depois da extração
+                if resume_blob_key:
+                    blob_store.release(resume_blob_key)
         if not resume_text.strip():
             return "❌ Não foi possível extrair texto do PDF."
 
@@ -35,12 +57,14 @@ def process_resume_feedback(resume_bytes: bytes) -> str:
             "- Impacto e resultados mensuráveis\n"
             "- Problemas de formatação\n"
             "- Sugestões específicas de melhoria\n\n"
-            f"Currículo:\n{resume_text}"
+            f"Currículo:\n{fit_resume_to_budget(resume_text, endpoint='resume_feedback')}"
         )
 
         print("🔍 Enviando prompt para a OpenAI...")
 
-        response = celery_openai_client.chat.completions.create( # Use a instância renomeada
+        # O worker do Celery é síncrono, então usa o client síncrono compartilhado do gateway
+        response = create_chat_completion_sync(
+            endpoint="resume_feedback_task",
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "Você é um recrutador profissional experiente."},
@@ -59,3 +83,41 @@ def process_resume_feedback(resume_bytes: bytes) -> str:
         # e o backend possa obter o status de falha.
         # Se você retornar uma string de erro, o Celery considerará a tarefa como bem-sucedida com essa string.
         raise e # Lança a exceção para que o Celery a registre como falha
+
+
+def load_resume_profile_text(resume_id: str):
+    db = SessionLocal()
+    try:
+        profile = db.query(ResumeProfile).filter(ResumeProfile.id == resume_id).first()
+        return profile.resume_text if profile else None
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.worker.tasks.refill_question_bank")
+def refill_question_bank(job_title: str, seniority: str, user_id: str = None) -> int:
+    db = SessionLocal()
+    try:
+        return refill_bank(db, job_title, seniority, UUID(user_id) if user_id else None)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.worker.tasks.seed_question_banks")
+def seed_question_banks() -> int:
+    buckets = parse_seed_buckets()
+    for job_title, seniority in buckets:
+        refill_question_bank.delay(job_title, seniority)
+    return len(buckets)
+
+@celery_app.task(name="app.worker.tasks.run_ai_job")
+def run_ai_job(job_id: str, attachment: bytes = None, attachment_key: str = None) -> str:
+    # Import tardio: o serviço de jobs importa este módulo para enfileirar.
+    from app.ai_jobs.service import execute_ai_job
+    return execute_ai_job(job_id, attachment, attachment_key)
+
+
+@celery_app.task(name="app.worker.tasks.purge_stale_blobs")
+def purge_stale_blobs() -> int:
+    # Arquivos de tasks revogadas ou de workers que caíram no meio do job
+    return blob_store.purge_stale(BLOB_STORE_MAX_AGE_SECONDS)
\ No newline at end of file
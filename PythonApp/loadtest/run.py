@@ -0,0 +1,472 @@
+"""
+Teste de carga de ponta a ponta.
+
+Exemplo, com a API rodando contra o stub da LLM
+(LLM_STUB_MODE=synthetic):
+
+    cd PythonApp
+    python -m loadtest.run --users 50 --duration 120 --output bench.json
+    python -m loadtest.run --users 50 --duration 120 --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from loadtest.scenarios import (
+    MIXES,
+    SCENARIOS,
+    VirtualUser,
+)
+from loadtest.seed import (
+    build_username,
+    delete_users,
+    seed_users,
+)
+
+
+LOGIN_ROUTE = "POST /users/login/"
+
+
+# MARK: - Stats
+
+
+def percentile(
+    ordered_values: List[float],
+    value: float,
+) -> Optional[float]:
+    if not ordered_values:
+        return None
+
+    index = min(
+        len(ordered_values) - 1,
+        max(
+            0,
+            math.ceil(value * len(ordered_values)) - 1,
+        ),
+    )
+
+    return round(ordered_values[index], 2)
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.status_counts: Dict[str, int] = {}
+        self.errors = 0
+
+    def record(
+        self,
+        latency_ms: float,
+        status: str,
+    ) -> None:
+        self.latencies_ms.append(latency_ms)
+
+        self.status_counts[status] = (
+            self.status_counts.get(status, 0)
+            + 1
+        )
+
+        # 4xx são esperados em parte dos cenários;
+        # só 5xx e falhas de conexão contam como erro.
+        if not status.isdigit() or int(status) >= 500:
+            self.errors += 1
+
+    def summary(
+        self,
+        elapsed_seconds: float,
+    ) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        return {
+            "requests": len(ordered),
+            "throughputRps": round(
+                len(ordered) / elapsed_seconds,
+                2,
+            ),
+            "errors": self.errors,
+            "statusCounts": dict(self.status_counts),
+            "p50Ms": percentile(ordered, 0.5),
+            "p95Ms": percentile(ordered, 0.95),
+            "p99Ms": percentile(ordered, 0.99),
+            "maxMs": round(ordered[-1], 2) if ordered else None,
+        }
+
+
+# MARK: - Runner
+
+
+async def timed_request(
+    stats: Dict[str, RouteStats],
+    route: str,
+    request,
+) -> Optional[httpx.Response]:
+    started_at = time.perf_counter()
+
+    try:
+        response = await request
+
+    except httpx.HTTPError as error:
+        status = type(error).__name__
+        response = None
+
+    else:
+        status = str(response.status_code)
+
+    stats.setdefault(
+        route,
+        RouteStats(),
+    ).record(
+        (time.perf_counter() - started_at) * 1000,
+        status,
+    )
+
+    return response
+
+
+async def run_virtual_user(
+    user: VirtualUser,
+    password: str,
+    scenario_names: List[str],
+    weights: List[int],
+    deadline: float,
+    think_time_seconds: float,
+    stats: Dict[str, RouteStats],
+) -> None:
+    async with user.client:
+        await run_user_session(
+            user,
+            password,
+            scenario_names,
+            weights,
+            deadline,
+            think_time_seconds,
+            stats,
+        )
+
+
+async def run_user_session(
+    user: VirtualUser,
+    password: str,
+    scenario_names: List[str],
+    weights: List[int],
+    deadline: float,
+    think_time_seconds: float,
+    stats: Dict[str, RouteStats],
+) -> None:
+    response = await timed_request(
+        stats,
+        LOGIN_ROUTE,
+        user.client.post(
+            "/users/login/",
+            json={
+                "username": user.username,
+                "password": password,
+            },
+        ),
+    )
+
+    if response is None or response.status_code != 200:
+        return
+
+    user.client.headers["Authorization"] = (
+        f"Bearer {response.json()['access_token']}"
+    )
+
+    while time.monotonic() < deadline:
+        scenario = SCENARIOS[
+            user.rng.choices(
+                scenario_names,
+                weights=weights,
+            )[0]
+        ]
+
+        await timed_request(
+            stats,
+            scenario.route,
+            scenario.run(user),
+        )
+
+        if think_time_seconds > 0:
+            await asyncio.sleep(
+                user.rng.expovariate(
+                    1 / think_time_seconds
+                )
+            )
+
+
+async def run_load_test(
+    args: argparse.Namespace,
+    usernames: List[str],
+) -> Dict[str, Any]:
+    mix = MIXES[args.mix]
+
+    files = {
+        "resume_pdf": (
+            Path(args.resume_pdf).read_bytes()
+            if args.resume_pdf
+            else None
+        ),
+        "audio": (
+            Path(args.audio).read_bytes()
+            if args.audio
+            else None
+        ),
+    }
+
+    # Cenários que dependem de arquivo ficam de fora
+    # quando o arquivo não foi informado.
+    scenario_names = [
+        name
+        for name in mix
+        if SCENARIOS[name].requires is None
+        or files[SCENARIOS[name].requires] is not None
+    ]
+
+    weights = [
+        mix[name]
+        for name in scenario_names
+    ]
+
+    stats: Dict[str, RouteStats] = {}
+
+    started_at = time.monotonic()
+    deadline = started_at + args.ramp_up + args.duration
+
+    tasks = []
+
+    for index, username in enumerate(usernames):
+        # Um client por usuário, como navegadores distintos.
+        user = VirtualUser(
+            client=httpx.AsyncClient(
+                base_url=args.base_url,
+                timeout=args.timeout,
+            ),
+            username=username,
+            rng=random.Random(f"{args.seed}:{index}"),
+            resume_pdf=files["resume_pdf"],
+            audio=files["audio"],
+        )
+
+        tasks.append(
+            asyncio.create_task(
+                run_virtual_user(
+                    user,
+                    args.password,
+                    scenario_names,
+                    weights,
+                    deadline,
+                    args.think_time,
+                    stats,
+                )
+            )
+        )
+
+        # Entrada gradual dos usuários.
+        await asyncio.sleep(
+            args.ramp_up / len(usernames)
+        )
+
+    await asyncio.gather(*tasks)
+
+    elapsed_seconds = time.monotonic() - started_at
+
+    return {
+        "config": {
+            "baseUrl": args.base_url,
+            "users": len(usernames),
+            "durationSeconds": args.duration,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        "elapsedSeconds": round(elapsed_seconds, 2),
+        "totalRequests": sum(
+            len(route_stats.latencies_ms)
+            for route_stats in stats.values()
+        ),
+        "routes": {
+            route: route_stats.summary(elapsed_seconds)
+            for route, route_stats in sorted(stats.items())
+        },
+    }
+
+
+# MARK: - Report
+
+
+def print_report(
+    result: Dict[str, Any],
+) -> None:
+    print(
+        f"\n{result['totalRequests']} requisições em "
+        f"{result['elapsedSeconds']}s "
+        f"({result['config']['users']} usuários, mix "
+        f"{result['config']['mix']})\n"
+    )
+
+    print(
+        f"{'Rota':<42} {'Req':>7} {'Req/s':>8} {'Erros':>6} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+
+    for route, summary in result["routes"].items():
+        print(
+            f"{route:<42} {summary['requests']:>7} "
+            f"{summary['throughputRps']:>8} {summary['errors']:>6} "
+            f"{summary['p50Ms'] or '-':>9} {summary['p95Ms'] or '-':>9} "
+            f"{summary['p99Ms'] or '-':>9}"
+        )
+
+
+def find_regressions(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float,
+) -> List[str]:
+    regressions = []
+
+    for route, summary in result["routes"].items():
+        baseline_summary = baseline["routes"].get(route)
+
+        if not baseline_summary:
+            continue
+
+        for metric in ("p95Ms", "p99Ms"):
+            current = summary[metric]
+            previous = baseline_summary[metric]
+
+            if (
+                current is not None
+                and previous
+                and current > previous * (1 + max_regression)
+            ):
+                regressions.append(
+                    f"{route} {metric}: {previous} -> {current}"
+                )
+
+    return regressions
+
+
+# MARK: - CLI
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Teste de carga da API com usuários sintéticos.",
+    )
+
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--ramp-up", type=float, default=5)
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.5,
+        help="Pausa média entre requisições de um usuário, em segundos.",
+    )
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--seed", default="42")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--prefix", default="loadtest_")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--resume-pdf", help="PDF usado nas rotas de currículo.")
+    parser.add_argument("--audio", help="Áudio usado na rota de transcrição.")
+    parser.add_argument("--output", help="Grava o resultado em JSON.")
+    parser.add_argument(
+        "--baseline",
+        help="Resultado anterior para comparar p95 e p99.",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Aumento máximo aceito de p95/p99 sobre o baseline.",
+    )
+    parser.add_argument(
+        "--skip-seed",
+        action="store_true",
+        help="Não cria usuários (já existem no banco alvo).",
+    )
+    parser.add_argument(
+        "--cleanup",
+        action="store_true",
+        help="Remove os usuários sintéticos e sai.",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.cleanup:
+        print(
+            f"{delete_users(args.prefix)} usuários removidos."
+        )
+
+        return 0
+
+    if args.skip_seed:
+        usernames = [
+            build_username(args.prefix, index)
+            for index in range(args.users)
+        ]
+
+    else:
+        usernames = seed_users(
+            args.users,
+            args.prefix,
+            args.password,
+        )
+
+    result = asyncio.run(
+        run_load_test(
+            args,
+            usernames,
+        )
+    )
+
+    print_report(result)
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(
+                result,
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    if args.baseline:
+        regressions = find_regressions(
+            result,
+            json.loads(
+                Path(args.baseline).read_text(encoding="utf-8")
+            ),
+            args.max_regression,
+        )
+
+        if regressions:
+            print("\nRegressões encontradas:")
+
+            for regression in regressions:
+                print(f"- {regression}")
+
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,433 @@
+import random
+
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+
+JOB_TITLES = [
+    "Desenvolvedor Backend",
+    "Desenvolvedora Frontend",
+    "Engenheiro de Dados",
+    "Desenvolvedor Mobile",
+]
+
+SENIORITIES = [
+    "Júnior",
+    "Pleno",
+    "Sênior",
+]
+
+COMPANIES = [
+    "Acme",
+    "Globex",
+    "Initech",
+    "Umbrella",
+]
+
+
+# MARK: - Virtual User
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        username: str,
+        rng: random.Random,
+        resume_pdf: Optional[bytes] = None,
+        audio: Optional[bytes] = None,
+    ):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.resume_pdf = resume_pdf
+        self.audio = audio
+
+        self.interview_ids: List[str] = []
+
+    def pick_job(self) -> Dict[str, str]:
+        return {
+            "job_title": self.rng.choice(JOB_TITLES),
+            "seniority": self.rng.choice(SENIORITIES),
+        }
+
+
+class Scenario:
+    def __init__(
+        self,
+        route: str,
+        run: Callable[[VirtualUser], Awaitable[httpx.Response]],
+        requires: Optional[str] = None,
+    ):
+        # Rota no formato "MÉTODO /caminho/{param}",
+        # usada para agrupar as latências.
+        self.route = route
+        self.run = run
+        # "resume_pdf" ou "audio": cenário só entra na
+        # mistura quando o arquivo foi informado.
+        self.requires = requires
+
+
+# MARK: - Interviews
+
+
+def build_interview_payload(
+    user: VirtualUser,
+) -> Dict[str, object]:
+    job = user.pick_job()
+
+    return {
+        "company_name": user.rng.choice(COMPANIES),
+        "job_title": job["job_title"],
+        "job_seniority": job["seniority"],
+        "location": "Remoto",
+        "next_interview_date": (
+            date.today()
+            + timedelta(days=user.rng.randint(1, 30))
+        ).isoformat(),
+        "notes": "Gerado pelo teste de carga.",
+        "skills": user.rng.sample(
+            [
+                "Python",
+                "SQL",
+                "Docker",
+                "React",
+                "AWS",
+            ],
+            2,
+        ),
+        "status": "applied",
+    }
+
+
+async def create_interview(
+    user: VirtualUser,
+) -> httpx.Response:
+    response = await user.client.post(
+        "/interviews/",
+        json=build_interview_payload(user),
+    )
+
+    if response.status_code == 201:
+        user.interview_ids.append(
+            response.json()["id"]
+        )
+
+    return response
+
+
+async def list_interviews(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.get(
+        "/interviews/"
+    )
+
+
+async def get_interview(
+    user: VirtualUser,
+) -> httpx.Response:
+    if not user.interview_ids:
+        return await create_interview(user)
+
+    return await user.client.get(
+        f"/interviews/{user.rng.choice(user.interview_ids)}"
+    )
+
+
+async def update_interview(
+    user: VirtualUser,
+) -> httpx.Response:
+    if not user.interview_ids:
+        return await create_interview(user)
+
+    return await user.client.put(
+        f"/interviews/{user.rng.choice(user.interview_ids)}",
+        json=build_interview_payload(user),
+    )
+
+
+async def delete_interview(
+    user: VirtualUser,
+) -> httpx.Response:
+    if not user.interview_ids:
+        return await create_interview(user)
+
+    interview_id = user.interview_ids.pop(
+        user.rng.randrange(len(user.interview_ids))
+    )
+
+    return await user.client.delete(
+        f"/interviews/{interview_id}"
+    )
+
+
+async def next_interviews(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.get(
+        "/interviews/next/"
+    )
+
+
+# MARK: - Catalog
+
+
+async def dashboard_progress(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.get(
+        "/dashboard/progress",
+        params={
+            "months": user.rng.choice([3, 6, 12]),
+        },
+    )
+
+
+async def approved_videos(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.get(
+        "/videos/approved",
+        params={
+            "page": user.rng.randint(1, 3),
+        },
+    )
+
+
+async def list_tutors(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.get(
+        "/tutors/",
+        params={
+            "page": user.rng.randint(1, 3),
+        },
+    )
+
+
+# MARK: - LLM
+
+
+async def generate_interview_questions(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/generate-interview-questions/",
+        data=user.pick_job(),
+    )
+
+
+async def simulation_questions(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/interview-simulation/questions",
+        json={
+            **user.pick_job(),
+            # Parte das chamadas ignora o cache de perguntas.
+            "fresh": user.rng.random() < 0.2,
+        },
+    )
+
+
+async def simulation_evaluate(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/interview-simulation/evaluate",
+        json={
+            **user.pick_job(),
+            "answers": [
+                {
+                    "question": f"Pergunta {index}",
+                    "answer": (
+                        "Já resolvi um problema parecido "
+                        "usando filas e cache."
+                    ),
+                    "response_time_seconds": user.rng.randint(30, 180),
+                }
+                for index in range(1, 6)
+            ],
+            "mode": user.rng.choice(
+                [
+                    "combined",
+                    "per_answer",
+                ]
+            ),
+        },
+    )
+
+
+async def study_plan(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/study-plan/generate",
+        data=user.pick_job(),
+    )
+
+
+async def resume_feedback(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/resume-feedback/",
+        files={
+            "resume": (
+                "curriculo.pdf",
+                user.resume_pdf,
+                "application/pdf",
+            ),
+        },
+    )
+
+
+async def submit_resume_feedback(
+    user: VirtualUser,
+) -> httpx.Response:
+    # Só mede o enfileiramento da task no Celery.
+    return await user.client.post(
+        "/submit-feedback/",
+        files={
+            "resume": (
+                "curriculo.pdf",
+                user.resume_pdf,
+                "application/pdf",
+            ),
+        },
+    )
+
+
+async def simulation_transcribe(
+    user: VirtualUser,
+) -> httpx.Response:
+    return await user.client.post(
+        "/interview-simulation/transcribe",
+        files={
+            "audio": (
+                "resposta.webm",
+                user.audio,
+                "audio/webm",
+            ),
+        },
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "interviews_create": Scenario(
+        "POST /interviews/",
+        create_interview,
+    ),
+    "interviews_list": Scenario(
+        "GET /interviews/",
+        list_interviews,
+    ),
+    "interviews_get": Scenario(
+        "GET /interviews/{interview_id}",
+        get_interview,
+    ),
+    "interviews_update": Scenario(
+        "PUT /interviews/{interview_id}",
+        update_interview,
+    ),
+    "interviews_delete": Scenario(
+        "DELETE /interviews/{interview_id}",
+        delete_interview,
+    ),
+    "interviews_next": Scenario(
+        "GET /interviews/next/",
+        next_interviews,
+    ),
+    "dashboard_progress": Scenario(
+        "GET /dashboard/progress",
+        dashboard_progress,
+    ),
+    "videos_approved": Scenario(
+        "GET /videos/approved",
+        approved_videos,
+    ),
+    "tutors_list": Scenario(
+        "GET /tutors/",
+        list_tutors,
+    ),
+    "generate_interview_questions": Scenario(
+        "POST /generate-interview-questions/",
+        generate_interview_questions,
+    ),
+    "simulation_questions": Scenario(
+        "POST /interview-simulation/questions",
+        simulation_questions,
+    ),
+    "simulation_evaluate": Scenario(
+        "POST /interview-simulation/evaluate",
+        simulation_evaluate,
+    ),
+    "study_plan": Scenario(
+        "POST /study-plan/generate",
+        study_plan,
+    ),
+    "resume_feedback": Scenario(
+        "POST /resume-feedback/",
+        resume_feedback,
+        requires="resume_pdf",
+    ),
+    "submit_resume_feedback": Scenario(
+        "POST /submit-feedback/",
+        submit_resume_feedback,
+        requires="resume_pdf",
+    ),
+    "simulation_transcribe": Scenario(
+        "POST /interview-simulation/transcribe",
+        simulation_transcribe,
+        requires="audio",
+    ),
+}
+
+
+# MARK: - Mixes
+
+
+# Pesos relativos de cada cenário.
+MIXES: Dict[str, Dict[str, int]] = {
+    "default": {
+        "interviews_create": 6,
+        "interviews_list": 12,
+        "interviews_get": 8,
+        "interviews_update": 4,
+        "interviews_delete": 2,
+        "interviews_next": 10,
+        "dashboard_progress": 8,
+        "videos_approved": 8,
+        "tutors_list": 8,
+        "generate_interview_questions": 3,
+        "simulation_questions": 6,
+        "simulation_evaluate": 4,
+        "study_plan": 3,
+        "resume_feedback": 2,
+        "submit_resume_feedback": 2,
+        "simulation_transcribe": 4,
+    },
+    "crud": {
+        "interviews_create": 10,
+        "interviews_list": 20,
+        "interviews_get": 15,
+        "interviews_update": 8,
+        "interviews_delete": 4,
+        "interviews_next": 15,
+        "dashboard_progress": 10,
+        "videos_approved": 10,
+        "tutors_list": 10,
+    },
+    "llm": {
+        "generate_interview_questions": 3,
+        "simulation_questions": 8,
+        "simulation_evaluate": 6,
+        "study_plan": 3,
+        "resume_feedback": 2,
+        "submit_resume_feedback": 2,
+        "simulation_transcribe": 6,
+    },
+}
\ No newline at end of file
@@ -0,0 +1,91 @@
+from typing import List
+
+from app import models
+from app.auth.security import hash_password
+from app.database import SessionLocal
+
+
+# MARK: - Synthetic Users
+
+
+def build_username(
+    prefix: str,
+    index: int,
+) -> str:
+    return f"{prefix}{index:05d}"
+
+
+def seed_users(
+    count: int,
+    prefix: str,
+    password: str,
+) -> List[str]:
+    usernames = [
+        build_username(prefix, index)
+        for index in range(count)
+    ]
+
+    # Um único hash para todos: o argon2 é lento de propósito.
+    hashed_password = hash_password(password)
+
+    db = SessionLocal()
+
+    try:
+        existing_usernames = {
+            username
+            for (username,) in (
+                db.query(models.User.username)
+                .filter(
+                    models.User.username.in_(usernames)
+                )
+                .all()
+            )
+        }
+
+        for username in usernames:
+            if username in existing_usernames:
+                continue
+
+            db.add(
+                models.User(
+                    username=username,
+                    email=f"{username}@loadtest.local",
+                    hashed_password=hashed_password,
+                    is_active=True,
+                    is_email_verified=True,
+                )
+            )
+
+        db.commit()
+
+    finally:
+        db.close()
+
+    return usernames
+
+
+def delete_users(
+    prefix: str,
+) -> int:
+    db = SessionLocal()
+
+    try:
+        users = (
+            db.query(models.User)
+            .filter(
+                models.User.username.like(f"{prefix}%"),
+                models.User.email.like("%@loadtest.local"),
+            )
+            .all()
+        )
+
+        # Entrevistas e demais dados saem em cascata.
+        for user in users:
+            db.delete(user)
+
+        db.commit()
+
+        return len(users)
+
+    finally:
+        db.close()
\ No newline at end of file
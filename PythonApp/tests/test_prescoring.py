@@ -0,0 +1,79 @@
+import unittest
+
+from app.interview_simulation.prescoring import (
+    prescore_answer,
+)
+from app.interview_simulation.schemas import (
+    SimulationAnswerRequest,
+)
+
+
+def build_answer(
+    question: str,
+    answer: str,
+    response_time_seconds: int = 0,
+) -> SimulationAnswerRequest:
+    return SimulationAnswerRequest(
+        question=question,
+        answer=answer,
+        response_time_seconds=response_time_seconds,
+    )
+
+
+class PrescoreAnswerTests(unittest.TestCase):
+    def test_long_paraphrased_answer_without_time_is_not_prescored(self):
+        # Nenhum radical da pergunta aparece na resposta.
+        prescore = prescore_answer(
+            build_answer(
+                "Como você garante a escalabilidade de uma API?",
+                "Coloco várias instâncias atrás de um balanceador, "
+                "mantenho o serviço sem estado, uso cache em Redis "
+                "para leituras frequentes e filas para processar "
+                "tarefas pesadas fora da requisição.",
+            )
+        )
+
+        self.assertEqual(prescore.keyword_coverage, 0)
+        self.assertFalse(prescore.is_degenerate)
+
+    def test_short_unrelated_answer_without_time_is_off_topic(self):
+        prescore = prescore_answer(
+            build_answer(
+                "Como você garante a escalabilidade de uma API?",
+                "Gosto bastante de futebol e cinema.",
+            )
+        )
+
+        self.assertEqual(prescore.degenerate_reason, "off_topic")
+
+    def test_short_list_answer_is_not_prescored(self):
+        prescore = prescore_answer(
+            build_answer(
+                "Quais padrões de projeto você conhece?",
+                "Singleton, Factory, Observer, Strategy",
+                response_time_seconds=30,
+            )
+        )
+
+        self.assertFalse(prescore.is_degenerate)
+
+    def test_repetitive_answer_is_too_short(self):
+        prescore = prescore_answer(
+            build_answer(
+                "Quais padrões de projeto você conhece?",
+                "não sei não sei",
+                response_time_seconds=10,
+            )
+        )
+
+        self.assertEqual(prescore.degenerate_reason, "too_short")
+
+    def test_blank_answer_is_empty(self):
+        prescore = prescore_answer(
+            build_answer(
+                "Quais padrões de projeto você conhece?",
+                "   ",
+            )
+        )
+
+        self.assertEqual(prescore.degenerate_reason, "empty")
@@ -0,0 +1,78 @@
+import unittest
+
+from app.llm.prompt_budget import (
+    PAGE_BREAK,
+    fit_resume_to_budget,
+    remove_page_headers,
+)
+
+
+class FitResumeToBudgetTests(unittest.TestCase):
+    def test_short_resume_is_kept_whole(self):
+        # Dois cargos com o mesmo título e a mesma stack.
+        resume_text = "\n".join(
+            [
+                "Maria Silva",
+                "Experiência",
+                "Empresa A",
+                "Desenvolvedora iOS",
+                "Swift, SwiftUI, Combine",
+                "Empresa B",
+                "Desenvolvedora iOS",
+                "Swift, SwiftUI, Combine",
+                "Formação",
+                "Ciência da Computação",
+            ]
+        )
+
+        self.assertEqual(
+            fit_resume_to_budget(
+                resume_text,
+                endpoint="generate_interview_questions",
+            ),
+            resume_text,
+        )
+
+    def test_page_breaks_become_new_lines(self):
+        self.assertEqual(
+            fit_resume_to_budget(
+                f"Página um{PAGE_BREAK}Página dois",
+                endpoint="generate_interview_questions",
+            ),
+            "Página um\nPágina dois",
+        )
+
+
+class RemovePageHeadersTests(unittest.TestCase):
+    def test_removes_only_repeated_page_edges(self):
+        pages = [
+            "\n".join(
+                [
+                    "Maria Silva - Currículo",
+                    "Empresa A",
+                    "Desenvolvedora iOS",
+                    "Swift, SwiftUI, Combine",
+                    *(f"Entrega {index}" for index in range(5)),
+                    "Página 1 de 2",
+                ]
+            ),
+            "\n".join(
+                [
+                    "Maria Silva - Currículo",
+                    "Empresa B",
+                    "Desenvolvedora iOS",
+                    "Swift, SwiftUI, Combine",
+                    *(f"Projeto {index}" for index in range(5)),
+                    "Página 2 de 2",
+                ]
+            ),
+        ]
+
+        lines = remove_page_headers(
+            PAGE_BREAK.join(pages)
+        )
+
+        self.assertNotIn("Maria Silva - Currículo", lines)
+        self.assertNotIn("Página 2 de 2", lines)
+        self.assertEqual(lines.count("Desenvolvedora iOS"), 2)
+        self.assertEqual(lines.count("Swift, SwiftUI, Combine"), 2)
@@ -0,0 +1,98 @@
+import asyncio
+import io
+import os
+import subprocess
+import tempfile
+import unittest
+import wave
+
+from app.interview_simulation.transcription import (
+    FFMPEG_PATH,
+    TRANSCRIPTION_CHUNK_MIN_SECONDS,
+    probe_duration_seconds,
+    split_audio,
+)
+
+
+def generate_m4a(
+    seconds: int,
+) -> bytes:
+    # Tom de 8 s com 2 s de silêncio, sem faststart: o
+    # ffmpeg grava o moov depois do mdat, como a maioria
+    # dos gravadores.
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(
+            directory,
+            "answer.m4a",
+        )
+
+        subprocess.run(
+            [
+                FFMPEG_PATH,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "aevalsrc=sin(440*2*PI*t)*lt(mod(t\\,10)\\,8)"
+                f":s=44100:d={seconds}",
+                "-c:a",
+                "aac",
+                "-y",
+                path,
+            ],
+            check=True,
+        )
+
+        with open(path, "rb") as file:
+            return file.read()
+
+
+def wav_duration(
+    content: bytes,
+) -> float:
+    with wave.open(io.BytesIO(content)) as reader:
+        return reader.getnframes() / reader.getframerate()
+
+
+@unittest.skipIf(
+    FFMPEG_PATH is None,
+    "ffmpeg not available",
+)
+class SplitAudioTests(unittest.TestCase):
+    def test_splits_non_faststart_m4a(self):
+        content = generate_m4a(60)
+
+        self.assertGreater(
+            content.index(b"moov"),
+            content.index(b"mdat"),
+        )
+
+        self.assertAlmostEqual(
+            probe_duration_seconds(content),
+            60,
+            delta=0.5,
+        )
+
+        segments = asyncio.run(
+            split_audio(content)
+        )
+
+        self.assertIsNotNone(segments)
+        self.assertGreater(len(segments), 1)
+
+        self.assertAlmostEqual(
+            sum(wav_duration(segment) for segment in segments),
+            60,
+            delta=0.5,
+        )
+
+    def test_short_m4a_is_not_decoded(self):
+        content = generate_m4a(
+            int(TRANSCRIPTION_CHUNK_MIN_SECONDS) - 5
+        )
+
+        self.assertIsNone(
+            asyncio.run(split_audio(content))
+        )